@@ -1,3 +1,11 @@
+if __name__ == "__main__":
+    # 作为入口脚本运行时，必须在其余导入之前开启统计（需 --import-profile）；被其他模块导入时不做任何事
+    import import_profiler
+
+    import_profiler.install_if_requested()
+
+import importlib.util
+import multiprocessing
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -10,29 +18,49 @@ from matplotlib.gridspec import GridSpec
 import warnings
 import sys
 import time
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.visualization import circuit_drawer, plot_state_qsphere
+from wave_dynamics import TunnelingWavePacket
+from visualization_channel import ParameterChannel, SharedParameterChannel, VisualizationParams
+from frame_timing import FrameTimer
+from compute_workers import BackgroundTaskRunner
+import experiment_compute
+from experiment_compute import m_e, hbar
+
+# OpenGL 只检查是否已安装，真正的导入推迟到第一次打开3D可视化时（见 load_opengl）
+OPENGL_AVAILABLE = importlib.util.find_spec("OpenGL") is not None
+if not OPENGL_AVAILABLE:
+    print("警告: OpenGL模块未安装，3D量子隧穿可视化将不可用")
+    print("提示: 可以使用 pip install PyOpenGL PyOpenGL_accelerate 安装")
+_opengl_loaded = False
+
 
-# 尝试导入OpenGL，如果不存在则设置标志变量
-try:
+def load_opengl():
+    """导入 OpenGL/GLU/GLUT 与 gl_scene，并把其中的名字放入本模块的全局命名空间
+
+    效果等同于原先模块顶部的 from OpenGL.GL import * 等语句，只是推迟到渲染线程或渲染进程启动时。
+    """
+    global _opengl_loaded
+    if _opengl_loaded:
+        return
     from OpenGL import GL, GLU, GLUT
-    from OpenGL.GL import *
-    from OpenGL.GLU import *
-    from OpenGL.GLUT import *
+    import gl_scene
+
+    namespace = globals()
+    namespace.update(GL=GL, GLU=GLU, GLUT=GLUT)
+    for module in (GL, GLU, GLUT):
+        names = getattr(module, '__all__', None) or [name for name in vars(module) if not name.startswith('_')]
+        namespace.update({name: getattr(module, name) for name in names})
+    namespace.update(DensitySurfaceMesh=gl_scene.DensitySurfaceMesh, GlyphTextRenderer=gl_scene.GlyphTextRenderer)
+    _opengl_loaded = True
 
-    OPENGL_AVAILABLE = True
-except ImportError:
-    OPENGL_AVAILABLE = False
-    print("警告: OpenGL模块未安装，3D量子隧穿可视化将不可用")
-    print("提示: 可以使用 pip install PyOpenGL PyOpenGL_accelerate 安装")
 
 warnings.filterwarnings("ignore")
 plt.rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
 plt.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
 
-m_e = 9.10938356e-31  # 电子质量(kg)
-hbar = 1.054571817e-34  # 约化普朗克常数(J·s)
+# 主图表的后台计算共用一个任务键：任何新的实验或分析请求都会取代仍在计算的上一个
+PLOT_TASK = 'plot'
+# 参数扫描拆成的分块数，决定进度条的粒度
+SWEEP_CHUNKS = 8
 
 COLOR_BG = "#f0f0f0"
 COLOR_BG_SECONDARY = "#ffffff"
@@ -80,12 +108,41 @@ class Quantum3DVisualization:
         self.diffuse_light = [0.8, 0.8, 0.8, 1.0]
         self.specular_light = [1.0, 1.0, 1.0, 1.0]
         self.current_tunneling_prob = 0.0  # 新增：用于同步概率
+        # Tk控制面板只通过该通道发布参数快照，渲染线程每帧取一次
+        self.param_channel = None
+        # 独立进程模式下接收父进程指令的管道端
+        self.control_conn = None
+
+        # 隧穿统计，供 draw_info 显示
+        self.tunneling_attempts = 0
+        self.tunneling_success = False
+        self.particle_speed = 0.0
+
+        # 帧耗时统计：h 键切换屏幕叠加显示，l 键开关CSV日志
+        self.frame_timer = FrameTimer([
+            'frame_interval', 'update_wave_packets', 'update_density_surface',
+            'draw_ground', 'draw_barrier', 'draw_wave_packets', 'draw_hud', 'glutSwapBuffers'
+        ])
+        self.show_hud = False
+        self._last_frame_start = None
+        self._hud_lines = []
+
+        # 纹理缓存文字渲染器，需在GL上下文中创建
+        self.text_renderer = None
+
+        # 概率密度曲面：由含时薛定谔方程实时演化，按 d 键与小球波包切换
+        self.show_density_surface = True
+        self.surface_samples = 2048
+        self.surface_time_step = 0.04  # 每帧演化时长（对应默认波包速度）
+        self.wave_simulation = None
+        self.density_mesh = None
+        self._surface_barrier = None
 
     def _init_control_panel(self):
         """创建控制面板，允许自由移动和独立关闭，主界面和3D窗口可同时操作"""
         self.control_panel = tk.Toplevel()
         self.control_panel.title("控制面板")
-        self.control_panel.geometry("300x200")
+        self.control_panel.geometry("300x230")
         self.control_panel.protocol("WM_DELETE_WINDOW", self.on_close_control_panel)
 
         # 势垒宽度控制
@@ -118,27 +175,36 @@ class Quantum3DVisualization:
         self.speed_scale.set(self.wave_speed)
         self.speed_scale.pack(side=tk.LEFT)
 
+        # 渲染端回传的统计信息
+        self.stats_label = tk.Label(self.control_panel, text="")
+        self.stats_label.pack(pady=5)
+
     def update_barrier_width(self, value):
-        """更新势垒宽度"""
-        self.barrier_width = float(value)
-        self.sync_tunneling_probability()
-        if self.glut_initialized:
-            try:
-                glutSetWindow(self.window)
-                glutPostRedisplay()
-            except Exception as e:
-                print(f"[跳过无效的重绘调用]：{e}")
+        """更新势垒宽度（Tk线程，仅发布快照）"""
+        self.param_channel.publish(barrier_width=float(value))
 
     def update_barrier_height(self, value):
-        """更新势垒高度"""
-        self.barrier_height = float(value)
-        self.sync_tunneling_probability()
-        if self.glut_initialized:
-            glutPostRedisplay()
+        """更新势垒高度（Tk线程，仅发布快照）"""
+        self.param_channel.publish(barrier_height=float(value))
 
     def update_wave_speed(self, value):
+        """更新波包速度（Tk线程，仅发布快照）"""
+        self.param_channel.publish(wave_speed=float(value))
+
+    def apply_parameter_snapshot(self):
+        """渲染线程每帧调用一次，取用最新的参数快照"""
+        params = self.param_channel.take() if self.param_channel is not None else None
+        if params is None:
+            return
+        if params.wave_speed != self.wave_speed:
+            self.set_wave_speed(params.wave_speed)
+        self.barrier_height = params.barrier_height
+        self.barrier_width = params.barrier_width
+        self.particle_energy = params.particle_energy
+        self.sync_tunneling_probability()
+
+    def set_wave_speed(self, new_speed):
         """更新波包速度，推进所有波包到当前时刻再更新速度"""
-        new_speed = float(value)
         now = self.time
         for packet in self.wave_packets:
             if not packet['alive']:
@@ -153,8 +219,6 @@ class Quantum3DVisualization:
                 packet['current_x'] += self.wave_speed * dt
             packet['last_update_time'] = now
         self.wave_speed = new_speed
-        if self.glut_initialized:
-            glutPostRedisplay()
 
     def init_gl(self):
         """初始化OpenGL设置，确保背景色为浅色"""
@@ -262,7 +326,7 @@ class Quantum3DVisualization:
 
     def draw_info(self):
         # 显示信息
-        glColor3f(1.0, 1.0, 1.0)
+        glColor3f(0.1, 0.1, 0.1)
         self.render_text(-4, 1.5, 0, f"尝试次数: {self.tunneling_attempts}")
         self.render_text(-4, 1.3, 0, f"隧穿概率: {self.calculate_tunneling_probability():.4f}")
         if self.tunneling_success:
@@ -272,6 +336,11 @@ class Quantum3DVisualization:
         """显示回调函数，确保摄像机参数和绘制流程正确"""
         if not self.glut_initialized or not self.running:
             return
+        timer = self.frame_timer
+        frame_start = time.perf_counter()
+        if self._last_frame_start is not None:
+            timer.record('frame_interval', frame_start - self._last_frame_start)
+        self._last_frame_start = frame_start
         try:
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             glLoadIdentity()
@@ -279,15 +348,61 @@ class Quantum3DVisualization:
             glRotatef(30, 1.0, 0.0, 0.0)
             glRotatef(self.angle, 0.0, 1.0, 0.0)
             # 绘制地面、势垒、波包
-            self.draw_ground()
-            self.draw_barrier()
-            self.draw_wave_packets()
-            glutSwapBuffers()
+            with timer.measure('draw_ground'):
+                self.draw_ground()
+            with timer.measure('draw_barrier'):
+                self.draw_barrier()
+            with timer.measure('draw_wave_packets'):
+                if self.show_density_surface and self.density_mesh is not None:
+                    self.density_mesh.draw()
+                else:
+                    self.draw_wave_packets()
+            if self.show_hud:
+                with timer.measure('draw_hud'):
+                    self.draw_hud()
+            with timer.measure('glutSwapBuffers'):
+                glutSwapBuffers()
+            timer.end_frame()
         except Exception as e:
             print(f"显示回调出错: {str(e)}")
             self.running = False
 
 
+    def draw_hud(self):
+        """叠加显示各阶段帧耗时（滚动均值 / p95 / 最大值）和隧穿统计"""
+        glPushAttrib(GL_ENABLE_BIT | GL_CURRENT_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        self.draw_info()
+
+        width = glutGet(GLUT_WINDOW_WIDTH)
+        height = glutGet(GLUT_WINDOW_HEIGHT)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, width, 0, height)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        # 统计文字每 15 帧刷新一次，避免每帧重新栅格化
+        if not self._hud_lines or self.frame_timer.frame_index % 15 == 0:
+            mean_interval = self.frame_timer.stats('frame_interval')[0]
+            lines = [f"FPS {1000.0 / mean_interval:.1f}" if mean_interval > 0 else "FPS --"]
+            lines.extend(self.frame_timer.summary_lines())
+            if self.frame_timer.logging:
+                lines.append(f"CSV: {self.frame_timer.log_path}")
+            self._hud_lines = lines
+        glColor3f(0.1, 0.1, 0.1)
+        for i, line in enumerate(self._hud_lines):
+            self.render_text(10, height - 20 - i * 16, 0, line)
+
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
+
     def mouse_motion(self, x, y):
         """鼠标移动回调函数"""
         if not self.glut_initialized:
@@ -322,7 +437,17 @@ class Quantum3DVisualization:
             return
 
         if key == b'q':
-            self.stop_visualization()
+            # 控制面板由Tk线程自行关闭，这里只通知渲染循环退出
+            self.running = False
+        elif key == b'd':
+            self.show_density_surface = not self.show_density_surface
+        elif key == b'h':
+            self.show_hud = not self.show_hud
+        elif key == b'l':
+            if self.frame_timer.logging:
+                self.frame_timer.stop_log()
+            else:
+                print(f"帧耗时日志: {self.frame_timer.start_log()}")
 
     def check_gl_initialized(self):
         """检查OpenGL是否正确初始化"""
@@ -347,6 +472,7 @@ class Quantum3DVisualization:
         self.barrier_height = V0
         self.barrier_width = a
         self.particle_energy = E
+        self.param_channel = ParameterChannel(V0, a, E, self.wave_speed)
         # 启动控制面板
         self._init_control_panel()
         # 启动GLUT线程
@@ -354,10 +480,12 @@ class Quantum3DVisualization:
             self.running = True
             self.thread = threading.Thread(target=self._glut_loop, daemon=True)
             self.thread.start()
+        self.control_panel.after(200, self._watch_render_loop)
 
     def _glut_loop(self):
         """在独立线程中运行 freeglut 事件循环"""
         try:
+            load_opengl()
             glutInit()
             # 关键：关闭窗口时不退出整个进程
             # 需要 freeglut 才有这个选项
@@ -379,16 +507,25 @@ class Quantum3DVisualization:
             # 不再使用 glutWMCloseFunc
 
             self.init_gl()
+            self.init_density_surface()
+            self.text_renderer = GlyphTextRenderer()
             self.glut_initialized = True
 
             # 自己控制循环，60FPS
             while self.running and self.glut_initialized:
                 glutMainLoopEvent()
+                self.poll_control_pipe()
                 time.sleep(0.016)
         except Exception as e:
             print(f"GLUT线程错误: {e}")
         finally:
             # 退出循环后，安全销毁窗口，不影响主程序
+            if self.density_mesh is not None:
+                self.density_mesh.release()
+                self.density_mesh = None
+            if self.text_renderer is not None:
+                self.text_renderer.release()
+                self.text_renderer = None
             if self.window is not None:
                 try:
                     glutDestroyWindow(self.window)
@@ -396,14 +533,22 @@ class Quantum3DVisualization:
                     pass
             self.glut_initialized = False
             self.window = None
+            self.frame_timer.stop_log()
 
     def _timer(self, value):
         """每帧更新 + 重绘 + 重新注册定时器"""
         if not self.running or not self.glut_initialized or self.window is None:
             return
 
+        self.apply_parameter_snapshot()
         self.time += 0.1
-        self.update_wave_packets()
+        with self.frame_timer.measure('update_wave_packets'):
+            self.update_wave_packets()
+        if self.show_density_surface:
+            with self.frame_timer.measure('update_density_surface'):
+                self.update_density_surface()
+        if self.frame_timer.frame_index % 15 == 0:
+            self.publish_statistics()
 
         try:
             glutSetWindow(self.window)
@@ -413,19 +558,51 @@ class Quantum3DVisualization:
         glutTimerFunc(16, self._timer, 0)
 
 
-    def update_visualization(self):
-        """使用tkinter的after方法更新可视化，确保事件循环持续"""
-        if self.running and self.glut_initialized:
-            try:
-                glutSetWindow(self.window)
-                glutPostRedisplay()
-                glutSwapBuffers()
-                glutMainLoopEvent()
-                if self.control_panel:
-                    self.control_panel.after(16, self.update_visualization)
-            except Exception as e:
-                print(f"更新可视化时出错: {str(e)}")
-                self.running = False
+    def publish_statistics(self):
+        """把隧穿统计和帧率写回参数通道，供控制面板显示"""
+        if self.param_channel is None:
+            return
+        mean_interval = self.frame_timer.stats('frame_interval')[0]
+        fps = 1000.0 / mean_interval if mean_interval > 0 else 0.0
+        self.param_channel.write_stats(self.tunneling_attempts, self.current_tunneling_prob, fps)
+
+    def poll_control_pipe(self):
+        """独立进程模式：处理父进程发来的控制指令"""
+        if self.control_conn is None:
+            return
+        try:
+            while self.control_conn.poll():
+                command = self.control_conn.recv()
+                if command == 'stop':
+                    self.running = False
+                elif command == 'toggle_hud':
+                    self.show_hud = not self.show_hud
+        except (EOFError, OSError):
+            # 父进程已退出
+            self.running = False
+
+    def init_density_surface(self):
+        """在GL上下文中创建波函数演化器和曲面网格"""
+        self.wave_simulation = TunnelingWavePacket(samples=self.surface_samples)
+        self.wave_simulation.reset(self.initial_position, self.wave_width, self.particle_energy)
+        self.density_mesh = DensitySurfaceMesh(self.wave_simulation.x, height_scale=self.wave_amplitude)
+        self._surface_barrier = None
+
+    def update_density_surface(self):
+        """推进波函数一帧并把新的 |ψ|² 写入网格"""
+        sim = self.wave_simulation
+        if sim is None or self.density_mesh is None:
+            return
+        barrier = (self.barrier_height, self.barrier_width)
+        if barrier != self._surface_barrier:
+            sim.set_barrier(*barrier)
+            self._surface_barrier = barrier
+        # 演化速度随波包速度滑条缩放
+        sim.advance(self.surface_time_step * self.wave_speed / 0.1)
+        # 波包基本被边界吸收后重新发射
+        if sim.norm() < 0.05:
+            sim.reset(self.initial_position, self.wave_width, self.particle_energy)
+        self.density_mesh.update(sim.density(), sim.peak_density)
 
     def stop_visualization(self):
         self.running = False
@@ -595,9 +772,9 @@ class Quantum3DVisualization:
         glPopMatrix()
 
     def render_text(self, x, y, z, text):
-        glRasterPos3f(x, y, z)
-        for char in text:
-            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
+        """绘制文字标签：字符串首次出现时栅格化为纹理，之后只画一个贴图四边形"""
+        if self.text_renderer is not None:
+            self.text_renderer.draw(x, y, z, text)
 
     def create_wave_packet(self):
         """创建新的波包，增加状态字段"""
@@ -623,6 +800,7 @@ class Quantum3DVisualization:
         if packet['state'] == 'incident':
             packet['current_x'] += self.wave_speed * dt
             if packet['current_x'] >= -self.barrier_width / 2:
+                self.tunneling_attempts += 1
                 tunneling_prob = self.current_tunneling_prob  # 用同步的概率
                 packet['tunneling_probability'] = tunneling_prob
                 if np.random.random() < tunneling_prob:
@@ -653,22 +831,136 @@ class Quantum3DVisualization:
             self.control_panel = None
 
     def on_close_opengl_window(self):
-        """关闭3D窗口"""
+        """关闭3D窗口（渲染线程回调，不触碰Tk控件）"""
         self.running = False
         self.glut_initialized = False
+        # 防止残留引用
+        self.window = None
 
-        if self.control_panel:
+    def _watch_render_loop(self):
+        """Tk线程轮询渲染循环状态，刷新统计信息；3D窗口关闭后由这里关闭控制面板"""
+        if self.control_panel is None:
+            return
+        if self.running:
+            attempts, prob, fps = self.param_channel.read_stats()
+            self.stats_label.config(text=f"尝试次数: {attempts}  隧穿概率: {prob:.4f}  FPS: {fps:.0f}")
+            self.control_panel.after(200, self._watch_render_loop)
+            return
+        self._close_control_panel()
+
+    def _close_control_panel(self):
+        if self.control_panel is None:
+            return
+        try:
+            self.width_scale.config(command=None)
+            self.height_scale.config(command=None)
+            self.speed_scale.config(command=None)
+        except Exception as e:
+            print(f"解绑滑条命令失败: {e}")
+        self.control_panel.destroy()
+        self.control_panel = None
+
+
+def run_visualization_process(channel_name, conn):
+    """子进程入口：在独立进程的主线程中运行GLUT渲染器"""
+    channel = SharedParameterChannel(channel_name)
+    visualization = Quantum3DVisualization()
+    params = channel.latest()
+    visualization.barrier_height = params.barrier_height
+    visualization.barrier_width = params.barrier_width
+    visualization.particle_energy = params.particle_energy
+    visualization.wave_speed = params.wave_speed
+    visualization.param_channel = channel
+    visualization.control_conn = conn
+    visualization.running = True
+    try:
+        visualization._glut_loop()
+    finally:
+        try:
+            conn.send('closed')
+        except (BrokenPipeError, OSError):
+            pass
+        conn.close()
+        channel.close()
+
+
+class Quantum3DProcessVisualization(Quantum3DVisualization):
+    """独立进程模式：GLUT渲染器运行在子进程中，参数和统计经共享内存交换，指令走控制管道
+
+    Tk进程只保留控制面板，渲染不再与Tk和matplotlib争抢GIL，任一侧崩溃也不会拖垮另一侧。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.process = None
+        self.parent_conn = None
+
+    def start_visualization(self, V0, a, E):
+        """启动渲染子进程和控制面板"""
+        self.barrier_height = V0
+        self.barrier_width = a
+        self.particle_energy = E
+        if self.process is None or not self.process.is_alive():
+            self.param_channel = SharedParameterChannel(
+                initial=VisualizationParams(1, V0, a, E, self.wave_speed))
+            self.parent_conn, child_conn = multiprocessing.Pipe()
+            self.process = multiprocessing.Process(
+                target=run_visualization_process,
+                args=(self.param_channel.name, child_conn),
+                daemon=True
+            )
+            self.process.start()
+            child_conn.close()
+            self.running = True
+        self._init_control_panel()
+        self.control_panel.after(200, self._watch_render_loop)
+
+    def _watch_render_loop(self):
+        """子进程关闭窗口或意外退出时同步停止"""
+        if self.running:
             try:
-                self.width_scale.config(command=None)
-                self.height_scale.config(command=None)
-                self.speed_scale.config(command=None)
-            except Exception as e:
-                print(f"解绑滑条命令失败: {e}")
-            self.control_panel.destroy()
-            self.control_panel = None
+                if self.parent_conn.poll() and self.parent_conn.recv() == 'closed':
+                    self.running = False
+            except (EOFError, OSError):
+                self.running = False
+            if not self.process.is_alive():
+                self.running = False
+        super()._watch_render_loop()
+        if not self.running:
+            self._shutdown_process()
 
-            # 防止残留引用
-        self.window = None
+    def _send(self, command):
+        if self.parent_conn is None:
+            return
+        try:
+            self.parent_conn.send(command)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _shutdown_process(self):
+        """通知子进程退出并回收共享内存"""
+        self.running = False
+        if self.process is not None:
+            self._send('stop')
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+        if self.parent_conn is not None:
+            self.parent_conn.close()
+            self.parent_conn = None
+        if self.param_channel is not None:
+            self.param_channel.close()
+            self.param_channel = None
+
+    def stop_visualization(self):
+        self._shutdown_process()
+        self._close_control_panel()
+
+    def on_close_control_panel(self):
+        self._shutdown_process()
+        self._close_control_panel()
 
 
 class QuantumExperimentGUI:
@@ -680,9 +972,14 @@ class QuantumExperimentGUI:
         # 设置样式
         self.setup_styles()
 
+        # 实验与参数分析在后台计算，完成后回到主线程绘图
+        self.tasks = BackgroundTaskRunner(root)
+
         # 添加3D可视化对象
         self.visualization_3d = None
         self.visualization_running = False
+        # 3D渲染默认放在独立进程中，避免与Tk和matplotlib争抢GIL
+        self.visualization_process_var = tk.BooleanVar(value=True)
 
         # 量子隧穿参数
         self.barrier_height_var = tk.DoubleVar(value=1.0)
@@ -873,6 +1170,18 @@ class QuantumExperimentGUI:
         )
         self.start_button.pack(fill=tk.X, padx=5, pady=10)
 
+        # 后台计算进度
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(
+            self.control_frame,
+            variable=self.progress_var,
+            maximum=1.0,
+            mode='determinate'
+        )
+        self.progress_bar.pack(fill=tk.X, padx=5, pady=(0, 2))
+        self.progress_label = ttk.Label(self.control_frame, text="就绪", style='TLabel')
+        self.progress_label.pack(anchor=tk.W, padx=5, pady=(0, 5))
+
         # 量子隧穿参数
         self.tunneling_params = ttk.LabelFrame(self.control_frame, text="量子隧穿参数", style='Group.TLabelframe')
         self.tunneling_params.pack(fill=tk.X, padx=5, pady=5)
@@ -957,6 +1266,14 @@ class QuantumExperimentGUI:
             row=row, column=0, columnspan=3, pady=(10, 5), sticky=tk.EW, padx=5)
         row += 1
 
+        self.visualization_process_check = ttk.Checkbutton(
+            self.tunneling_params,
+            text="独立进程渲染",
+            variable=self.visualization_process_var
+        )
+        self.visualization_process_check.grid(row=row, column=0, columnspan=3, sticky=tk.W, padx=5, pady=(0, 5))
+        row += 1
+
         # 量子隧穿参数分析
         self.analysis_frame = ttk.LabelFrame(self.control_frame, text="量子隧穿参数分析", style='Group.TLabelframe')
         self.analysis_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -1228,29 +1545,38 @@ class QuantumExperimentGUI:
         else:
             self.simulate_double_slit()
 
+    def run_in_background(self, title, fn, chunks, draw, process=False):
+        """后台计算 fn(*chunk)，全部分块完成后在主线程以结果列表调用 draw
+
+        NumPy 向量化的计算放在线程池；只有耗时远超进程启动（约 1 s）的纯 Python 计算才值得 process=True。
+        """
+        self.progress_label.config(text=f"{title}：计算中...")
+        self.tasks.map(PLOT_TASK, fn, chunks,
+                       on_done=lambda results: self._finish_background(title, draw, results),
+                       on_error=self._background_failed,
+                       on_progress=self.progress_var.set,
+                       process=process)
+
+    def _finish_background(self, title, draw, results):
+        self.progress_label.config(text=f"{title}：已完成")
+        draw(results)
+
+    def _background_failed(self, error):
+        self.progress_label.config(text="计算失败")
+        messagebox.showerror("计算错误", str(error))
+
     def simulate_tunneling(self):
         # 获取参数
         V0 = self.barrier_height_var.get()  # 势垒高度 (eV)
         a = self.barrier_width_var.get()  # 势垒宽度 (nm)
         E = self.particle_energy_var.get()  # 粒子能量 (eV)
+        self.run_in_background("量子隧穿", experiment_compute.tunneling_profile, [(V0, a, E)],
+                               lambda results: self.draw_tunneling(results[0]))
 
-        # 转换为国际单位
-        V0_J = V0 * 1.60218e-19  # eV to J
-        a_m = a * 1e-9  # nm to m
-        E_J = E * 1.60218e-19  # eV to J
-
-        # 计算波数
-        k1 = np.sqrt(2 * m_e * E_J) / hbar
-        k2 = np.sqrt(2 * m_e * (E_J - V0_J)) / hbar if E_J > V0_J else 1j * np.sqrt(2 * m_e * (V0_J - E_J)) / hbar
-
-        # 计算透射系数
-        if isinstance(k2, complex):
-            T = 1 / (1 + (V0_J ** 2 * np.sinh(abs(k2) * a_m) ** 2) / (4 * E_J * (V0_J - E_J)))
-        else:
-            T = 1 / (1 + (V0_J ** 2 * np.sin(k2 * a_m) ** 2) / (4 * E_J * (E_J - V0_J)))
-
-        # 创建位置数组
-        x = np.linspace(-3 * a, 3 * a, 1000)
+    def draw_tunneling(self, profile):
+        V0, a, E = profile.V0, profile.a, profile.E
+        x, V, T = profile.x, profile.V, profile.T
+        prob_density_log = profile.prob_density_log
 
         # 清除所有子图
         self.barrier_ax.clear()
@@ -1258,9 +1584,6 @@ class QuantumExperimentGUI:
         self.prob_ax.clear()
 
         # 1. 绘制势垒示意图
-        V = np.zeros_like(x)
-        V[(x >= -a / 2) & (x <= a / 2)] = V0
-
         self.barrier_ax.clear()
         # 设置x轴范围
         self.barrier_ax.set_xlim(-3, 3)
@@ -1310,29 +1633,11 @@ class QuantumExperimentGUI:
         )
 
         # 2. 绘制波函数概率密度分布
-        psi = np.zeros_like(x, dtype=complex)
-        # 入射区域
-        psi[x < -a / 2] = np.exp(1j * k1 * x[x < -a / 2] * 1e9) + 0.5 * np.exp(-1j * k1 * x[x < -a / 2] * 1e9)
-        # 势垒区域
-        if isinstance(k2, complex):
-            psi[(x >= -a / 2) & (x <= a / 2)] = np.exp(-abs(k2) * (x[(x >= -a / 2) & (x <= a / 2)] + a / 2) * 1e9)
-        else:
-            psi[(x >= -a / 2) & (x <= a / 2)] = np.exp(1j * k2 * x[(x >= -a / 2) & (x <= a / 2)] * 1e9)
-        # 透射区域
-        psi[x > a / 2] = 0.5 * np.exp(1j * k1 * x[x > a / 2] * 1e9)
-
-        # 计算概率密度并归一化
-        prob_density = np.abs(psi) ** 2
-        prob_density = prob_density / np.max(prob_density)
-
         # 创建掩码
         incident_mask = x < -a / 2
         barrier_mask = (x >= -a / 2) & (x <= a / 2)
         transmission_mask = x > a / 2
 
-        # 使用对数刻度
-        prob_density_log = np.log10(prob_density + 1e-10)
-
         # 清除之前的图形
         self.density_ax.clear()
 
@@ -1426,7 +1731,6 @@ class QuantumExperimentGUI:
 
         # 创建参数范围
         param_range = np.linspace(start_val, end_val, 200)  # 增加点数使曲线更平滑
-        transmission_probs = []
 
         # 获取当前固定参数值
         V0 = self.barrier_height_var.get()
@@ -1438,51 +1742,13 @@ class QuantumExperimentGUI:
             messagebox.showerror("参数错误", "势垒高度、宽度和粒子能量必须大于0")
             return
 
-        # 计算不同参数值下的隧穿概率
-        for val in param_range:
-            try:
-                if analysis_type == "势垒高度":
-                    V0_curr = val
-                    a_curr = a
-                    E_curr = E
-                elif analysis_type == "势垒宽度":
-                    V0_curr = V0
-                    a_curr = val
-                    E_curr = E
-                else:  # 粒子能量
-                    V0_curr = V0
-                    a_curr = a
-                    E_curr = val
-
-                # 检查当前参数是否合法
-                if V0_curr <= 0 or a_curr <= 0 or E_curr <= 0:
-                    transmission_probs.append(0)
-                    continue
-
-                # 转换为国际单位
-                V0_J = V0_curr * 1.60218e-19
-                a_m = a_curr * 1e-9
-                E_J = E_curr * 1.60218e-19
-
-                # 计算波数和透射系数
-                k1 = np.sqrt(2 * m_e * E_J) / hbar
-                k2 = np.sqrt(2 * m_e * (E_J - V0_J)) / hbar if E_J > V0_J else 1j * np.sqrt(
-                    2 * m_e * (V0_J - E_J)) / hbar
-
-                if isinstance(k2, complex):
-                    T = 1 / (1 + (V0_J ** 2 * np.sinh(abs(k2) * a_m) ** 2) / (4 * E_J * (V0_J - E_J)))
-                else:
-                    T = 1 / (1 + (V0_J ** 2 * np.sin(k2 * a_m) ** 2) / (4 * E_J * (E_J - V0_J)))
-
-                # 确保T是有效的概率值
-                T = max(0, min(1, float(T)))
-                transmission_probs.append(T)
-            except (ValueError, ZeroDivisionError, RuntimeWarning):
-                transmission_probs.append(0)
-
-        # 确保两个数组长度相同
-        transmission_probs = np.array(transmission_probs)
+        # 整条曲线一次向量化计算，放到线程池
+        chunks = [(analysis_type, values, V0, a, E) for values in np.array_split(param_range, SWEEP_CHUNKS)]
+        self.run_in_background(f"{analysis_type}分析", experiment_compute.transmission_sweep, chunks,
+                               lambda results: self.draw_parameter_effect(analysis_type, param_range,
+                                                                          np.concatenate(results), V0, a, E))
 
+    def draw_parameter_effect(self, analysis_type, param_range, transmission_probs, V0, a, E):
         # 检查是否有有效的数据
         if not transmission_probs.size or all(p == 0 for p in transmission_probs):
             messagebox.showerror("计算错误", "无法计算有效的隧穿概率")
@@ -1668,7 +1934,10 @@ class QuantumExperimentGUI:
             self.visualization_3d.stop_visualization()
 
         # 创建新的可视化对象
-        self.visualization_3d = Quantum3DVisualization()
+        if self.visualization_process_var.get():
+            self.visualization_3d = Quantum3DProcessVisualization()
+        else:
+            self.visualization_3d = Quantum3DVisualization()
         self.visualization_running = True
 
         try:
@@ -1689,20 +1958,11 @@ class QuantumExperimentGUI:
         a = self.slit_width_var.get() * 1e-6  # μm -> m
         L = self.screen_distance_var.get() * 1e-2  # cm -> m
         lam = self.wavelength_var.get() * 1e-9  # nm -> m
-        # 屏幕坐标
-        y = np.linspace(-0.001, 0.001, 1200)  # -0.1cm~0.1cm
-        x = np.linspace(-0.01, 0.01, 200)
-        Y, X = np.meshgrid(y, x)
-        # 计算二维干涉强度
-        beta = np.pi * a * Y / (lam * L)
-        alpha = np.pi * d * Y / (lam * L)
-        single = (np.sinc(beta / np.pi)) ** 2
-        interference = (np.cos(alpha)) ** 2
-        intensity2d = single * interference
-        # 归一化到0~1
-        intensity2d = intensity2d / np.max(intensity2d)
-        # 一维强度分布
-        intensity1d = intensity2d[int(len(x) / 2)]
+        self.run_in_background("双缝干涉", experiment_compute.double_slit_pattern, [(d, a, L, lam)],
+                               lambda results: self.draw_double_slit(results[0]))
+
+    def draw_double_slit(self, pattern):
+        y, intensity2d, intensity1d = pattern
         # 清空图表
         self.barrier_ax.clear()
         self.density_ax.clear()
@@ -1783,48 +2043,13 @@ class QuantumExperimentGUI:
         a = self.slit_width_var.get() * 1e-6
         L = self.screen_distance_var.get() * 1e-2
         lam = self.wavelength_var.get() * 1e-9
-        # 结果数组
-        fringe_spacing = []  # 主极大间距
-        visibility = []  # 可见度
-        max_intensity = []  # 最大强度
-        for val in param_range:
-            if analysis_type == "狭缝间距":
-                d_curr = val * 1e-6
-                a_curr = a
-                L_curr = L
-                lam_curr = lam
-            elif analysis_type == "狭缝宽度":
-                d_curr = d
-                a_curr = val * 1e-6
-                L_curr = L
-                lam_curr = lam
-            elif analysis_type == "波长":
-                d_curr = d
-                a_curr = a
-                L_curr = L
-                lam_curr = val * 1e-9
-            else:  # 屏幕距离
-                d_curr = d
-                a_curr = a
-                L_curr = val * 1e-2
-                lam_curr = lam
-            # 计算条纹分布
-            x = np.linspace(-0.01, 0.01, 2000)
-            beta = np.pi * a_curr * x / (lam_curr * L_curr)
-            alpha = np.pi * d_curr * x / (lam_curr * L_curr)
-            single = (np.sinc(beta / np.pi)) ** 2
-            interference = (np.cos(alpha)) ** 2
-            intensity = single * interference
-            intensity /= np.max(intensity)
-            # 主极大间距Δx = λL/d
-            spacing = lam_curr * L_curr / d_curr * 1e3  # mm
-            fringe_spacing.append(spacing)
-            # 可见度 = (Imax - Imin)/(Imax + Imin)
-            Imax = np.max(intensity)
-            Imin = np.min(intensity)
-            vis = (Imax - Imin) / (Imax + Imin) if (Imax + Imin) > 0 else 0
-            visibility.append(vis)
-            max_intensity.append(Imax)
+        # 每个点是一组向量化运算，分块放到线程池
+        chunks = [(analysis_type, values, d, a, L, lam) for values in np.array_split(param_range, SWEEP_CHUNKS)]
+        self.run_in_background(f"{analysis_type}分析", experiment_compute.double_slit_sweep, chunks,
+                               lambda results: self.draw_double_slit_effect(analysis_type, param_range,
+                                                                            *np.concatenate(results, axis=1)))
+
+    def draw_double_slit_effect(self, analysis_type, param_range, fringe_spacing, visibility, max_intensity):
         # 绘制分析图
         self.barrier_ax.clear()
         self.density_ax.clear()
@@ -2194,21 +2419,14 @@ class QuantumExperimentGUI:
 
 
 if __name__ == "__main__":
-    # 仅在OpenGL可用时初始化GLUT
-    if OPENGL_AVAILABLE:
-        try:
-            glutInit(sys.argv)
-        except Exception as e:
-            print(f"GLUT初始化失败: {str(e)}")
-            # 不是致命错误，仍然可以运行其他功能
-            OPENGL_AVAILABLE = False
-
+    # GLUT 由渲染线程在第一次打开3D可视化时导入并初始化（见 load_opengl），启动时不再加载
     root = tk.Tk()
     app = QuantumExperimentGUI(root)
 
 
     # 关闭窗口时的清理操作
     def on_close():
+        app.tasks.shutdown()
         if hasattr(app, 'visualization_3d') and app.visualization_3d:
             app.visualization_3d.stop_visualization()
         root.quit()
@@ -2216,4 +2434,6 @@ if __name__ == "__main__":
 
 
     root.protocol("WM_DELETE_WINDOW", on_close)
+    # 界面完成首次绘制后打印导入耗时报告（需 --import-profile）
+    root.after_idle(import_profiler.report)
     root.mainloop()
\ No newline at end of file
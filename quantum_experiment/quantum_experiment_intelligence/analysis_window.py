@@ -0,0 +1,280 @@
+import multiprocessing
+import queue
+
+import numpy as np
+
+# 理论/实验态配色，与模拟器一致
+THEORY_COLOR = '#64c896'
+EXPERIMENT_COLOR = '#c86496'
+
+
+class AnalysisWindow:
+    """在独立进程中运行的常驻分析窗口
+
+    图形和 Bloch 球网格只创建一次，之后收到新状态时就地更新各个 artist，
+    窗口被关闭后再次收到显示请求时重新创建。
+    """
+
+    def __init__(self):
+        import matplotlib
+        matplotlib.use('TkAgg')
+        import matplotlib.pyplot as plt
+        plt.rcParams['font.sans-serif'] = ['SimHei']
+        plt.rcParams['axes.unicode_minus'] = False
+        self.plt = plt
+        self.state_fig = None
+        self.sweep_fig = None
+        self.rb_fig = None
+        self.last_state = None
+
+    # ---------- 状态分析图 ----------
+    def _build_state_figure(self):
+        plt = self.plt
+        fig = plt.figure(figsize=(12, 10))
+        fig.canvas.manager.set_window_title("量子噪声分析")
+
+        ax1 = fig.add_subplot(2, 2, 1)
+        self.fidelity_line, = ax1.plot([], [], label="Fidelity", color='purple', marker='o')
+        ax1.set_title("保真度变化曲线")
+        ax1.set_xlabel("测量次数")
+        ax1.set_ylabel("Fidelity")
+        ax1.set_ylim(0, 1)
+        ax1.grid(True)
+        ax1.legend()
+        self.fidelity_ax = ax1
+
+        ax2 = fig.add_subplot(2, 2, 2)
+        x = np.arange(3)
+        width = 0.35
+        self.theory_bars = ax2.bar(x - width / 2, [0, 0, 0], width, label='理论值', color=THEORY_COLOR)
+        self.exp_bars = ax2.bar(x + width / 2, [0, 0, 0], width, label='实验值', color=EXPERIMENT_COLOR)
+        ax2.set_xticks(x)
+        ax2.set_xticklabels(['X', 'Y', 'Z'])
+        ax2.set_ylim(-1.1, 1.1)
+        ax2.set_title("Bloch球坐标对比")
+        ax2.legend()
+        ax2.grid(True)
+
+        ax3 = fig.add_subplot(2, 2, 3)
+        self.count_bars = ax3.bar(['|0>', '|1>'], [0, 0], color=['#409EFF', '#67C23A'])
+        ax3.set_title("Z基测量结果统计")
+        ax3.set_ylabel("次数")
+        ax3.grid(True, axis='y')
+        self.count_ax = ax3
+
+        ax4 = fig.add_subplot(2, 2, 4, projection='3d')
+        u = np.linspace(0, 2 * np.pi, 40)
+        v = np.linspace(0, np.pi, 40)
+        ax4.plot_surface(np.outer(np.cos(u), np.sin(v)), np.outer(np.sin(u), np.sin(v)),
+                         np.outer(np.ones(np.size(u)), np.cos(v)),
+                         color='lightgray', alpha=0.3, edgecolor='gray', linewidth=0.2, zorder=0)
+        for axis in np.eye(3):
+            start, end = -1.2 * axis, 1.2 * axis
+            ax4.plot(*zip(start, end), color='black', linewidth=1, linestyle='--')
+        ax4.text(1.1, 0, 0, 'X', color='black')
+        ax4.text(0, 1.1, 0, 'Y', color='black')
+        ax4.text(0, 0, 1.1, 'Z', color='black')
+        # 用两段三维线段代替 quiver，更新时只需改数据
+        self.theory_vec, = ax4.plot([0, 0], [0, 0], [0, 0], color=THEORY_COLOR, linewidth=3, label='理论态')
+        self.exp_vec, = ax4.plot([0, 0], [0, 0], [0, 0], color=EXPERIMENT_COLOR, linewidth=3, label='实验态')
+        ax4.set_xlim([-1.2, 1.2])
+        ax4.set_ylim([-1.2, 1.2])
+        ax4.set_zlim([-1.2, 1.2])
+        ax4.set_box_aspect([1, 1, 1])
+        ax4.set_title("Bloch球三维向量")
+        ax4.view_init(elev=20, azim=45)
+        ax4.legend()
+
+        fig.tight_layout()
+        fig.show()
+        self.state_fig = fig
+
+    def update_state(self, state, show=False):
+        """state 为 NoiseSimulationEngine.analysis_payload 生成的字典；show 为 False 时只在窗口已打开时更新"""
+        self.last_state = state
+        if not self._is_open(self.state_fig):
+            if not show:
+                return
+            self._build_state_figure()
+
+        history = state['fidelity_history']
+        self.fidelity_line.set_data(np.arange(len(history)), history)
+        self.fidelity_ax.set_xlim(-0.5, max(len(history), 1) - 0.5)
+        for bar, value in zip(self.theory_bars, state['theory_coords']):
+            bar.set_height(value)
+        for bar, value in zip(self.exp_bars, state['exp_coords']):
+            bar.set_height(value)
+        for bar, value in zip(self.count_bars, state['z_counts']):
+            bar.set_height(value)
+        self.count_ax.set_ylim(0, max(max(state['z_counts']), 1) * 1.1)
+        for line, coords in ((self.theory_vec, state['theory_coords']), (self.exp_vec, state['exp_coords'])):
+            line.set_data_3d([0, coords[0]], [0, coords[1]], [0, coords[2]])
+        self.state_fig.suptitle(f"噪声强度 {state['noise_level']:.2f}    测量次数 {state['shots']}")
+        self.state_fig.canvas.draw_idle()
+
+    # ---------- 噪声扫描图 ----------
+    def show_sweep(self, result):
+        """绘制或就地更新保真度-噪声强度曲线族"""
+        plt = self.plt
+        names = list(result['curves'])
+        if not self._is_open(self.sweep_fig) or len(self.sweep_axes) != len(names):
+            if self.sweep_fig is not None:
+                plt.close(self.sweep_fig)
+            fig, axes = plt.subplots(1, len(names), figsize=(4.5 * len(names), 4.5), sharey=True)
+            fig.canvas.manager.set_window_title("噪声扫描")
+            self.sweep_fig = fig
+            self.sweep_axes = np.atleast_1d(axes)
+            self.sweep_lines = {}
+            self.sweep_bands = {}
+            fig.show()
+
+        params = result['params']
+        colors = plt.cm.viridis(np.linspace(0.15, 0.85, len(result['shots'])))
+        for ax, name in zip(self.sweep_axes, names):
+            curve = result['curves'][name]
+            # 置信带的多边形随数据变化，只能替换；曲线对象复用
+            for band in self.sweep_bands.pop(name, []):
+                band.remove()
+            bands = []
+            lines = self.sweep_lines.get(name)
+            if lines is None or len(lines) != len(result['shots']) + 1:
+                for line in lines or []:
+                    line.remove()
+                lines = [ax.plot([], [], color=color, label=f"{shots} 次测量")[0]
+                         for shots, color in zip(result['shots'], colors)]
+                lines.append(ax.plot([], [], color='black', linestyle='--', linewidth=1, label="理论极限")[0])
+                ax.set_title(name)
+                ax.set_xlabel("噪声强度")
+                ax.set_xlim(params[0], params[-1])
+                ax.set_ylim(0, 1.02)
+                ax.grid(True)
+                self.sweep_lines[name] = lines
+            for i, color in enumerate(colors):
+                bands.append(ax.fill_between(params, curve['low'][i], curve['high'][i],
+                                             color=color, alpha=0.2, linewidth=0))
+                lines[i].set_data(params, curve['mean'][i])
+            lines[-1].set_data(params, curve['exact'])
+            self.sweep_bands[name] = bands
+        self.sweep_axes[0].set_ylabel("Fidelity")
+        self.sweep_axes[0].legend(loc='lower left')
+        self.sweep_fig.suptitle("保真度-噪声强度扫描 (95% 置信带)")
+        self.sweep_fig.tight_layout()
+        self.sweep_fig.canvas.draw_idle()
+
+    # ---------- 随机基准测试图 ----------
+    def show_rb(self, result, title):
+        """绘制或就地更新随机基准测试衰减曲线：每条序列的存活概率、平均值与拟合"""
+        plt = self.plt
+        if not self._is_open(self.rb_fig):
+            fig, ax = plt.subplots(figsize=(7, 5))
+            fig.canvas.manager.set_window_title("随机基准测试")
+            self.rb_samples = ax.scatter([], [], s=4, color='gray', alpha=0.15, label="单条序列")
+            self.rb_mean, = ax.plot([], [], 'o', color=EXPERIMENT_COLOR, label="平均存活概率")
+            self.rb_fit, = ax.plot([], [], color=THEORY_COLOR, linewidth=2, label="拟合 A·f^m + B")
+            ax.set_xscale('log')
+            ax.set_ylim(0.4, 1.02)
+            ax.set_xlabel("Clifford 序列长度 m")
+            ax.set_ylabel("存活概率")
+            ax.grid(True, which='both', alpha=0.4)
+            ax.legend(loc='lower left')
+            self.rb_fig = fig
+            self.rb_ax = ax
+            fig.show()
+
+        lengths = np.asarray(result.lengths, dtype=float)
+        # 散点只取每个长度的前 200 条序列，避免绘制上万个点
+        shown = result.survival[:, :200]
+        self.rb_samples.set_offsets(np.column_stack([np.repeat(lengths, shown.shape[1]), shown.ravel()]))
+        self.rb_mean.set_data(lengths, result.mean)
+        m = np.geomspace(lengths[0], lengths[-1], 200)
+        self.rb_fit.set_data(m, result.A * result.f ** m + result.B)
+        self.rb_ax.set_xlim(lengths[0] * 0.8, lengths[-1] * 1.2)
+        self.rb_ax.set_title(f"{title}    f = {result.f:.5f}    每门错误率 r = {result.error_per_clifford:.2e}")
+        self.rb_fig.canvas.draw_idle()
+
+    # ---------- 事件循环 ----------
+    def _is_open(self, fig):
+        return fig is not None and self.plt.fignum_exists(fig.number)
+
+    def has_open_figures(self):
+        return bool(self.plt.get_fignums())
+
+    def process_events(self, interval):
+        """运行 GUI 事件循环 interval 秒，期间处理重绘与窗口交互"""
+        figs = [self.plt.figure(n) for n in self.plt.get_fignums()]
+        if figs:
+            figs[0].canvas.start_event_loop(interval)
+
+
+def run_analysis_window(message_queue):
+    """分析进程入口：阻塞等待消息，同类消息只处理最新一条"""
+    window = AnalysisWindow()
+    while True:
+        messages = []
+        if not window.has_open_figures():
+            messages.append(message_queue.get())
+        while True:
+            try:
+                messages.append(message_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        latest = {}
+        for kind, payload in messages:
+            latest[kind] = payload
+        if 'quit' in latest:
+            break
+        if 'show' in latest:
+            window.update_state(latest['show'], show=True)
+        elif 'state' in latest:
+            window.update_state(latest['state'])
+        if 'sweep' in latest:
+            from noise_engine import fidelity_sweep
+            window.show_sweep(fidelity_sweep(latest['sweep']))
+        if 'rb' in latest:
+            from benchmarking import randomized_benchmarking
+            noise_name, noise_type, param = latest['rb']
+            window.show_rb(randomized_benchmarking(noise_type, param), f"{noise_name} {param:.3f}")
+        if window.has_open_figures():
+            window.process_events(0.05)
+    window.plt.close('all')
+
+
+class AnalysisClient:
+    """模拟器一侧的句柄：按需启动分析进程，通过队列发送消息
+
+    消息为 (类型, 数据)：'show' 打开窗口并显示状态，'state' 仅在窗口打开时更新，
+    'sweep' 在分析进程中执行噪声扫描并绘图，'rb' 运行随机基准测试并绘制衰减曲线，'quit' 结束进程。
+    """
+
+    def __init__(self):
+        self._ctx = multiprocessing.get_context('spawn')
+        self.queue = None
+        self.process = None
+
+    def is_running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def _ensure_process(self):
+        if not self.is_running():
+            self.queue = self._ctx.Queue()
+            self.process = self._ctx.Process(target=run_analysis_window, args=(self.queue,), daemon=True)
+            self.process.start()
+
+    def start(self):
+        """预先启动分析进程，让 matplotlib 在第一次打开图表前就完成导入"""
+        self._ensure_process()
+
+    def send(self, kind, payload=None):
+        if kind == 'state' and not self.is_running():
+            return
+        self._ensure_process()
+        self.queue.put((kind, payload))
+
+    def close(self):
+        if self.is_running():
+            self.queue.put(('quit', None))
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
@@ -0,0 +1,126 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from density_matrix import GATES
+from noise_engine import NoiseManager
+
+_PAULIS = [GATES[p] for p in 'IXYZ']
+# |0><0| 的 Pauli 坐标 (1, x, y, z)
+_GROUND = np.array([1.0, 0.0, 0.0, 1.0])
+
+# 随机基准测试结果：序列长度、每条序列的存活概率 (L, K)、平均值 (L,)、
+# 拟合参数 A·f^m + B，以及平均每个 Clifford 门的错误率 r = (1 - f) / 2
+RBResult = namedtuple('RBResult', ['lengths', 'survival', 'mean', 'A', 'f', 'B', 'error_per_clifford'])
+
+
+def _ptm(U):
+    """酉矩阵的 Pauli 转移矩阵 R_ab = tr(P_a U P_b U†) / 2"""
+    return np.array([[np.real(np.trace(Pa @ U @ Pb @ U.conj().T)) / 2 for Pb in _PAULIS] for Pa in _PAULIS])
+
+
+@lru_cache(maxsize=1)
+def clifford_group():
+    """单比特 Clifford 群的 24 个元素，返回 (酉矩阵 (24, 2, 2), PTM (24, 4, 4))
+
+    由 H、S 生成，按 PTM 去掉全局相位；第 0 个元素为恒等。
+    """
+    unitaries = [GATES['I']]
+    ptms = [np.rint(_ptm(GATES['I']))]
+    frontier = [GATES['I']]
+    while frontier:
+        new = []
+        for U in frontier:
+            for G in (GATES['H'], GATES['S']):
+                V = G @ U
+                R = np.rint(_ptm(V))
+                if not any(np.array_equal(R, other) for other in ptms):
+                    unitaries.append(V)
+                    ptms.append(R)
+                    new.append(V)
+        frontier = new
+    unitaries = np.stack(unitaries)
+    ptms = np.stack(ptms)
+    unitaries.setflags(write=False)
+    ptms.setflags(write=False)
+    return unitaries, ptms
+
+
+@lru_cache(maxsize=1)
+def clifford_tables():
+    """乘法表 mult[a, b] = index(C_a · C_b) 与逆元表 inverse[a]"""
+    _, ptms = clifford_group()
+    n = len(ptms)
+    # PTM 为带符号的置换矩阵，按整数编码查找
+    codes = {R.astype(int).tobytes(): i for i, R in enumerate(ptms)}
+    mult = np.array([[codes[np.rint(ptms[a] @ ptms[b]).astype(int).tobytes()] for b in range(n)] for a in range(n)])
+    inverse = np.argmax(mult == 0, axis=1)
+    mult.setflags(write=False)
+    inverse.setflags(write=False)
+    return mult, inverse
+
+
+def noisy_clifford_table(noise_type, param):
+    """每个 Clifford 门后接一次噪声通道：预先相乘的 PTM 表 N·C，形状 (24, 4, 4)"""
+    _, ptms = clifford_group()
+    if noise_type not in NoiseManager.noise_types.values():
+        return np.array(ptms)
+    return NoiseManager.pauli_transfer_matrix(noise_type, float(param)) @ ptms
+
+
+def random_sequences(length, n_sequences, rng):
+    """随机 Clifford 序列 (K, m+1)：前 m 个随机门，最后一个为使整体等于恒等的恢复门"""
+    mult, inverse = clifford_tables()
+    gates = rng.integers(len(mult), size=(n_sequences, length + 1))
+    total = np.zeros(n_sequences, dtype=int)
+    for j in range(length):
+        total = mult[gates[:, j], total]
+    gates[:, length] = inverse[total]
+    return gates
+
+
+def survival_probabilities(sequences, table):
+    """批量施加带噪声的 Clifford 序列，返回每条序列回到 |0> 的概率 (K,)
+
+    所有序列同步推进，每一步是一次 (K, 4, 4) x (K, 4) 的批量矩阵-向量乘。
+    """
+    v = np.broadcast_to(_GROUND, (len(sequences), 4))
+    for j in range(sequences.shape[1]):
+        v = np.einsum('kij,kj->ki', table[sequences[:, j]], v)
+    return np.clip(0.5 * (v[:, 0] + v[:, 3]), 0.0, 1.0)
+
+
+def fit_decay(lengths, mean):
+    """拟合 p(m) = A·f^m + B，返回 (A, f, B)"""
+    from scipy.optimize import curve_fit
+
+    lengths = np.asarray(lengths, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+    guess = (max(mean[0] - 0.5, 1e-3), 0.99, 0.5)
+    try:
+        (A, f, B), _ = curve_fit(lambda m, A, f, B: A * f ** m + B, lengths, mean, p0=guess,
+                                 bounds=([0.0, 0.0, 0.0], [1.0, 1.0, 1.0]), maxfev=5000)
+    except RuntimeError:
+        A, f, B = guess
+    return float(A), float(f), float(B)
+
+
+def randomized_benchmarking(noise_type, param, lengths=None, n_sequences=10000, shots=None, rng=None):
+    """单比特随机基准测试
+
+    n_sequences 条序列按长度均分；shots 不为 None 时每条序列的存活概率再做有限次测量抽样。
+    返回 RBResult。
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    lengths = np.unique(np.geomspace(1, 300, 16).astype(int)) if lengths is None else np.asarray(lengths)
+    table = noisy_clifford_table(noise_type, param)
+    per_length = max(1, n_sequences // len(lengths))
+
+    survival = np.empty((len(lengths), per_length))
+    for i, m in enumerate(lengths):
+        p = survival_probabilities(random_sequences(int(m), per_length, rng), table)
+        survival[i] = p if shots is None else rng.binomial(shots, p) / shots
+    mean = survival.mean(axis=1)
+    A, f, B = fit_decay(lengths, mean)
+    return RBResult(lengths, survival, mean, A, f, B, (1 - f) / 2)
@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import tkinter as tk
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class _Job:
+    """一次提交：若干分块的 future 及其回调"""
+
+    def __init__(self, futures, on_done, on_error, on_progress):
+        self.futures = futures
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.reported = -1
+
+
+class BackgroundTaskRunner:
+    """在线程池或进程池中执行计算，结果通过 root.after 轮询交回 Tk 主线程
+
+    释放 GIL 的 NumPy 计算放在线程池；进程池（spawn，子进程只导入计算函数所在模块）
+    首次使用要启动解释器，只适合耗时远超进程启动的纯 Python 计算。
+    每个任务有一个键，同一键再次提交时旧任务被取代：尚未开始的分块直接取消，
+    正在运行的分块结果被丢弃。完成、出错和进度回调都在 Tk 主线程中调用，
+    可以直接操作控件和 matplotlib 图形。
+    """
+
+    def __init__(self, root, threads=None, processes=None, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        cpus = os.cpu_count() or 2
+        self.threads = threads or min(4, cpus)
+        self.processes = processes or max(1, min(4, cpus - 1))
+        self._thread_pool = None
+        self._process_pool = None
+        self._jobs = {}
+        self._after_id = None
+
+    def _executor(self, process):
+        if process:
+            if self._process_pool is None:
+                # Tk 进程中已有其他线程，fork 不安全
+                self._process_pool = ProcessPoolExecutor(self.processes,
+                                                         mp_context=multiprocessing.get_context('spawn'))
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(self.threads, thread_name_prefix='compute')
+        return self._thread_pool
+
+    def submit(self, key, fn, *args, on_done, on_error=None, on_progress=None, process=False):
+        """后台执行 fn(*args)，完成后以结果调用 on_done"""
+        self.map(key, fn, [args], lambda results: on_done(results[0]),
+                 on_error=on_error, on_progress=on_progress, process=process)
+
+    def map(self, key, fn, chunks, on_done, on_error=None, on_progress=None, process=False):
+        """对 chunks 中的每组参数分别执行 fn，全部完成后以按顺序排列的结果列表调用 on_done
+
+        进度按已完成的分块数计算，on_progress 收到 0~1 之间的值。
+        """
+        self.cancel(key)
+        executor = self._executor(process)
+        job = _Job([executor.submit(fn, *args) for args in chunks], on_done, on_error, on_progress)
+        self._jobs[key] = job
+        self._report_progress(job)
+        self._schedule()
+
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            for future in job.futures:
+                future.cancel()
+
+    def is_busy(self, key=None):
+        return key in self._jobs if key is not None else bool(self._jobs)
+
+    def _report_progress(self, job):
+        done = sum(future.done() for future in job.futures)
+        if job.on_progress is not None and done != job.reported:
+            job.reported = done
+            job.on_progress(done / len(job.futures))
+        return done
+
+    def _schedule(self):
+        if self._after_id is None and self._jobs:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        try:
+            for key, job in list(self._jobs.items()):
+                # 前面的回调可能已经提交了同键的新任务
+                if self._jobs.get(key) is not job:
+                    continue
+                if self._report_progress(job) < len(job.futures):
+                    continue
+                del self._jobs[key]
+                error = next((future.exception() for future in job.futures if future.exception() is not None), None)
+                if error is None:
+                    job.on_done([future.result() for future in job.futures])
+                elif job.on_error is not None:
+                    job.on_error(error)
+                else:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+        finally:
+            # 回调抛出异常时也要继续轮询其余任务
+            self._schedule()
+
+    def shutdown(self):
+        """取消全部任务并关闭线程池/进程池，不等待正在运行的分块"""
+        for key in list(self._jobs):
+            self.cancel(key)
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
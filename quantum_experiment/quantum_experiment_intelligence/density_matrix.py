@@ -0,0 +1,192 @@
+import string
+
+import numpy as np
+
+_SQRT2 = np.sqrt(2)
+
+# 常用门，单比特为 2x2，两比特为 4x4（第一个目标比特为高位）
+GATES = {
+    'I': np.eye(2, dtype=np.complex128),
+    'X': np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    'Z': np.array([[1, 0], [0, -1]], dtype=np.complex128),
+    'H': np.array([[1, 1], [1, -1]], dtype=np.complex128) / _SQRT2,
+    'S': np.array([[1, 0], [0, 1j]], dtype=np.complex128),
+    'T': np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=np.complex128),
+    'CNOT': np.array([[1, 0, 0, 0],
+                      [0, 1, 0, 0],
+                      [0, 0, 0, 1],
+                      [0, 0, 1, 0]], dtype=np.complex128),
+    'CZ': np.diag([1, 1, 1, -1]).astype(np.complex128),
+    'SWAP': np.array([[1, 0, 0, 0],
+                      [0, 0, 1, 0],
+                      [0, 1, 0, 0],
+                      [0, 0, 0, 1]], dtype=np.complex128)
+}
+
+
+def _contract(tensor, op, axes):
+    """把 k 比特算符作用在张量的指定轴上，结果轴回到原位置
+
+    op 为 (2^k, 2^k) 矩阵。目标轴连续且升序时把张量视为 (A, 2^k, B)，
+    按 out[:, i] = Σ_j op[i, j] · v[:, j] 逐块线性组合，全程只做整块逐元素运算，
+    结果仍是连续数组；否则退回 tensordot 加轴移动。
+    """
+    k = len(axes)
+    if tensor.flags.c_contiguous and list(axes) == list(range(axes[0], axes[0] + k)):
+        d = 2 ** k
+        view = tensor.reshape(2 ** axes[0], d, -1)
+        out = np.empty_like(view)
+        scratch = np.empty_like(view[:, 0])
+        for i in range(d):
+            block = out[:, i]
+            np.multiply(view[:, 0], op[i, 0], out=block)
+            for j in range(1, d):
+                if op[i, j] != 0:
+                    np.multiply(view[:, j], op[i, j], out=scratch)
+                    block += scratch
+        return out.reshape(tensor.shape)
+    op = op.reshape((2,) * (2 * k))
+    out = np.tensordot(op, tensor, axes=(list(range(k, 2 * k)), list(axes)))
+    return np.ascontiguousarray(np.moveaxis(out, list(range(k)), list(axes)))
+
+
+def kraus_to_superoperator(operators):
+    """单比特 Kraus 算符 -> 4x4 超算符 S = Σ K ⊗ K*，作用于按行展开的 vec(ρ)"""
+    return sum(np.kron(K, np.conj(K)) for K in operators)
+
+
+class DensityMatrix:
+    """n 比特密度矩阵，内部存为形状 (2,)*2n 的张量
+
+    前 n 个轴为行（ket）指标，后 n 个轴为列（bra）指标，比特 0 为最高位。
+    门与 Kraus 通道只在目标比特对应的轴上做张量收缩，不构造完整的 Kronecker 积，
+    单次操作开销为 O(4^n)，10~12 比特仍可交互使用。
+    """
+
+    def __init__(self, n_qubits, tensor=None):
+        self.n_qubits = n_qubits
+        if tensor is None:
+            tensor = np.zeros((2,) * (2 * n_qubits), dtype=np.complex128)
+            tensor[(0,) * (2 * n_qubits)] = 1.0
+        self.tensor = tensor
+
+    @classmethod
+    def from_statevector(cls, psi):
+        psi = np.asarray(psi, dtype=np.complex128).ravel()
+        n_qubits = int(np.log2(psi.size))
+        if 2 ** n_qubits != psi.size:
+            raise ValueError(f"态矢量长度 {psi.size} 不是 2 的幂")
+        psi = psi.reshape((2,) * n_qubits)
+        return cls(n_qubits, np.multiply.outer(psi, psi.conj()))
+
+    @classmethod
+    def ghz(cls, n_qubits, control_state=None):
+        """GHZ 型态 α|0…0> + β|1…1>，(α, β) 默认为 (1, 1)/√2；两比特即 Bell 态"""
+        if control_state is None:
+            control_state = np.array([1, 1]) / _SQRT2
+        a, b = np.asarray(control_state, dtype=np.complex128) / np.linalg.norm(control_state)
+        psi = np.zeros(2 ** n_qubits, dtype=np.complex128)
+        psi[0], psi[-1] = a, b
+        return cls.from_statevector(psi)
+
+    @classmethod
+    def bell(cls, index=0):
+        """四个 Bell 态：0 Φ+，1 Φ-，2 Ψ+，3 Ψ-"""
+        dm = cls(2).apply_unitary(GATES['H'], [0]).apply_unitary(GATES['CNOT'], [0, 1])
+        if index & 1:
+            dm.apply_unitary(GATES['Z'], [0])
+        if index & 2:
+            dm.apply_unitary(GATES['X'], [1])
+        return dm
+
+    def copy(self):
+        return DensityMatrix(self.n_qubits, self.tensor.copy())
+
+    def matrix(self):
+        dim = 2 ** self.n_qubits
+        return self.tensor.reshape(dim, dim)
+
+    def _column_axes(self, targets):
+        return [self.n_qubits + t for t in targets]
+
+    def apply_unitary(self, U, targets):
+        """ρ -> U ρ U†，U 作用在 targets 指定的比特上"""
+        U = np.asarray(U, dtype=np.complex128)
+        tensor = _contract(self.tensor, U, targets)
+        self.tensor = _contract(tensor, U.conj(), self._column_axes(targets))
+        return self
+
+    def apply_superoperator(self, superop, target):
+        """单比特通道的超算符形式：把张量视为 (A, 2, C, 2, B)，一次遍历完成整个通道
+
+        out[:, i, :, j, :] = Σ_{k,l} S[2i+j, 2k+l] · ρ[:, k, :, l, :]，跳过零元素。
+        """
+        n = self.n_qubits
+        view = np.ascontiguousarray(self.tensor).reshape(2 ** target, 2, 2 ** (n - 1), 2, 2 ** (n - 1 - target))
+        out = np.empty_like(view)
+        scratch = np.empty_like(view[:, 0, :, 0])
+        for row in range(4):
+            block = out[:, row // 2, :, row % 2]
+            block[...] = 0
+            for col in range(4):
+                coeff = superop[row, col]
+                if coeff != 0:
+                    np.multiply(view[:, col // 2, :, col % 2], coeff, out=scratch)
+                    block += scratch
+        self.tensor = out.reshape(self.tensor.shape)
+        return self
+
+    def apply_kraus(self, operators, targets):
+        """ρ -> Σ K ρ K†，单比特通道转为超算符一次完成"""
+        if len(targets) == 1:
+            return self.apply_superoperator(kraus_to_superoperator(operators), targets[0])
+        columns = self._column_axes(targets)
+        result = None
+        for K in operators:
+            K = np.asarray(K, dtype=np.complex128)
+            term = _contract(_contract(self.tensor, K, targets), K.conj(), columns)
+            if result is None:
+                result = term
+            else:
+                result += term
+        self.tensor = result
+        return self
+
+    def apply_kraus_all(self, operators):
+        """对每个比特独立施加同一个单比特通道"""
+        return self.apply_superoperator_all(kraus_to_superoperator(operators))
+
+    def apply_superoperator_all(self, superop):
+        for q in range(self.n_qubits):
+            self.apply_superoperator(superop, q)
+        return self
+
+    def reduced(self, keep):
+        """保留 keep 中的比特，对其余比特求偏迹"""
+        n = self.n_qubits
+        letters = string.ascii_letters
+        rows = letters[:n]
+        cols = ''.join(letters[n + i] if i in keep else letters[i] for i in range(n))
+        out = ''.join(rows[i] for i in keep) + ''.join(cols[i] for i in keep)
+        dim = 2 ** len(keep)
+        return np.einsum(f'{rows}{cols}->{out}', self.tensor).reshape(dim, dim)
+
+    def bloch_vectors(self):
+        """每个比特的约化 Bloch 向量，形状 (n, 3)"""
+        vectors = np.empty((self.n_qubits, 3))
+        for q in range(self.n_qubits):
+            r = self.reduced([q])
+            vectors[q] = (2 * r[0, 1].real, -2 * r[0, 1].imag, (r[0, 0] - r[1, 1]).real)
+        return vectors
+
+    def purity(self):
+        m = self.matrix()
+        return float(np.real(np.vdot(m, m)))
+
+    def overlap(self, other):
+        """tr(ρσ)；当其中一个为纯态时即为保真度"""
+        return float(np.real(np.vdot(other.matrix(), self.matrix())))
+
+    def probabilities(self):
+        return np.real(np.diagonal(self.matrix())).copy()
@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import numpy as np
+
+# 本模块只依赖 NumPy，不涉及 Tk/matplotlib，可以在后台线程中调用
+m_e = 9.10938356e-31  # 电子质量(kg)
+hbar = 1.054571817e-34  # 约化普朗克常数(J·s)
+EV = 1.60218e-19  # eV -> J
+
+# 单次隧穿实验的计算结果：位置 (nm)、势垒曲线 (eV)、对数概率密度与透射系数
+TunnelingProfile = namedtuple('TunnelingProfile', ['V0', 'a', 'E', 'x', 'V', 'prob_density_log', 'T'])
+# 双缝干涉图样：屏幕坐标 y (m)、二维强度 (x, y) 与中线上的一维强度
+DoubleSlitPattern = namedtuple('DoubleSlitPattern', ['y', 'intensity2d', 'intensity1d'])
+
+
+def _wave_numbers(V0_J, E_J):
+    k1 = np.sqrt(2 * m_e * E_J) / hbar
+    k2 = np.sqrt(2 * m_e * (E_J - V0_J)) / hbar if E_J > V0_J else 1j * np.sqrt(2 * m_e * (V0_J - E_J)) / hbar
+    return k1, k2
+
+
+def transmission_coefficient(V0, a, E):
+    """矩形势垒的透射系数，V0、E 单位 eV，a 单位 nm"""
+    V0_J = V0 * EV
+    a_m = a * 1e-9
+    E_J = E * EV
+    _, k2 = _wave_numbers(V0_J, E_J)
+    if isinstance(k2, complex):
+        return 1 / (1 + (V0_J ** 2 * np.sinh(abs(k2) * a_m) ** 2) / (4 * E_J * (V0_J - E_J)))
+    return 1 / (1 + (V0_J ** 2 * np.sin(k2 * a_m) ** 2) / (4 * E_J * (E_J - V0_J)))
+
+
+def tunneling_profile(V0, a, E):
+    """单次隧穿实验：势垒、波函数概率密度（对数刻度）与透射系数"""
+    k1, k2 = _wave_numbers(V0 * EV, E * EV)
+    T = transmission_coefficient(V0, a, E)
+
+    x = np.linspace(-3 * a, 3 * a, 1000)
+    barrier = (x >= -a / 2) & (x <= a / 2)
+    V = np.zeros_like(x)
+    V[barrier] = V0
+
+    psi = np.zeros_like(x, dtype=complex)
+    # 入射区域
+    psi[x < -a / 2] = np.exp(1j * k1 * x[x < -a / 2] * 1e9) + 0.5 * np.exp(-1j * k1 * x[x < -a / 2] * 1e9)
+    # 势垒区域
+    if isinstance(k2, complex):
+        psi[barrier] = np.exp(-abs(k2) * (x[barrier] + a / 2) * 1e9)
+    else:
+        psi[barrier] = np.exp(1j * k2 * x[barrier] * 1e9)
+    # 透射区域
+    psi[x > a / 2] = 0.5 * np.exp(1j * k1 * x[x > a / 2] * 1e9)
+
+    prob_density = np.abs(psi) ** 2
+    prob_density = prob_density / np.max(prob_density)
+    return TunnelingProfile(V0, a, E, x, V, np.log10(prob_density + 1e-10), T)
+
+
+def transmission_coefficients(V0, a, E):
+    """transmission_coefficient 的向量化版本，参数可为可广播的数组；非法参数 (<= 0) 处为 0"""
+    V0, a, E = np.broadcast_arrays(np.asarray(V0, dtype=float), np.asarray(a, dtype=float),
+                                   np.asarray(E, dtype=float))
+    V0_J = V0 * EV
+    a_m = a * 1e-9
+    E_J = E * EV
+    k = np.sqrt(2 * m_e * np.abs(E_J - V0_J)) / hbar
+    with np.errstate(all='ignore'):
+        below = V0_J ** 2 * np.sinh(k * a_m) ** 2 / (4 * E_J * (V0_J - E_J))
+        above = V0_J ** 2 * np.sin(k * a_m) ** 2 / (4 * E_J * (E_J - V0_J))
+        T = 1 / (1 + np.where(E_J > V0_J, above, below))
+        # E = V0 时两式都是 0/0，取极限 1 / (1 + m a² V0 / 2ħ²)
+        T = np.where(E_J == V0_J, 1 / (1 + m_e * a_m ** 2 * V0_J / (2 * hbar ** 2)), T)
+    valid = (V0 > 0) & (a > 0) & (E > 0)
+    return np.where(valid, np.clip(np.nan_to_num(T, nan=0.0), 0.0, 1.0), 0.0)
+
+
+def transmission_sweep(analysis_type, values, V0, a, E):
+    """整条隧穿概率曲线，analysis_type 指定 values 替换的参数；非法参数处记 0"""
+    values = np.asarray(values, dtype=float)
+    if analysis_type == "势垒高度":
+        return transmission_coefficients(values, a, E)
+    elif analysis_type == "势垒宽度":
+        return transmission_coefficients(V0, values, E)
+    return transmission_coefficients(V0, a, values)  # 粒子能量
+
+
+def double_slit_pattern(d, a, L, lam):
+    """双缝干涉强度分布，参数均为国际单位"""
+    y = np.linspace(-0.001, 0.001, 1200)  # -0.1cm~0.1cm
+    x = np.linspace(-0.01, 0.01, 200)
+    Y, X = np.meshgrid(y, x)
+    beta = np.pi * a * Y / (lam * L)
+    alpha = np.pi * d * Y / (lam * L)
+    intensity2d = np.sinc(beta / np.pi) ** 2 * np.cos(alpha) ** 2
+    intensity2d = intensity2d / np.max(intensity2d)
+    return DoubleSlitPattern(y, intensity2d, intensity2d[len(x) // 2])
+
+
+def double_slit_sweep(analysis_type, values, d, a, L, lam):
+    """逐点计算主极大间距 (mm)、条纹可见度与最大强度，返回形状 (3, len(values)) 的数组"""
+    x = np.linspace(-0.01, 0.01, 2000)
+    result = np.empty((3, len(values)))
+    for i, val in enumerate(values):
+        d_curr, a_curr, L_curr, lam_curr = d, a, L, lam
+        if analysis_type == "狭缝间距":
+            d_curr = val * 1e-6
+        elif analysis_type == "狭缝宽度":
+            a_curr = val * 1e-6
+        elif analysis_type == "波长":
+            lam_curr = val * 1e-9
+        else:  # 屏幕距离
+            L_curr = val * 1e-2
+        beta = np.pi * a_curr * x / (lam_curr * L_curr)
+        alpha = np.pi * d_curr * x / (lam_curr * L_curr)
+        intensity = np.sinc(beta / np.pi) ** 2 * np.cos(alpha) ** 2
+        intensity /= np.max(intensity)
+        # 主极大间距Δx = λL/d；可见度 = (Imax - Imin)/(Imax + Imin)
+        Imax = np.max(intensity)
+        Imin = np.min(intensity)
+        result[0, i] = lam_curr * L_curr / d_curr * 1e3
+        result[1, i] = (Imax - Imin) / (Imax + Imin) if (Imax + Imin) > 0 else 0
+        result[2, i] = Imax
+    return result
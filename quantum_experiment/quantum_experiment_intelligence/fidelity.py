@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def _as_matrices(rho):
+    rho = np.asarray(rho, dtype=np.complex128)
+    if rho.ndim < 2 or rho.shape[-1] != rho.shape[-2]:
+        raise ValueError(f"密度矩阵形状应为 (..., d, d)，实际为 {rho.shape}")
+    return rho
+
+
+def _det2(rho):
+    return rho[..., 0, 0] * rho[..., 1, 1] - rho[..., 0, 1] * rho[..., 1, 0]
+
+
+def pure_state_fidelity(psi, sigma):
+    """纯态与任意态的保真度 F = <ψ|σ|ψ>
+
+    psi: (..., d)，sigma: (..., d, d)，前导维度按广播规则对齐。
+    """
+    psi = np.asarray(psi, dtype=np.complex128)
+    sigma = _as_matrices(sigma)
+    fid = np.real(np.einsum('...i,...ij,...j->...', psi.conj(), sigma, psi))
+    return np.clip(fid, 0.0, 1.0)
+
+
+def state_fidelity(rho, sigma):
+    """两个密度矩阵之间的 Uhlmann 保真度 F = (tr√(√ρ σ √ρ))²
+
+    支持形如 (..., d, d) 的批量输入。单比特使用闭式解
+    F = tr(ρσ) + 2√(det ρ · det σ)，无需矩阵开方；
+    更高维度退回到基于 eigh 的一般算法，同样按批计算。
+    """
+    rho = _as_matrices(rho)
+    sigma = _as_matrices(sigma)
+    if rho.shape[-1] != sigma.shape[-1]:
+        raise ValueError("两个密度矩阵的维度不一致")
+
+    if rho.shape[-1] == 2:
+        overlap = np.real(np.einsum('...ij,...ji->...', rho, sigma))
+        dets = np.real(_det2(rho)) * np.real(_det2(sigma))
+        fid = overlap + 2 * np.sqrt(np.clip(dets, 0.0, None))
+        return np.clip(fid, 0.0, 1.0)
+
+    # 一般情形：√ρ = V diag(√w) V†，再求 √ρ σ √ρ 的本征值
+    w, v = np.linalg.eigh(rho)
+    sqrt_rho = (v * np.sqrt(np.clip(w, 0.0, None))[..., None, :]) @ np.conj(np.swapaxes(v, -1, -2))
+    inner = sqrt_rho @ sigma @ sqrt_rho
+    inner = 0.5 * (inner + np.conj(np.swapaxes(inner, -1, -2)))
+    eig = np.linalg.eigvalsh(inner)
+    fid = np.sum(np.sqrt(np.clip(eig, 0.0, None)), axis=-1) ** 2
+    return np.clip(fid, 0.0, 1.0)
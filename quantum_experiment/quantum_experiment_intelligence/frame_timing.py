@@ -0,0 +1,80 @@
+import csv
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class FrameTimer:
+    """按渲染阶段统计帧耗时（滚动均值、p95、最大值），可选写入CSV日志"""
+
+    def __init__(self, stages, window=240):
+        self.stages = list(stages)
+        self.samples = {name: deque(maxlen=window) for name in self.stages}
+        self.current = {}
+        self.frame_index = 0
+        self._log_file = None
+        self._log_writer = None
+        self.log_path = None
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        ms = seconds * 1000.0
+        self.samples[stage].append(ms)
+        self.current[stage] = self.current.get(stage, 0.0) + ms
+
+    def end_frame(self):
+        """一帧结束：写出该帧各阶段耗时并清空当前帧累计"""
+        if self._log_writer is not None:
+            row = [self.frame_index, f"{time.time():.3f}"]
+            row.extend(f"{self.current.get(name, 0.0):.3f}" for name in self.stages)
+            self._log_writer.writerow(row)
+            if self.frame_index % 60 == 0:
+                self._log_file.flush()
+        self.current = {}
+        self.frame_index += 1
+
+    def stats(self, stage):
+        """返回 (均值, p95, 最大值)，单位毫秒"""
+        values = self.samples.get(stage)
+        if not values:
+            return 0.0, 0.0, 0.0
+        arr = np.fromiter(values, dtype=float, count=len(values))
+        return float(arr.mean()), float(np.percentile(arr, 95)), float(arr.max())
+
+    def summary_lines(self):
+        lines = []
+        for name in self.stages:
+            mean, p95, peak = self.stats(name)
+            lines.append(f"{name:<20s} mean {mean:6.2f}  p95 {p95:6.2f}  max {peak:6.2f} ms")
+        return lines
+
+    def start_log(self, path=None):
+        """开始写CSV日志，默认文件名带时间戳"""
+        self.stop_log()
+        if path is None:
+            path = time.strftime("frame_timing_%Y%m%d_%H%M%S.csv")
+        self._log_file = open(path, 'w', newline='', encoding='utf-8')
+        self._log_writer = csv.writer(self._log_file)
+        self._log_writer.writerow(['frame', 'timestamp'] + [f"{name}_ms" for name in self.stages])
+        self.log_path = path
+        return path
+
+    def stop_log(self):
+        if self._log_file is not None:
+            self._log_file.close()
+        self._log_file = None
+        self._log_writer = None
+        self.log_path = None
+
+    @property
+    def logging(self):
+        return self._log_writer is not None
@@ -0,0 +1,220 @@
+import ctypes
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import matplotlib
+from matplotlib import font_manager
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+
+class DensitySurfaceMesh:
+    """|ψ(x,t)|² 概率密度带状网格
+
+    顶点数据为交错排列的 float32 数组 (samples, 2, 7)：[x, y, z, r, g, b, a]，
+    两行顶点分别位于 z = ±half_depth，按 GL_TRIANGLE_STRIP 顺序排列。
+    每帧只就地改写高度和颜色，并通过一次 glBufferSubData 上传整个缓冲区。
+    """
+
+    STRIDE = 7 * 4
+
+    def __init__(self, x, half_depth=0.6, height_scale=1.5):
+        self.samples = len(x)
+        self.height_scale = height_scale
+        self.vertices = np.zeros((self.samples, 2, 7), dtype=np.float32)
+        self.vertices[:, :, 0] = np.asarray(x, dtype=np.float32)[:, None]
+        self.vertices[:, 0, 2] = -half_depth
+        self.vertices[:, 1, 2] = half_depth
+        self.vertices[:, :, 6] = 0.75
+        self._heights = np.empty(self.samples, dtype=np.float32)
+        self.vbo = None
+        self._create_buffer()
+
+    def _create_buffer(self):
+        """创建顶点缓冲对象；不支持VBO的旧驱动退回客户端顶点数组"""
+        try:
+            self.vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_DYNAMIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        except Exception as e:
+            print(f"VBO不可用，改用客户端顶点数组: {e}")
+            self.vbo = None
+
+    def update(self, density, peak_density):
+        """用新的概率密度就地更新顶点高度与颜色"""
+        np.multiply(density, self.height_scale / peak_density, out=self._heights, casting='unsafe')
+        np.clip(self._heights, 0.0, 3.0, out=self._heights)
+        self.vertices[:, :, 1] = self._heights[:, None]
+
+        # 颜色随高度由蓝渐变到红
+        level = self._heights / self.height_scale
+        np.clip(level, 0.0, 1.0, out=level)
+        self.vertices[:, :, 3] = (0.2 + 0.8 * level)[:, None]
+        self.vertices[:, :, 4] = (0.4 + 0.3 * (1.0 - level))[:, None]
+        self.vertices[:, :, 5] = (1.0 - 0.8 * level)[:, None]
+
+        if self.vbo is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, self.vertices.nbytes, self.vertices)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        """以三角带绘制整个网格"""
+        glPushAttrib(GL_ENABLE_BIT)
+        glDisable(GL_LIGHTING)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        if self.vbo is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+            glColorPointer(4, GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+        else:
+            base = self.vertices.ctypes.data
+            glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(base))
+            glColorPointer(4, GL_FLOAT, self.STRIDE, ctypes.c_void_p(base + 12))
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, self.samples * 2)
+        if self.vbo is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopAttrib()
+
+    def release(self):
+        if self.vbo is not None:
+            try:
+                glDeleteBuffers(1, [self.vbo])
+            except Exception:
+                pass
+            self.vbo = None
+
+
+@lru_cache(maxsize=None)
+def _load_font():
+    """按 matplotlib 的 font.sans-serif 设置加载字体（含中文回退），只查找加载一次，各字号共用"""
+    paths = []
+    for family in matplotlib.rcParams['font.sans-serif']:
+        try:
+            path = font_manager.findfont(font_manager.FontProperties(family=[family]),
+                                         fallback_to_default=False)
+        except ValueError:
+            continue
+        if path not in paths:
+            paths.append(path)
+    default_path = font_manager.findfont(font_manager.FontProperties())
+    if default_path not in paths:
+        paths.append(default_path)
+    try:
+        return font_manager.get_font(paths)
+    except TypeError:
+        # 旧版 matplotlib 不支持字体回退列表
+        return font_manager.get_font(paths[0])
+
+
+def rasterize_text(text, font_size=12, dpi=72):
+    """把一行文字栅格化为 RGBA 位图（白色文字，透明度为字形覆盖率），首行在底部"""
+    font = _load_font()
+    font.clear()
+    # 字体对象与 matplotlib 共享，每次都重新设置字号
+    font.set_size(font_size, dpi)
+    font.set_text(text, 0.0)
+    font.draw_glyphs_to_bitmap(antialiased=True)
+    coverage = np.asarray(font.get_image())
+    height, width = coverage.shape
+    rgba = np.full((max(height, 1), max(width, 1), 4), 255, dtype=np.uint8)
+    rgba[:height, :width, 3] = coverage
+    return np.ascontiguousarray(rgba[::-1])
+
+
+class GlyphTextRenderer:
+    """纹理缓存文字渲染器
+
+    每个字符串只栅格化一次并上传为纹理，按字符串内容做LRU缓存；
+    绘制时每个标签只是一个贴图四边形，支持中文标签。
+    """
+
+    def __init__(self, font_size=12, capacity=128):
+        self.font_size = font_size
+        self.capacity = capacity
+        self._cache = OrderedDict()
+
+    def _texture(self, text):
+        key = (text, self.font_size)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry
+
+        bitmap = rasterize_text(text, self.font_size)
+        height, width = bitmap.shape[:2]
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, bitmap)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        entry = (texture, width, height)
+        self._cache[key] = entry
+        while len(self._cache) > self.capacity:
+            _, (old_texture, _, _) = self._cache.popitem(last=False)
+            glDeleteTextures([old_texture])
+        return entry
+
+    def draw(self, x, y, z, text):
+        """在当前模型视图下的 (x, y, z) 处绘制文字，文字本身按屏幕像素大小显示"""
+        if not text:
+            return
+        win_x, win_y, _ = gluProject(x, y, z)
+        texture, width, height = self._texture(text)
+        viewport = glGetIntegerv(GL_VIEWPORT)
+
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnable(GL_TEXTURE_2D)
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        glBindTexture(GL_TEXTURE_2D, texture)
+
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(viewport[0], viewport[0] + viewport[2], viewport[1], viewport[1] + viewport[3])
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        x0, y0 = round(win_x), round(win_y)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, 0.0)
+        glVertex2f(x0, y0)
+        glTexCoord2f(1.0, 0.0)
+        glVertex2f(x0 + width, y0)
+        glTexCoord2f(1.0, 1.0)
+        glVertex2f(x0 + width, y0 + height)
+        glTexCoord2f(0.0, 1.0)
+        glVertex2f(x0, y0 + height)
+        glEnd()
+
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glPopAttrib()
+
+    def release(self):
+        """删除全部缓存纹理，需在GL上下文有效时调用"""
+        textures = [entry[0] for entry in self._cache.values()]
+        self._cache.clear()
+        if textures:
+            try:
+                glDeleteTextures(textures)
+            except Exception:
+                pass
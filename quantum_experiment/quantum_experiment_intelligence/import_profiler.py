@@ -0,0 +1,147 @@
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+# 命令行参数或环境变量二者任一即开启；环境变量会被子进程继承
+PROFILE_FLAG = '--import-profile'
+PROFILE_ENV = 'QE_IMPORT_PROFILE'
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """包装真实加载器，记录模块创建与执行的耗时，其余属性全部转发"""
+
+    def __init__(self, loader, profiler, find_time):
+        self._loader = loader
+        self._profiler = profiler
+        self._find_time = find_time
+        self._create_time = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        start = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._create_time = time.perf_counter() - start
+
+    def exec_module(self, module):
+        # 先换回真实加载器，模块代码和之后的 importlib.resources 等看到的都是原对象
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._exec(module.__name__, self._loader, module, self._find_time + self._create_time)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """统计每个模块的导入耗时，相当于聚合后的 python -X importtime
+
+    作为 sys.meta_path 的第一个查找器，把查找委托给其后的查找器，
+    再用 _TimingLoader 包装找到的加载器。self 为模块自身耗时（不含其导入的子模块），
+    cumulative 为包含子模块在内的总耗时。
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.started = time.perf_counter()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def find_spec(self, fullname, path=None, target=None):
+        start = time.perf_counter()
+        finders = sys.meta_path[sys.meta_path.index(self) + 1:] if self in sys.meta_path else []
+        for finder in finders:
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimingLoader(spec.loader, self, time.perf_counter() - start)
+            return spec
+        return None
+
+    def _exec(self, name, loader, module, overhead):
+        stack = self._stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start + overhead
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            self.records[name] = (total - children, total)
+
+    # ---------- 报告 ----------
+    def by_package(self):
+        """按顶层包聚合自身耗时，返回 {包名: (模块数, 秒)}"""
+        packages = defaultdict(lambda: [0, 0.0])
+        for name, (own, _) in self.records.items():
+            entry = packages[name.partition('.')[0]]
+            entry[0] += 1
+            entry[1] += own
+        return {name: tuple(entry) for name, entry in packages.items()}
+
+    def report(self, top=25, file=None):
+        file = sys.stderr if file is None else file
+        total = sum(own for own, _ in self.records.values())
+        print(f"[导入耗时] 共 {len(self.records)} 个模块，导入合计 {total * 1000:.0f} ms，"
+              f"启动至今 {(time.perf_counter() - self.started) * 1000:.0f} ms", file=file)
+        print(f"{'顶层包':<32}{'模块数':>8}{'自身(ms)':>12}", file=file)
+        packages = sorted(self.by_package().items(), key=lambda item: item[1][1], reverse=True)
+        for name, (count, own) in packages[:top]:
+            print(f"{name:<32}{count:>8}{own * 1000:>12.1f}", file=file)
+        print(f"{'模块':<48}{'自身(ms)':>12}{'累计(ms)':>12}", file=file)
+        modules = sorted(self.records.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (own, cumulative) in modules[:top]:
+            print(f"{name:<48}{own * 1000:>12.1f}{cumulative * 1000:>12.1f}", file=file)
+
+
+_profiler = None
+
+
+def install():
+    """开始统计之后发生的导入，重复调用无副作用"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        sys.meta_path.insert(0, _profiler)
+    return _profiler
+
+
+def install_if_requested(argv=None):
+    """命令行含 --import-profile 或设置了 QE_IMPORT_PROFILE 时开启统计"""
+    argv = sys.argv if argv is None else argv
+    if PROFILE_FLAG in argv or os.environ.get(PROFILE_ENV):
+        install()
+    return enabled()
+
+
+def enabled():
+    return _profiler is not None
+
+
+def uninstall():
+    global _profiler
+    if _profiler is not None:
+        if _profiler in sys.meta_path:
+            sys.meta_path.remove(_profiler)
+        _profiler = None
+
+
+def report(top=25, file=None):
+    """打印启动报告；未开启统计时什么也不做"""
+    if _profiler is not None:
+        _profiler.report(top, file)
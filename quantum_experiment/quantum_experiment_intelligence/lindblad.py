@@ -0,0 +1,118 @@
+from functools import lru_cache
+
+import numpy as np
+
+_PAULI = {
+    'I': np.eye(2, dtype=np.complex128),
+    'X': np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    'Z': np.array([[1, 0], [0, -1]], dtype=np.complex128)
+}
+# 按行展开的 Pauli 基，与 NoiseManager._PAULI_VEC 相同
+_PAULI_VEC = np.stack([_PAULI[p].reshape(4) for p in 'IXYZ'])
+# 能量弛豫 |1> -> |0>（Bloch 球北极 z = +1 为基态）
+_SIGMA_MINUS = np.array([[0, 1], [0, 0]], dtype=np.complex128)
+
+
+def decay_rates(t1, t2):
+    """由 T1、T2 得到 (能量弛豫率 γ1, 纯退相位率 γφ)
+
+    1/T2 = 1/(2T1) + γφ；T2 > 2T1 不物理，此时取 γφ = 0。
+    """
+    gamma1 = 1.0 / t1
+    gamma_phi = max(1.0 / t2 - 0.5 * gamma1, 0.0)
+    return gamma1, gamma_phi
+
+
+def _dissipator(L):
+    """D[L]ρ = LρL† - ½{L†L, ρ} 的超算符，作用于按行展开的 vec(ρ)"""
+    LdL = np.conj(L.T) @ L
+    eye = np.eye(2)
+    return np.kron(L, np.conj(L)) - 0.5 * np.kron(LdL, eye) - 0.5 * np.kron(eye, LdL.T)
+
+
+def lindblad_superoperator(t1, t2, rabi=0.0, detuning=0.0):
+    """Lindblad 生成元 𝓛，满足 d vec(ρ)/dt = 𝓛 · vec(ρ)
+
+    哈密顿量 H = (Ω/2) X + (Δ/2) Z，耗散项为 √γ1 σ- 与 √(γφ/2) Z。
+    """
+    gamma1, gamma_phi = decay_rates(t1, t2)
+    H = 0.5 * rabi * _PAULI['X'] + 0.5 * detuning * _PAULI['Z']
+    eye = np.eye(2)
+    L = -1j * (np.kron(H, eye) - np.kron(eye, H.T))
+    L = L + gamma1 * _dissipator(_SIGMA_MINUS)
+    L = L + 0.5 * gamma_phi * _dissipator(_PAULI['Z'])
+    return L
+
+
+@lru_cache(maxsize=64)
+def bloch_generator(t1, t2, rabi=0.0, detuning=0.0):
+    """生成元的实 4x4 Bloch 形式 G_ab = tr(P_a 𝓛(P_b)) / 2，作用于 (1, x, y, z)"""
+    L = lindblad_superoperator(t1, t2, rabi, detuning)
+    G = np.real(np.conj(_PAULI_VEC) @ L @ _PAULI_VEC.T) / 2
+    G.setflags(write=False)
+    return G
+
+
+@lru_cache(maxsize=64)
+def propagator(t1, t2, rabi, detuning, dt):
+    """时间步 dt 的传播子 exp(G·dt)，每组参数只求一次矩阵指数"""
+    # scipy.linalg 导入较慢，只在第一次需要矩阵指数时加载
+    from scipy.linalg import expm
+
+    P = expm(bloch_generator(t1, t2, rabi, detuning) * dt)
+    P.setflags(write=False)
+    return P
+
+
+def fixed_point(t1, t2, rabi=0.0, detuning=0.0):
+    """稳态 Bloch 向量：解 G[1:, 1:] r = -G[1:, 0]"""
+    G = bloch_generator(t1, t2, rabi, detuning)
+    return np.linalg.solve(G[1:, 1:], -G[1:, 0])
+
+
+class LindbladEvolution:
+    """单比特在 Lindblad 主方程下的连续时间演化
+
+    状态以 Bloch 形式 v = (1, x, y, z) 保存，每一步只做一次 4x4 矩阵-向量乘；
+    传播子按 (T1, T2, Ω, Δ, dt) 缓存，只有参数变化时才重新计算矩阵指数。
+    """
+
+    def __init__(self, t1=10.0, t2=10.0, rabi=0.0, detuning=0.0, dt=0.05):
+        self.t1 = t1
+        self.t2 = t2
+        self.rabi = rabi
+        self.detuning = detuning
+        self.dt = dt
+        self.time = 0.0
+        self.vector = np.array([1.0, 0.0, 0.0, 1.0])
+
+    def set_parameters(self, t1=None, t2=None, rabi=None, detuning=None, dt=None):
+        for name, value in (('t1', t1), ('t2', t2), ('rabi', rabi), ('detuning', detuning), ('dt', dt)):
+            if value is not None:
+                setattr(self, name, float(value))
+
+    def reset(self, bloch):
+        self.vector = np.concatenate([[1.0], np.asarray(bloch, dtype=float)])
+        self.time = 0.0
+
+    @property
+    def bloch(self):
+        return self.vector[1:]
+
+    def step(self, n=1):
+        """前进 n 个时间步，返回新的 Bloch 向量"""
+        P = propagator(self.t1, self.t2, self.rabi, self.detuning, self.dt)
+        if n != 1:
+            P = np.linalg.matrix_power(P, n)
+        self.vector = P @ self.vector
+        self.time += n * self.dt
+        return self.bloch
+
+    def density_matrix(self):
+        x, y, z = self.bloch
+        return 0.5 * np.array([[1 + z, x - 1j * y],
+                               [x + 1j * y, 1 - z]], dtype=np.complex128)
+
+    def fixed_point(self):
+        return fixed_point(self.t1, self.t2, self.rabi, self.detuning)
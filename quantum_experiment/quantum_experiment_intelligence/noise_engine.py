@@ -0,0 +1,551 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+from fidelity import pure_state_fidelity
+from density_matrix import DensityMatrix, GATES
+from trajectories import run_ghz_trajectories
+from tomography import maximum_likelihood, linear_inversion, project_to_physical
+from lindblad import LindbladEvolution
+
+# 多比特寄存器模式：(显示名称, 比特数)，0 表示单比特模式
+REGISTER_MODES = [("单比特", 0), ("Bell态", 2), ("GHZ(3)", 3), ("GHZ(5)", 5), ("GHZ(8)", 8),
+                  ("GHZ(10)", 10), ("GHZ(12)", 12)]
+# 寄存器模拟后端：(显示名称, 标识, 交互可用的最大比特数)
+# 密度矩阵内存为 4^n，轨迹后端每条轨迹只需 2^n
+REGISTER_BACKENDS = [("密度矩阵", "density", 10), ("量子轨迹", "trajectory", 12)]
+TRAJECTORY_COUNT = 400
+
+# 测量基变换矩阵：把 X/Y 本征态旋转到计算基，只构造一次
+BASIS_GATES = {
+    'X': np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2),
+    'Y': np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2) @ np.array([[1, 0], [0, -1j]],
+                                                                                   dtype=np.complex128),
+    'Z': np.eye(2, dtype=np.complex128)
+}
+
+
+def measure_batch(states, bases, noise_param, noise_type, n_shots, rng=None):
+    """批量多基测量：一组量子态在多组测量基下的计数
+
+    states: 形状 (N, 2) 的态矢量；bases: 如 'XYZ' 或 ['X', 'Z']；
+    返回形状 (N, len(bases), 2) 的整数计数 (count0, count1)。
+    """
+    rng = np.random if rng is None else rng
+    states = np.asarray(states, dtype=np.complex128).reshape(-1, 2)
+    gates = np.stack([BASIS_GATES[b] for b in bases])
+    # 基变换并构造密度矩阵 (N, B, 2, 2)
+    transformed = np.einsum('bij,nj->nbi', gates, states)
+    rho = np.einsum('nbi,nbj->nbij', transformed, transformed.conj())
+    noisy_rho = NoiseManager.apply_noise(rho, noise_param, noise_type)
+    p0 = np.clip(np.real(noisy_rho[..., 0, 0]), 0.0, 1.0)
+    count0 = rng.binomial(n_shots, p0)
+    return np.stack([count0, n_shots - count0], axis=-1)
+
+
+class QuantumState:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.theta = np.pi / 4
+        self.phi = 0
+        self.state = self.get_state_vector()
+        self.theory_rho = np.outer(self.state, self.state.conj())
+        self.experimental_rho = None
+        self.experimental_counts = {'X': (0, 0), 'Y': (0, 0), 'Z': (0, 0)}
+        self.bloch = (0, 0, 0)
+
+    def get_state_vector(self):
+        return np.array([
+            np.cos(self.theta / 2),
+            np.sin(self.theta / 2) * np.exp(1j * self.phi)
+        ], dtype=np.complex128)
+
+    def apply_gate(self, matrix):
+        self.state = matrix @ self.state
+        self.state /= np.linalg.norm(self.state)
+        self.update_angles()
+        self.theory_rho = np.outer(self.state, self.state.conj())
+        self.experimental_rho = None
+        self.experimental_counts = {'X': (0, 0), 'Y': (0, 0), 'Z': (0, 0)}
+
+    def update_angles(self):
+        a, b = self.state[0], self.state[1]
+        self.theta = 2 * np.arctan2(np.abs(b), np.abs(a))
+        self.phi = (np.angle(b) - np.angle(a)) % (2 * np.pi) if np.abs(a) > 1e-8 else np.angle(b)
+
+    def get_bloch_coordinates(self, rho=None):
+        if rho is None:
+            x = np.sin(self.theta) * np.cos(self.phi)
+            y = np.sin(self.theta) * np.sin(self.phi)
+            z = np.cos(self.theta)
+            return (x, y, z)
+        else:
+            X = np.array([[0, 1], [1, 0]])
+            Y = np.array([[0, -1j], [1j, 0]])
+            Z = np.array([[1, 0], [0, -1]])
+            return (np.real(np.trace(rho @ X)),
+                    np.real(np.trace(rho @ Y)),
+                    np.real(np.trace(rho @ Z)))
+
+    def measure_in_basis(self, basis, noise_param, noise_type, n_shots, rng=None):
+        count0, count1 = measure_batch(self.state, basis, noise_param, noise_type, n_shots, rng)[0, 0]
+        return int(count0), int(count1)
+
+    def measure_all_bases(self, noise_param, noise_type, n_shots, bases='XYZ', rng=None):
+        """一次完成多个基下的测量，返回 {基: (count0, count1)}"""
+        counts = measure_batch(self.state, bases, noise_param, noise_type, n_shots, rng)[0]
+        return {b: (int(c[0]), int(c[1])) for b, c in zip(bases, counts)}
+
+    def get_fidelity(self):
+        if self.experimental_rho is None:
+            return 0.0
+        # 理论态为纯态，F = <ψ|ρ_exp|ψ>
+        return float(pure_state_fidelity(self.state, self.experimental_rho))
+
+
+class NoiseManager:
+    noise_types = {
+        "退极化噪声": "depolarizing",
+        "振幅阻尼": "amplitude_damping",
+        "相位阻尼": "phase_damping",
+        "组合噪声": "pipeline"
+    }
+
+    # 组合噪声的通道序列 (类型, 相对强度)，按顺序作用：T1 -> T2 -> 退极化；
+    # 每级实际强度为 相对强度 × 噪声强度滑条，截断到 [0, 1]
+    pipeline = [
+        ("amplitude_damping", 1.0),
+        ("phase_damping", 1.0),
+        ("depolarizing", 0.5)
+    ]
+    _CHANNELS = ("depolarizing", "amplitude_damping", "phase_damping")
+
+    # Kraus 算符中与参数无关的常量部分
+    _LOWER = np.array([[0, 1], [0, 0]], dtype=np.complex128)
+    _P0 = np.array([[1, 0], [0, 0]], dtype=np.complex128)
+    _P1 = np.array([[0, 0], [0, 1]], dtype=np.complex128)
+
+    @classmethod
+    def kraus_operators(cls, noise_type, param):
+        """单比特噪声通道的 Kraus 算符列表
+
+        param 可为标量或数组，数组时每个算符形状为 param.shape + (2, 2)，
+        由标量系数乘常量矩阵得到，可直接与同形状的密度矩阵栈广播运算。
+        """
+        if noise_type == "pipeline":
+            # 组合通道的 Kraus 算符为各级算符的全部乘积 K_n … K_1
+            stage_ops = [cls.kraus_operators(t, strength)
+                         for t, strength in cls.pipeline_stages(param)]
+            combined = []
+            for ops in product(*stage_ops):
+                K = ops[0]
+                for op in ops[1:]:
+                    K = op @ K
+                combined.append(K)
+            return combined
+        p = np.asarray(param, dtype=float)[..., None, None]
+        if noise_type == "depolarizing":
+            return [np.sqrt(1 - p) * GATES['I'], np.sqrt(p / 3) * GATES['X'],
+                    np.sqrt(p / 3) * GATES['Y'], np.sqrt(p / 3) * GATES['Z']]
+        elif noise_type == "amplitude_damping":
+            return [cls._P0 + np.sqrt(1 - p) * cls._P1, np.sqrt(p) * cls._LOWER]
+        elif noise_type == "phase_damping":
+            return [cls._P0 + np.sqrt(1 - p) * cls._P1, np.sqrt(p) * cls._P1]
+        return [np.broadcast_to(GATES['I'], p.shape[:-2] + (2, 2))]
+
+    # 按行展开的 Pauli 基 vec(I), vec(X), vec(Y), vec(Z)，用于超算符与 PTM 之间的换算
+    _PAULI_VEC = np.stack([GATES[p].reshape(4) for p in 'IXYZ'])
+
+    @classmethod
+    def pipeline_stages(cls, param):
+        """把滑条强度换算为组合噪声各级的 (类型, 强度)"""
+        if np.ndim(param) == 0:
+            return tuple((t, min(max(w * float(param), 0.0), 1.0)) for t, w in cls.pipeline)
+        return tuple((t, np.clip(w * np.asarray(param, dtype=float), 0.0, 1.0)) for t, w in cls.pipeline)
+
+    @classmethod
+    def set_pipeline(cls, stages):
+        """设置组合噪声的通道序列，stages 为 [(类型, 相对强度), ...]"""
+        for noise_type, _ in stages:
+            if noise_type not in cls._CHANNELS:
+                raise ValueError(f"未知噪声通道: {noise_type}")
+        cls.pipeline = [(t, float(w)) for t, w in stages]
+
+    @classmethod
+    def build_superoperator(cls, noise_type, param):
+        """S = Σ K ⊗ K*，满足 vec(E(ρ)) = S · vec(ρ)；param 为数组时返回 param.shape + (4, 4)"""
+        if noise_type == "pipeline":
+            return cls.compose([cls.build_superoperator(t, strength)
+                                for t, strength in cls.pipeline_stages(param)])
+        ops = cls.kraus_operators(noise_type, param)
+        S = sum(np.einsum('...ij,...kl->...ikjl', K, np.conj(K)) for K in ops)
+        return S.reshape(S.shape[:-4] + (4, 4))
+
+    @classmethod
+    def superoperator(cls, noise_type, param):
+        """标量强度下的超算符，每个 (类型, 强度) 只编译一次，返回只读数组"""
+        if noise_type == "pipeline":
+            return cls.fused_superoperator(cls.pipeline_stages(param))
+        return cls._channel_superoperator(noise_type, param)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _channel_superoperator(noise_type, param):
+        S = NoiseManager.build_superoperator(noise_type, param)
+        S.setflags(write=False)
+        return S
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def fused_superoperator(stages):
+        """通道序列 ((类型, 强度), ...) 融合为一个超算符并缓存，参数不变时直接复用"""
+        S = NoiseManager.compose([NoiseManager._channel_superoperator(t, p) for t, p in stages])
+        S.setflags(write=False)
+        return S
+
+    @classmethod
+    def pauli_transfer_matrix(cls, noise_type, param):
+        """Pauli 转移矩阵 R_ab = tr(P_a E(P_b)) / 2，实 4x4，直接作用于 (1, x, y, z)"""
+        # 组合噪声还取决于可变的 cls.pipeline，缓存键与 fused_superoperator 一样用换算后的各级 (类型, 强度)
+        if noise_type == "pipeline":
+            return cls._pipeline_ptm(cls.pipeline_stages(param))
+        return cls._channel_ptm(noise_type, param)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _channel_ptm(noise_type, param):
+        return NoiseManager._superoperator_to_ptm(NoiseManager._channel_superoperator(noise_type, param))
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _pipeline_ptm(stages):
+        return NoiseManager._superoperator_to_ptm(NoiseManager.fused_superoperator(stages))
+
+    @staticmethod
+    def _superoperator_to_ptm(S):
+        V = NoiseManager._PAULI_VEC
+        R = np.real(np.conj(V) @ S @ V.T) / 2
+        R.setflags(write=False)
+        return R
+
+    @staticmethod
+    def compose(superops):
+        """按顺序依次作用的通道预先相乘为一个超算符，支持批量 (..., 4, 4)"""
+        total = np.eye(4, dtype=np.complex128)
+        for S in superops:
+            total = S @ total
+        return total
+
+    @classmethod
+    def apply_superoperator(cls, rho, S):
+        """对 (..., 2, 2) 的密度矩阵栈施加超算符，只做一次矩阵-向量乘"""
+        rho = np.asarray(rho)
+        vec = rho.reshape(rho.shape[:-2] + (4,))
+        if S.ndim == 2:
+            out = vec @ S.T
+        else:
+            out = np.einsum('...ij,...j->...i', S, vec)
+        return out.reshape(out.shape[:-1] + (2, 2))
+
+    @classmethod
+    def apply_noise(cls, rho, param, noise_type):
+        if noise_type not in cls.noise_types.values():
+            return rho
+        if np.ndim(param) == 0:
+            S = cls.superoperator(noise_type, float(param))
+        else:
+            S = cls.build_superoperator(noise_type, param)
+        return cls.apply_superoperator(rho, S)
+
+    @classmethod
+    def apply_noise_bloch(cls, bloch, param, noise_type):
+        """在 Bloch 向量上施加噪声：r' = R[1:, 0] + R[1:, 1:] r"""
+        bloch = np.asarray(bloch, dtype=float)
+        if noise_type not in cls.noise_types.values():
+            return bloch
+        R = cls.pauli_transfer_matrix(noise_type, float(param))
+        return R[1:, 0] + bloch @ R[1:, 1:].T
+
+
+def simulate_register(qstate, n_qubits, noise_param, noise_type, backend="density", seed=None):
+    """以当前单比特态为控制比特制备 GHZ 型寄存器，再对每个比特施加同一噪声通道
+
+    返回 (各比特约化 Bloch 向量, 纯度, 纯度标准误差, 与无噪声态的保真度)。
+    backend 为 "trajectory" 时用量子轨迹平均代替密度矩阵，纯度为估计值，seed 固定其随机流；
+    密度矩阵后端的纯度是精确值，标准误差为 0。
+    """
+    if backend == "trajectory":
+        ops = None
+        if noise_type in NoiseManager.noise_types.values():
+            ops = NoiseManager.kraus_operators(noise_type, float(noise_param))
+        vectors, _, purity, purity_stderr, fidelity = run_ghz_trajectories(n_qubits, qstate.state, ops,
+                                                                           TRAJECTORY_COUNT, seed=seed)
+        return vectors, purity, purity_stderr, fidelity
+    ideal = DensityMatrix.ghz(n_qubits, qstate.state)
+    noisy = ideal.copy()
+    if noise_type in NoiseManager.noise_types.values():
+        noisy.apply_superoperator_all(NoiseManager.superoperator(noise_type, float(noise_param)))
+    return noisy.bloch_vectors(), noisy.purity(), 0.0, noisy.overlap(ideal)
+
+
+def fidelity_sweep(state, params=None, shots_list=(100, 1000, 5000), repeats=200, noise_types=None, rng=None):
+    """噪声强度扫描：一次批量计算保真度-噪声强度曲线族
+
+    对每种噪声类型，用批量超算符一次得到全部强度下三个测量基的 |0> 概率，
+    再为每个测量次数、每次重复抽样计数，经线性反演和物理投影得到实验态，
+    与理论纯态计算保真度。返回
+    {'params': (P,), 'shots': [...], 'curves': {名称: {'exact': (P,), 'mean'/'low'/'high': (S, P)}}}，
+    low/high 为重复实验的 2.5%/97.5% 分位数。
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    params = np.linspace(0, 1, 1000) if params is None else np.asarray(params, dtype=float)
+    noise_types = NoiseManager.noise_types if noise_types is None else noise_types
+    shots = np.asarray(shots_list)
+    state = np.asarray(state, dtype=np.complex128)
+
+    # 基变换后的密度矩阵 vec 形式 (3, 4)
+    gates = np.stack([BASIS_GATES[b] for b in 'XYZ'])
+    transformed = gates @ state
+    vec_rho = np.einsum('bi,bj->bij', transformed, transformed.conj()).reshape(3, 4)
+
+    curves = {}
+    for name, noise_type in noise_types.items():
+        S = NoiseManager.build_superoperator(noise_type, params)  # (P, 4, 4)
+        p0 = np.clip(np.real(np.einsum('pj,bj->pb', S[:, 0, :], vec_rho)), 0.0, 1.0)  # (P, 3)
+
+        # 无限次测量极限：与 measure_batch 相同，噪声作用在基变换之后
+        exact_rho = project_to_physical(linear_inversion(np.stack([p0, 1 - p0], axis=-1)))
+        exact = pure_state_fidelity(state, exact_rho)
+
+        # 抽样计数 (S, R, P, 3) -> 层析重建 -> 保真度
+        count0 = rng.binomial(shots[:, None, None, None], p0[None, None], size=(len(shots), repeats) + p0.shape)
+        counts = np.stack([count0, shots[:, None, None, None] - count0], axis=-1)
+        rho = project_to_physical(linear_inversion(counts))
+        fid = pure_state_fidelity(state, rho)  # (S, R, P)
+
+        low, high = np.percentile(fid, [2.5, 97.5], axis=1)
+        curves[name] = {'exact': exact, 'mean': fid.mean(axis=1), 'low': low, 'high': high}
+    return {'params': params, 'shots': list(shots_list), 'curves': curves}
+
+
+# 单次测量的结果：各基计数 {基: (count0, count1)}、重建的密度矩阵与保真度
+MeasurementResult = namedtuple('MeasurementResult', ['counts', 'rho', 'fidelity'])
+
+
+class NoiseSimulationEngine:
+    """不依赖 pygame 的噪声模拟引擎
+
+    量子态、噪声类型与强度、测量次数、寄存器设置和连续演化都保存在实例上，
+    所有随机抽样都使用实例自己的随机数发生器，相同 seed 得到相同的实验序列。
+    图形界面只负责把控件同步到引擎并绘制结果。
+    """
+
+    def __init__(self, seed=None, noise_type="depolarizing", noise_param=0.2, shots=1000):
+        self.rng = np.random.default_rng(seed)
+        self.qstate = QuantumState()
+        self.noise_index = list(NoiseManager.noise_types.values()).index(noise_type)
+        self.noise_param = noise_param
+        self.shots = shots
+        self.fidelity_history = []
+        self.register_mode = 0
+        self.register_backend = 0
+        self.evolution = LindbladEvolution()
+        self._register_key = None
+        self._register_result = None
+        # 后台重算：(输入, future)，同一时间最多一个
+        self._register_job = None
+        self._register_executor = None
+
+    # ---------- 量子态与门 ----------
+    @property
+    def noise_type(self):
+        return list(NoiseManager.noise_types.values())[self.noise_index]
+
+    @property
+    def noise_name(self):
+        return list(NoiseManager.noise_types)[self.noise_index]
+
+    def set_angles(self, theta, phi):
+        qs = self.qstate
+        qs.theta, qs.phi = theta, phi
+        qs.state = qs.get_state_vector()
+        qs.theory_rho = np.outer(qs.state, qs.state.conj())
+
+    def apply_gate(self, gate):
+        """gate 为 GATES 中的名称或 2x2 矩阵"""
+        self.qstate.apply_gate(GATES[gate] if isinstance(gate, str) else np.asarray(gate, dtype=np.complex128))
+
+    def reset(self):
+        self.qstate.reset()
+
+    def set_noise(self, noise_type=None, noise_param=None):
+        if noise_type is not None:
+            self.noise_index = list(NoiseManager.noise_types.values()).index(noise_type)
+        if noise_param is not None:
+            self.noise_param = float(noise_param)
+
+    def cycle_noise(self):
+        self.noise_index = (self.noise_index + 1) % len(NoiseManager.noise_types)
+
+    # ---------- 测量 ----------
+    def measure(self, shots=None):
+        """X/Y/Z 三个基批量测量并做最大似然层析，结果写回当前量子态"""
+        shots = self.shots if shots is None else shots
+        qs = self.qstate
+        counts = qs.measure_all_bases(self.noise_param, self.noise_type, int(shots), rng=self.rng)
+        qs.experimental_rho = maximum_likelihood(np.array([counts[b] for b in 'XYZ']))
+        qs.experimental_counts = counts
+        fidelity = qs.get_fidelity()
+        self.fidelity_history.append(fidelity)
+        return MeasurementResult(counts, qs.experimental_rho, fidelity)
+
+    def measure_repeated(self, repeats, shots=None, estimator="mle"):
+        """同一设置下独立重复 repeats 次实验，批量重建，返回保真度数组 (repeats,)
+
+        estimator 为 "mle"（最大似然）或 "linear"（线性反演加物理投影），不改变当前显示的实验态。
+        """
+        shots = self.shots if shots is None else shots
+        state = self.qstate.state
+        counts = measure_batch(np.broadcast_to(state, (repeats, 2)), 'XYZ', self.noise_param, self.noise_type,
+                               int(shots), self.rng)
+        if estimator == "mle":
+            rho = maximum_likelihood(counts)
+        elif estimator == "linear":
+            rho = project_to_physical(linear_inversion(counts))
+        else:
+            raise ValueError(f"未知的重建方法: {estimator}")
+        return pure_state_fidelity(state, rho)
+
+    def sample_bloch(self, noisy=True, shots=None):
+        """按当前测量次数均分到三个基，抽样得到归一化的 Bloch 方向"""
+        per = max(1, int(self.shots if shots is None else shots) // 3)
+        noise_type = self.noise_type if noisy else None
+        counts = measure_batch(self.qstate.state, 'XYZ', self.noise_param if noisy else 0.0, noise_type, per,
+                               self.rng)[0]
+        vec = (counts[:, 0] - counts[:, 1]) / per
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    # ---------- 多比特寄存器 ----------
+    @property
+    def register_qubits(self):
+        return REGISTER_MODES[self.register_mode][1]
+
+    @property
+    def backend(self):
+        return REGISTER_BACKENDS[self.register_backend][1]
+
+    def cycle_register(self):
+        """切换到下一个寄存器模式，跳过当前后端无法交互模拟的比特数"""
+        max_qubits = REGISTER_BACKENDS[self.register_backend][2]
+        mode = (self.register_mode + 1) % len(REGISTER_MODES)
+        while REGISTER_MODES[mode][1] > max_qubits:
+            mode = (mode + 1) % len(REGISTER_MODES)
+        self.register_mode = mode
+
+    def cycle_backend(self):
+        self.register_backend = (self.register_backend + 1) % len(REGISTER_BACKENDS)
+        if self.register_qubits > REGISTER_BACKENDS[self.register_backend][2]:
+            self.register_mode = 0
+
+    def _register_key_now(self):
+        qs = self.qstate
+        return self.register_qubits, qs.theta, qs.phi, self.noise_param, self.noise_type, self.backend
+
+    def _simulate_register_args(self):
+        """simulate_register 的参数；量子态复制一份，后台线程不读共享对象"""
+        snapshot = QuantumState()
+        snapshot.state = self.qstate.state.copy()
+        return (snapshot, self.register_qubits, self.noise_param, self.noise_type, self.backend,
+                int(self.rng.integers(2 ** 32)))
+
+    def register(self):
+        """当前寄存器的 (Bloch 向量, 纯度, 纯度标准误差, 保真度)，输入不变时直接返回上次结果"""
+        key = self._register_key_now()
+        if key != self._register_key:
+            self._register_key = key
+            self._register_result = simulate_register(*self._simulate_register_args())
+        return self._register_result
+
+    def register_async(self):
+        """register 的非阻塞版本，供界面每帧调用
+
+        输入变化时在后台线程重算，计算完成前返回上次的结果（从未算过时为 None）。
+        拖动滑条期间最多只有一个计算在进行，完成后若输入又变了再按最新输入重算。
+        """
+        job = self._register_job
+        if job is not None and job[1].done():
+            self._register_job = None
+            self._register_key, self._register_result = job[0], job[1].result()
+        key = self._register_key_now()
+        if self._register_job is None and key != self._register_key:
+            if self._register_executor is None:
+                self._register_executor = ThreadPoolExecutor(1, thread_name_prefix='register')
+            self._register_job = (key, self._register_executor.submit(simulate_register,
+                                                                      *self._simulate_register_args()))
+        return self._register_result
+
+    @property
+    def register_pending(self):
+        """后台是否有尚未取回的寄存器计算"""
+        return self._register_job is not None
+
+    def close(self):
+        """关闭寄存器计算线程，不等待正在进行的计算"""
+        if self._register_executor is not None:
+            self._register_executor.shutdown(wait=False, cancel_futures=True)
+            self._register_executor = None
+        self._register_job = None
+
+    # ---------- 连续演化 ----------
+    def start_evolution(self):
+        self.evolution.reset(self.qstate.get_bloch_coordinates())
+
+    def step_evolution(self, n=1):
+        return self.evolution.step(n)
+
+    # ---------- 导出 ----------
+    def analysis_payload(self):
+        """分析窗口所需的数据，只含可序列化的基本类型"""
+        qs = self.qstate
+        theory_coords = qs.get_bloch_coordinates()
+        exp_coords = (0, 0, 0) if qs.experimental_rho is None else qs.get_bloch_coordinates(qs.experimental_rho)
+        return {
+            'fidelity_history': [float(f) for f in self.fidelity_history],
+            'theory_coords': [float(c) for c in theory_coords],
+            'exp_coords': [float(c) for c in exp_coords],
+            'z_counts': [int(c) for c in qs.experimental_counts.get('Z', (0, 0))],
+            'noise_level': float(self.noise_param),
+            'shots': int(self.shots)
+        }
+
+
+def run_experiment(config, seed=None):
+    """按配置字典独立运行一组重复实验，可在工作进程中调用
+
+    config 键：theta、phi、noise_type、noise_param、shots、repeats，可选 estimator。
+    返回 {'config': config, 'fidelity': (repeats,), 'mean': 平均保真度}。
+    """
+    engine = NoiseSimulationEngine(seed, config['noise_type'], config['noise_param'], config['shots'])
+    engine.set_angles(config['theta'], config['phi'])
+    fidelity = engine.measure_repeated(config.get('repeats', 1), estimator=config.get('estimator', 'mle'))
+    return {'config': config, 'fidelity': fidelity, 'mean': float(fidelity.mean())}
+
+
+def run_experiments(configs, workers=None, seed=None):
+    """批量运行噪声实验，workers 大于 1 时分发到进程池
+
+    每组配置使用由 SeedSequence(seed) 派生的独立随机流，结果与 workers 数无关、可复现。
+    """
+    configs = list(configs)
+    seeds = np.random.SeedSequence(seed).spawn(len(configs))
+    if workers and workers > 1:
+        chunksize = max(1, len(configs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run_experiment, configs, seeds, chunksize=chunksize))
+    return [run_experiment(c, s) for c, s in zip(configs, seeds)]
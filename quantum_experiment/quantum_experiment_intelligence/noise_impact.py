@@ -1,21 +1,26 @@
-import sys
+if __name__ == "__main__":
+    # 作为入口脚本运行时，必须在其余导入之前开启统计（需 --import-profile）；被其他模块导入时不做任何事
+    import import_profiler
+
+    import_profiler.install_if_requested()
+
+import multiprocessing
 import warnings
+from collections import OrderedDict
+from functools import lru_cache
 import pygame
 import numpy as np
-import scipy
 from pygame.locals import *
-import matplotlib
-import matplotlib.pyplot as plt
+from noise_engine import NoiseManager, NoiseSimulationEngine, REGISTER_MODES, REGISTER_BACKENDS
+from analysis_window import AnalysisClient
 
 warnings.filterwarnings("ignore")
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
 
-current_noise = 0
-measuring = False
-animating = False
-anim_theory_pts = []
-anim_exp_pts = []
+# 组合噪声各级在状态栏中的简称
+STAGE_LABELS = {"amplitude_damping": "T1", "phase_damping": "T2", "depolarizing": "退极化"}
+
+REGISTER_COLORS = [(230, 180, 60), (90, 170, 240), (240, 110, 110), (150, 230, 120),
+                   (200, 130, 230), (240, 160, 90), (110, 220, 220), (220, 220, 120)]
 
 COLORS = {
     'background': (30, 30, 45),
@@ -27,13 +32,55 @@ COLORS = {
     'button': (70, 70, 90),
     'hover': (90, 90, 110),
     'theory': '#64c896',
-    'experiment': '#c86496'
+    'experiment': '#c86496',
+    'evolution': '#e6b450'
 }
 
 WIDTH, HEIGHT = 1400, 820
 PANEL_WIDTH = 300
 SPHERE_CENTER = (PANEL_WIDTH + (WIDTH - PANEL_WIDTH) // 2, HEIGHT // 2)
 CONTROL_START = 20
+IDLE_WAIT_MS = 500
+# 常驻进程模式下空闲等待的上限，保证主程序推送的命令能及时处理
+IPC_POLL_MS = 100
+# 动画轨迹环形缓冲区容量与点半径；默认保留最近 200 个点，"长轨迹" 按钮切换到 10^4 个点
+TRAIL_CAPACITY = 200
+LONG_TRAIL_CAPACITY = 10000
+TRAIL_RADIUS = 4
+BUTTON_WIDTH = 125
+BUTTON_GAP = 10
+# 连续演化：每帧推进的模拟时间 (μs)，参数滑条位于投影面板下方
+EVOLUTION_DT = 0.05
+EVOLUTION_X = WIDTH - 260
+
+
+class TextCache:
+    """渲染好的文字表面缓存，按 (字体, 文本, 颜色) 索引，超出容量时淘汰最久未用的条目
+
+    文本不变的标签每帧只是一次字典查找，只有内容变化的标签才会重新光栅化。
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.maxsize:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+text_cache = TextCache()
 
 
 class Button:
@@ -47,15 +94,21 @@ class Button:
         color = COLORS['hover'] if self.hover else COLORS['button']
         pygame.draw.rect(surface, color, self.rect, border_radius=4)
         pygame.draw.rect(surface, COLORS['border'], self.rect, 2, border_radius=4)
-        text_surf = font.render(self.text, True, COLORS['text'])
+        text_surf = text_cache.render(font, self.text, COLORS['text'])
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
     def handle_event(self, event):
+        """处理事件，外观或状态可能改变时返回 True"""
         if event.type == MOUSEMOTION:
-            self.hover = self.rect.collidepoint(event.pos)
+            hover = self.rect.collidepoint(event.pos)
+            changed = hover != self.hover
+            self.hover = hover
+            return changed
         elif event.type == MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
             self.callback()
+            return True
+        return False
 
 
 class Slider:
@@ -73,7 +126,7 @@ class Slider:
         self.bar_height = 4
 
     def draw(self, surface):
-        label_surf = font.render(f"{self.label}: {self.value:.2f}", True, COLORS['text'])
+        label_surf = text_cache.render(font, f"{self.label}: {self.value:.2f}", COLORS['text'])
         surface.blit(label_surf, (self.x, self.y - 5))
         bar_rect = pygame.Rect(self.x, self.y + 20, self.bar_width, self.bar_height)
         pygame.draw.rect(surface, COLORS['border'], bar_rect, border_radius=2)
@@ -88,180 +141,146 @@ class Slider:
         return False
 
 
-class QuantumState:
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.theta = np.pi / 4
-        self.phi = 0
-        self.state = self.get_state_vector()
-        self.theory_rho = np.outer(self.state, self.state.conj())
-        self.experimental_rho = None
-        self.experimental_counts = {'X': (0, 0), 'Y': (0, 0), 'Z': (0, 0)}
-        self.bloch = (0, 0, 0)
-
-    def get_state_vector(self):
-        return np.array([
-            np.cos(self.theta / 2),
-            np.sin(self.theta / 2) * np.exp(1j * self.phi)
-        ], dtype=np.complex128)
-
-    def apply_gate(self, matrix):
-        self.state = matrix @ self.state
-        self.state /= np.linalg.norm(self.state)
-        self.update_angles()
-        self.theory_rho = np.outer(self.state, self.state.conj())
-        self.experimental_rho = None
-        self.experimental_counts = {'X': (0, 0), 'Y': (0, 0), 'Z': (0, 0)}
-
-    def update_angles(self):
-        a, b = self.state[0], self.state[1]
-        self.theta = 2 * np.arctan2(np.abs(b), np.abs(a))
-        self.phi = (np.angle(b) - np.angle(a)) % (2 * np.pi) if np.abs(a) > 1e-8 else np.angle(b)
-
-    def get_bloch_coordinates(self, rho=None):
-        if rho is None:
-            x = np.sin(self.theta) * np.cos(self.phi)
-            y = np.sin(self.theta) * np.sin(self.phi)
-            z = np.cos(self.theta)
-            return (x, y, z)
+def _sphere_lines():
+    """单位球经线 (16, 30, 3) 与纬线 (8, 50, 3) 上的点，只计算一次"""
+    phi = np.linspace(0, 2 * np.pi, 16)[:, None]
+    theta = np.linspace(0, np.pi, 30)[None, :]
+    meridians = np.stack(np.broadcast_arrays(np.sin(theta) * np.cos(phi),
+                                             np.sin(theta) * np.sin(phi),
+                                             np.cos(theta) + 0 * phi), axis=-1)
+    theta = np.linspace(0, np.pi, 8)[:, None]
+    phi = np.linspace(0, 2 * np.pi, 50)[None, :]
+    parallels = np.stack(np.broadcast_arrays(np.sin(theta) * np.cos(phi),
+                                             np.sin(theta) * np.sin(phi),
+                                             np.cos(theta) + 0 * phi), axis=-1)
+    return meridians, parallels
+
+
+class TrailBuffer:
+    """预分配的定长环形缓冲区，存放动画轨迹上的三维点
+
+    追加为 O(1)，写满后覆盖最旧的点，不再做列表头部删除。
+    """
+
+    def __init__(self, capacity, dim=3):
+        self.data = np.zeros((capacity, dim))
+        self.capacity = capacity
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, point):
+        self.data[(self.start + self.size) % self.capacity] = point
+        if self.size < self.capacity:
+            self.size += 1
         else:
-            X = np.array([[0, 1], [1, 0]])
-            Y = np.array([[0, -1j], [1j, 0]])
-            Z = np.array([[1, 0], [0, -1]])
-            return (np.real(np.trace(rho @ X)),
-                    np.real(np.trace(rho @ Y)),
-                    np.real(np.trace(rho @ Z)))
-
-    def measure_in_basis(self, basis, noise_param, noise_type, n_shots):
-        # 复制当前量子态
-        temp_state = self.state.copy()
-
-        # 应用基变换
-        if basis == 'X':
-            gate = np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2)
-        elif basis == 'Y':
-            gate = np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2) @ np.array([[1, 0], [0, -1j]],
-                                                                                            dtype=np.complex128)
-        else:  # Z基
-            gate = np.eye(2)
-
-        transformed_state = gate @ temp_state
-
-        # 应用噪声
-        rho = np.outer(transformed_state, transformed_state.conj())
-        noisy_rho = NoiseManager.apply_noise(rho, noise_param, noise_type)
-
-        # 计算测量概率
-        p0 = np.real(noisy_rho[0, 0])
-        p1 = np.real(noisy_rho[1, 1])
-
-        # 生成测量结果
-        count0 = np.random.binomial(n_shots, p0)
-        count1 = n_shots - count0
-        return count0, count1
-
-    def get_fidelity(self):
-        if self.experimental_rho is None:
-            return 0.0
-        sqrt_rho = scipy.linalg.sqrtm(self.theory_rho)
-        inner = sqrt_rho @ self.experimental_rho @ sqrt_rho
-        sqrt_inner = scipy.linalg.sqrtm(inner)
-        fid = np.real(np.trace(sqrt_inner)) ** 2
-        return min(max(fid, 0.0), 1.0)
-
-
-class NoiseManager:
-    noise_types = {
-        "退极化噪声": "depolarizing",
-        "振幅阻尼": "amplitude_damping",
-        "相位阻尼": "phase_damping"
-    }
-
-    @classmethod
-    def apply_noise(cls, rho, param, noise_type):
-        if noise_type == "depolarizing":
-            return cls.depolarizing(rho, param)
-        elif noise_type == "amplitude_damping":
-            return cls.amplitude_damping(rho, param)
-        elif noise_type == "phase_damping":
-            return cls.phase_damping(rho, param)
-        return rho
-
-    @staticmethod
-    def depolarizing(rho, p):
-        I = np.eye(2)
-        X = np.array([[0, 1], [1, 0]])
-        Y = np.array([[0, -1j], [1j, 0]])
-        Z = np.array([[1, 0], [0, -1]])
-        return (1 - p) * rho + p / 3 * (X @ rho @ X + Y @ rho @ Y + Z @ rho @ Z)
-
-    @staticmethod
-    def amplitude_damping(rho, gamma):
-        E0 = np.array([[1, 0], [0, np.sqrt(1 - gamma)]], dtype=np.complex128)
-        E1 = np.array([[0, np.sqrt(gamma)], [0, 0]], dtype=np.complex128)
-        return E0 @ rho @ E0.conj().T + E1 @ rho @ E1.conj().T
-
-    @staticmethod
-    def phase_damping(rho, gamma):
-        E0 = np.array([[1, 0], [0, np.sqrt(1 - gamma)]], dtype=np.complex128)
-        E1 = np.array([[0, 0], [0, np.sqrt(gamma)]], dtype=np.complex128)
-        return E0 @ rho @ E0.conj().T + E1 @ rho @ E1.conj().T
+            self.start = (self.start + 1) % self.capacity
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def set_capacity(self, capacity):
+        """改变容量，保留最近的 min(size, capacity) 个点"""
+        if capacity == self.capacity:
+            return
+        recent = self.points()[-capacity:]
+        self.data = np.zeros((capacity, self.data.shape[1]))
+        self.data[:len(recent)] = recent
+        self.capacity = capacity
+        self.start = 0
+        self.size = len(recent)
+
+    def points(self):
+        """按时间顺序返回 (size, dim) 的点；未写满时直接返回视图"""
+        if self.size < self.capacity:
+            return self.data[:self.size]
+        return np.roll(self.data, -self.start, axis=0)
+
+
+@lru_cache(maxsize=8)
+def _disk_offsets(radius):
+    """半径 radius 的实心圆内所有像素相对圆心的偏移 (k, 2)"""
+    r = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(r, r, indexing='ij')
+    inside = dx * dx + dy * dy <= radius * radius
+    offsets = np.stack([dx[inside], dy[inside]], axis=-1)
+    offsets.setflags(write=False)
+    return offsets
 
 
 class BlochSphere:
+    MERIDIANS, PARALLELS = _sphere_lines()
+    AXES = [
+        (np.array([1.5, 0, 0]), 'X', (200, 50, 50)),
+        (np.array([0, 1.5, 0]), 'Y', (50, 200, 50)),
+        (np.array([0, 0, 1.5]), 'Z', (50, 50, 200))
+    ]
+
     def __init__(self):
         self.radius = 220
         self.cam_angle_x = 0.4
         self.cam_angle_y = -0.6
         self.dragging = False
         self.grid_color = (80, 80, 100)
+        self._rotation_key = None
+        self._rotation = None
+        self._wireframe_key = None
+        self._wireframe_surface = None
+
+    def rotation(self):
+        """相机旋转矩阵 ry @ rx，仅在相机角度变化时重算"""
+        key = (self.cam_angle_x, self.cam_angle_y)
+        if key != self._rotation_key:
+            cx, sx = np.cos(self.cam_angle_x), np.sin(self.cam_angle_x)
+            cy, sy = np.cos(self.cam_angle_y), np.sin(self.cam_angle_y)
+            rx = np.array([[1, 0, 0],
+                           [0, cx, -sx],
+                           [0, sx, cx]])
+            ry = np.array([[cy, 0, sy],
+                           [0, 1, 0],
+                           [-sy, 0, cy]])
+            self._rotation = ry @ rx
+            self._rotation_key = key
+        return self._rotation
+
+    def project_points(self, points):
+        """批量投影：(..., 3) 的点 -> (..., 2) 的整数屏幕坐标"""
+        rotated = np.asarray(points, dtype=float) @ self.rotation()[:2].T
+        screen = rotated * self.radius + SPHERE_CENTER
+        return screen.astype(int)
 
     def project_3d_to_2d(self, point):
-        rx = np.array([[1, 0, 0],
-                       [0, np.cos(self.cam_angle_x), -np.sin(self.cam_angle_x)],
-                       [0, np.sin(self.cam_angle_x), np.cos(self.cam_angle_x)]])
-        ry = np.array([[np.cos(self.cam_angle_y), 0, np.sin(self.cam_angle_y)],
-                       [0, 1, 0],
-                       [-np.sin(self.cam_angle_y), 0, np.cos(self.cam_angle_y)]])
-        rotated = ry @ rx @ point
-        return (int(SPHERE_CENTER[0] + rotated[0] * self.radius),
-                int(SPHERE_CENTER[1] + rotated[1] * self.radius))
-
-    def draw_wireframe(self, surface):
-        # 经线
-        for phi in np.linspace(0, 2 * np.pi, 16):
-            points = []
-            for theta in np.linspace(0, np.pi, 30):
-                x = np.sin(theta) * np.cos(phi)
-                y = np.sin(theta) * np.sin(phi)
-                z = np.cos(theta)
-                points.append(self.project_3d_to_2d(np.array([x, y, z])))
-            pygame.draw.lines(surface, self.grid_color, False, points, 1)
-
-        # 纬线
-        for theta in np.linspace(0, np.pi, 8):
-            points = []
-            for phi in np.linspace(0, 2 * np.pi, 50):
-                x = np.sin(theta) * np.cos(phi)
-                y = np.sin(theta) * np.sin(phi)
-                z = np.cos(theta)
-                points.append(self.project_3d_to_2d(np.array([x, y, z])))
-            pygame.draw.lines(surface, self.grid_color, True, points, 1)
+        x, y = self.project_points(point)
+        return (int(x), int(y))
+
+    def _render_wireframe(self, size):
+        """在离屏透明表面上绘制线框与坐标轴，坐标相对于控制面板右侧区域"""
+        surface = pygame.Surface(size, SRCALPHA)
+        offset = np.array([PANEL_WIDTH, 0])
+        for line in self.project_points(self.MERIDIANS) - offset:
+            pygame.draw.lines(surface, self.grid_color, False, line.tolist(), 1)
+        for line in self.project_points(self.PARALLELS) - offset:
+            pygame.draw.lines(surface, self.grid_color, True, line.tolist(), 1)
 
         # 坐标轴
-        axes = [
-            (np.array([1.5, 0, 0]), 'X', (200, 50, 50)),
-            (np.array([0, 1.5, 0]), 'Y', (50, 200, 50)),
-            (np.array([0, 0, 1.5]), 'Z', (50, 50, 200))
-        ]
-        for vec, label, color in axes:
-            start = self.project_3d_to_2d(vec * 0.8)
-            end = self.project_3d_to_2d(vec * 1.2)
-            pygame.draw.line(surface, color, start, end, 3)
-            text = font.render(label, True, color)
+        for vec, label, color in self.AXES:
+            start, end = self.project_points(np.stack([vec * 0.8, vec * 1.2])) - offset
+            pygame.draw.line(surface, color, start.tolist(), end.tolist(), 3)
+            text = text_cache.render(font, label, color)
             surface.blit(text, (end[0] + 5, end[1] - 10))
+        return surface
+
+    def draw_wireframe(self, surface):
+        # 线框只在相机转动后重新绘制，其余帧直接贴图
+        size = (surface.get_width() - PANEL_WIDTH, surface.get_height())
+        key = (self.cam_angle_x, self.cam_angle_y, size)
+        if key != self._wireframe_key:
+            self._wireframe_surface = self._render_wireframe(size)
+            self._wireframe_key = key
+        surface.blit(self._wireframe_surface, (PANEL_WIDTH, 0))
 
     def draw_states(self, surface, qstate):
         # 绘制理论态
@@ -276,6 +295,44 @@ class BlochSphere:
             pygame.draw.circle(surface, COLORS['experiment'], exp_pos, 10)
             pygame.draw.circle(surface, (200, 100, 100), exp_pos, 10, 2)
 
+    def draw_trail(self, surface, trail, color, radius=TRAIL_RADIUS):
+        """一次矩阵乘法投影全部轨迹点，再通过 surfarray 批量写入像素
+
+        重合的屏幕坐标按线性下标去重，每个点盖一个实心圆印章；
+        圆超出表面边界的点直接丢弃（球面投影不会落到窗口边缘）。
+        """
+        if not len(trail):
+            return
+        width, height = surface.get_size()
+        pos = self.project_points(trail.points())
+        pos = pos[(pos[:, 0] >= radius) & (pos[:, 0] < width - radius) &
+                  (pos[:, 1] >= radius) & (pos[:, 1] < height - radius)]
+        cx, cy = np.divmod(np.unique(pos[:, 0] * height + pos[:, 1]), height)
+        offsets = _disk_offsets(radius)
+        target = pygame.surfarray.pixels2d(surface)
+        target[cx[:, None] + offsets[:, 0], cy[:, None] + offsets[:, 1]] = surface.map_rgb(pygame.Color(color))
+        del target  # 释放对表面的锁定
+
+    def draw_evolution(self, surface, evolution, trail):
+        """连续演化：细轨迹、当前 Bloch 向量与稳态位置"""
+        self.draw_trail(surface, trail, COLORS['evolution'], radius=1)
+        center = self.project_3d_to_2d(np.zeros(3))
+        pos = self.project_3d_to_2d(evolution.bloch)
+        pygame.draw.line(surface, COLORS['evolution'], center, pos, 2)
+        pygame.draw.circle(surface, COLORS['evolution'], pos, 8)
+        pygame.draw.circle(surface, COLORS['text'], self.project_3d_to_2d(evolution.fixed_point()), 6, 1)
+
+    def draw_register(self, surface, vectors):
+        """绘制寄存器中每个比特的约化 Bloch 向量"""
+        center = self.project_3d_to_2d(np.zeros(3))
+        for i, vec in enumerate(vectors):
+            color = REGISTER_COLORS[i % len(REGISTER_COLORS)]
+            pos = self.project_3d_to_2d(vec)
+            pygame.draw.line(surface, color, center, pos, 2)
+            pygame.draw.circle(surface, color, pos, 7)
+            label = text_cache.render(font, f"q{i}", color)
+            surface.blit(label, (pos[0] + 8, pos[1] - 8))
+
     def draw_projection(self, surface, qstate, plane, rect):
         pygame.draw.rect(surface, COLORS['panel'], rect)
         pygame.draw.rect(surface, COLORS['border'], rect, 2)
@@ -313,161 +370,231 @@ class BlochSphere:
         pygame.draw.circle(surface, COLORS['border'], (center_x, center_y), int(scale), 1)
 
 
-def plot_analysis(qstate, sliders):
-    import matplotlib.pyplot as plt
-    import numpy as np
-
-    # 提取数据
-    noise_level = sliders[0].value
-    shots = int(sliders[1].value)
-    theta = sliders[2].value
-    phi = sliders[3].value
-    fidelity = qstate.get_fidelity()
-
-    if not hasattr(qstate, "fidelity_history"):
-        qstate.fidelity_history = []
-
-    # Bloch球坐标
-    theory_coords = qstate.get_bloch_coordinates()
-    exp_coords = qstate.get_bloch_coordinates(qstate.experimental_rho) if qstate.experimental_rho is not None else (
-    0, 0, 0)
-
-    # 创建图形窗口
-    fig = plt.figure(figsize=(12, 10))
-
-    # Fidelity 曲线
-    ax1 = fig.add_subplot(2, 2, 1)
-    ax1.plot(qstate.fidelity_history, label="Fidelity", color='purple', marker='o')
-    ax1.set_title("保真度变化曲线")
-    ax1.set_xlabel("测量次数")
-    ax1.set_ylabel("Fidelity")
-    ax1.set_ylim(0, 1)
-    ax1.grid(True)
-    ax1.legend()
-
-    # Bloch球坐标对比
-    ax2 = fig.add_subplot(2, 2, 2)
-    labels = ['X', 'Y', 'Z']
-    x = np.arange(len(labels))
-    width = 0.35
-    ax2.bar(x - width / 2, theory_coords, width, label='理论值', color='#64c896')
-    ax2.bar(x + width / 2, exp_coords, width, label='实验值', color='#c86496')
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(labels)
-    ax2.set_title("Bloch球坐标对比")
-    ax2.legend()
-    ax2.grid(True)
-
-    # Z基下测量统计
-    ax3 = fig.add_subplot(2, 2, 3)
-    counts = qstate.experimental_counts.get('Z', (0, 0))
-    ax3.bar(['|0>', '|1>'], counts, color=['#409EFF', '#67C23A'])
-    ax3.set_title("Z基测量结果统计")
-    ax3.set_ylabel("次数")
-    ax3.grid(True, axis='y')
-
-    # 3D Bloch 球展示
-    ax4 = fig.add_subplot(2, 2, 4, projection='3d')
-    u = np.linspace(0, 2 * np.pi, 100)
-    v = np.linspace(0, np.pi, 100)
-    x_sphere = np.outer(np.cos(u), np.sin(v))
-    y_sphere = np.outer(np.sin(u), np.sin(v))
-    z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
-    ax4.plot_surface(x_sphere, y_sphere, z_sphere, color='lightgray', alpha=0.3, edgecolor='gray', linewidth=0.2,
-                     zorder=0)
-
-    # 绘制坐标轴
-    ax4.plot([-1.2, 1.2], [0, 0], [0, 0], color='black', linewidth=1, linestyle='--')
-    ax4.plot([0, 0], [-1.2, 1.2], [0, 0], color='black', linewidth=1, linestyle='--')
-    ax4.plot([0, 0], [0, 0], [-1.2, 1.2], color='black', linewidth=1, linestyle='--')
-    ax4.text(1.1, 0, 0, 'X', color='black')
-    ax4.text(0, 1.1, 0, 'Y', color='black')
-    ax4.text(0, 0, 1.1, 'Z', color='black')
-
-    # 绘制理论和实验向量
-    ax4.quiver(0, 0, 0, *theory_coords, color='#64c896', label='理论态', linewidth=3, arrow_length_ratio=0.1)
-    ax4.quiver(0, 0, 0, *exp_coords, color='#c86496', label='实验态', linewidth=3, arrow_length_ratio=0.1)
-
-    ax4.set_xlim([-1.2, 1.2])
-    ax4.set_ylim([-1.2, 1.2])
-    ax4.set_zlim([-1.2, 1.2])
-    ax4.set_box_aspect([1, 1, 1])
-    ax4.set_title("Bloch球三维向量")
-    ax4.view_init(elev=20, azim=45)
-    ax4.legend()
-
-    plt.tight_layout()
-    plt.show()
-
-
-def run():
+def plot_analysis(analysis, engine):
+    """打开（或刷新）独立进程中的分析窗口，不阻塞模拟器"""
+    analysis.send('show', engine.analysis_payload())
+
+
+def apply_command(engine, kind, payload):
+    """执行主程序推送的命令；'state' 的数据为 {theta, phi, noise_type, noise_param, shots} 的任意子集
+
+    常驻进程不能因为一条命令出错而退出：未知的噪声类型和无法转换的数值直接忽略。
+    """
+    if kind != 'state':
+        return
+    qs = engine.qstate
+    try:
+        engine.set_angles(float(payload.get('theta', qs.theta)), float(payload.get('phi', qs.phi)))
+    except (TypeError, ValueError):
+        pass
+    noise_type = payload.get('noise_type')
+    if noise_type not in NoiseManager.noise_types.values():
+        noise_type = None
+    try:
+        engine.set_noise(noise_type, payload.get('noise_param'))
+    except (TypeError, ValueError):
+        pass
+    try:
+        if 'shots' in payload:
+            engine.shots = int(payload['shots'])
+    except (TypeError, ValueError):
+        pass
+
+
+def serve(conn):
+    """常驻模拟器进程入口：模块导入完成后在管道上等待主程序的命令
+
+    命令为 (类型, 数据)：'show' 打开窗口，'hide' 关闭窗口但保留进程与引擎状态，
+    'state' 推送量子态与噪声参数，'quit' 结束进程。窗口被用户关闭后进程继续等待，
+    再次打开无需重新导入 pygame、scipy 等模块；分析进程同样预先启动并在各次打开之间复用。
+    """
+    engine = NoiseSimulationEngine()
+    analysis = AnalysisClient()
+    analysis.start()
+    try:
+        while True:
+            try:
+                if not conn.poll(1.0):
+                    # 主程序异常退出时不留下孤儿进程
+                    parent = multiprocessing.parent_process()
+                    if parent is not None and not parent.is_alive():
+                        break
+                    continue
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                # 主程序关闭了管道
+                break
+            if kind == 'quit':
+                break
+            if kind == 'show':
+                if not run(engine=engine, conn=conn, analysis=analysis):
+                    break
+            else:
+                apply_command(engine, kind, payload)
+    finally:
+        engine.close()
+        analysis.close()
+
+
+def run(seed=None, engine=None, conn=None, analysis=None):
+    """pygame 界面：控件同步到 NoiseSimulationEngine，界面只负责绘制与交互
+
+    由 serve 调用时传入常驻的引擎、命令管道和分析进程句柄；返回 False 表示收到了 'quit'。
+    """
     global font, title_font
     pygame.init()
-    matplotlib.use('TkAgg')
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     font = pygame.font.SysFont('simhei', 16)
     title_font = pygame.font.SysFont('simhei', 20, bold=True)
     pygame.display.set_caption("量子噪声模拟器")
 
-    global current_noise, measuring, animating, anim_theory_pts, anim_exp_pts
-    qstate = QuantumState()
+    owns_engine = engine is None
+    engine = NoiseSimulationEngine(seed) if owns_engine else engine
+    engine.evolution.set_parameters(dt=EVOLUTION_DT)
+    qstate = engine.qstate
     bloch = BlochSphere()
+    owns_analysis = analysis is None
+    analysis = AnalysisClient() if owns_analysis else analysis
+    theory_trail = TrailBuffer(TRAIL_CAPACITY)
+    exp_trail = TrailBuffer(TRAIL_CAPACITY)
     sliders = [
-        Slider(CONTROL_START, 120, "噪声强度", 0, 1, 0.2),
-        Slider(CONTROL_START, 180, "测量次数", 10, 5000, 1000),
-        Slider(CONTROL_START, 240, "极角 θ", 0, np.pi, np.pi / 4),
-        Slider(CONTROL_START, 300, "方位角 φ", 0, 2 * np.pi, 0)
+        Slider(CONTROL_START, 120, "噪声强度", 0, 1, engine.noise_param),
+        Slider(CONTROL_START, 180, "测量次数", 10, 5000, engine.shots),
+        Slider(CONTROL_START, 240, "极角 θ", 0, np.pi, qstate.theta),
+        Slider(CONTROL_START, 300, "方位角 φ", 0, 2 * np.pi, qstate.phi)
     ]
+    evolution_trail = TrailBuffer(TRAIL_CAPACITY)
+    evolution_sliders = [
+        Slider(EVOLUTION_X, 330, "T1 (μs)", 1, 50, 10),
+        Slider(EVOLUTION_X, 390, "T2 (μs)", 1, 100, 8),
+        Slider(EVOLUTION_X, 450, "驱动 Ω", 0, 5, 0),
+        Slider(EVOLUTION_X, 510, "失谐 Δ", -5, 5, 2)
+    ]
+    # 界面模式，只影响绘制与刷新节奏
+    measuring = animating = evolving = False
+
+    def sync_angle_sliders():
+        sliders[2].value, sliders[3].value = qstate.theta, qstate.phi
 
-    def create_gate_callback(gate_matrix):
+    def sync_sliders():
+        sliders[0].value, sliders[1].value = engine.noise_param, engine.shots
+        sync_angle_sliders()
+
+    def create_gate_callback(gate):
         def callback():
-            qstate.apply_gate(gate_matrix)
-            sliders[2].value, sliders[3].value = qstate.theta, qstate.phi
+            engine.apply_gate(gate)
+            sync_angle_sliders()
 
         return callback
 
+    def reset_state():
+        engine.reset()
+        sync_angle_sliders()
+
+    def request_measurement():
+        nonlocal measuring
+        measuring = True
+
     def toggle_animation():
-        nonlocal_button = anim_button
-        globals()['animating'] = not globals()['animating']
-        if globals()['animating']:
-            nonlocal_button.text = "停止动画"
-        else:
-            nonlocal_button.text = "动画演示"
-            anim_theory_pts.clear()
-            anim_exp_pts.clear()
-
-    buttons = [
-        Button(CONTROL_START, 360, 260, 40, "哈达玛门 (H)",
-               create_gate_callback(np.array([[1, 1], [1, -1]], np.complex128) / np.sqrt(2))),
-        Button(CONTROL_START, 410, 260, 40, "泡利 X 门",
-               create_gate_callback(np.array([[0, 1], [1, 0]], np.complex128))),
-        Button(CONTROL_START, 460, 260, 40, "泡利 Y 门",
-               create_gate_callback(np.array([[0, -1j], [1j, 0]], np.complex128))),
-        Button(CONTROL_START, 510, 260, 40, "泡利 Z 门",
-               create_gate_callback(np.array([[1, 0], [0, -1]], np.complex128))),
-        Button(CONTROL_START, 560, 260, 40, "重置量子态",
-               lambda: [qstate.reset(), setattr(sliders[2], 'value', qstate.theta),
-                        setattr(sliders[3], 'value', qstate.phi)]),
-        Button(CONTROL_START, 610, 260, 40, "切换噪声类型",
-               lambda: globals().update(current_noise=(current_noise + 1) % 3)),
-        Button(CONTROL_START, 660, 260, 40, "开始测量", lambda: globals().update(measuring=True)),
-        Button(CONTROL_START, 710, 260, 40, "生成图表", lambda: plot_analysis(qstate, sliders))
+        nonlocal animating
+        animating = not animating
+        anim_button.text = "停止动画" if animating else "动画演示"
+        if not animating:
+            theory_trail.clear()
+            exp_trail.clear()
+
+    def toggle_evolution():
+        nonlocal evolving
+        evolving = not evolving
+        evolution_button.text = "停止演化" if evolving else "连续演化"
+        evolution_trail.clear()
+        # 从当前理论态出发
+        engine.start_evolution()
+
+    def toggle_long_trails():
+        long_trails = theory_trail.capacity == TRAIL_CAPACITY
+        for trail in (theory_trail, exp_trail, evolution_trail):
+            trail.set_capacity(LONG_TRAIL_CAPACITY if long_trails else TRAIL_CAPACITY)
+        trail_button.text = "长轨迹: 开" if long_trails else "长轨迹: 关"
+
+    def toggle_register():
+        engine.cycle_register()
+        register_button.text = f"寄存器: {REGISTER_MODES[engine.register_mode][0]}"
+
+    def toggle_backend():
+        engine.cycle_backend()
+        register_button.text = f"寄存器: {REGISTER_MODES[engine.register_mode][0]}"
+        backend_button.text = f"后端: {REGISTER_BACKENDS[engine.register_backend][0]}"
+
+    # 按钮按两列排布
+    button_specs = [
+        ("哈达玛门 (H)", create_gate_callback('H')),
+        ("泡利 X 门", create_gate_callback('X')),
+        ("泡利 Y 门", create_gate_callback('Y')),
+        ("泡利 Z 门", create_gate_callback('Z')),
+        ("重置量子态", reset_state),
+        ("切换噪声类型", engine.cycle_noise),
+        ("开始测量", request_measurement),
+        ("生成图表", lambda: plot_analysis(analysis, engine)),
+        ("动画演示", toggle_animation),
+        (f"寄存器: {REGISTER_MODES[engine.register_mode][0]}", toggle_register),
+        (f"后端: {REGISTER_BACKENDS[engine.register_backend][0]}", toggle_backend),
+        ("噪声扫描", lambda: analysis.send('sweep', qstate.state)),
+        ("连续演化", toggle_evolution),
+        ("随机基准", lambda: analysis.send('rb', (engine.noise_name, engine.noise_type, engine.noise_param))),
+        ("长轨迹: 关", toggle_long_trails)
     ]
-
-    anim_button = Button(CONTROL_START, 760, 260, 40, "动画演示", toggle_animation)
-    buttons.append(anim_button)
+    buttons = []
+    for i, (text, callback) in enumerate(button_specs):
+        x = CONTROL_START + (i % 2) * (BUTTON_WIDTH + BUTTON_GAP)
+        y = 360 + (i // 2) * 45
+        buttons.append(Button(x, y, BUTTON_WIDTH, 38, text, callback))
+    anim_button = buttons[8]
+    register_button = buttons[9]
+    backend_button = buttons[10]
+    evolution_button = buttons[12]
+    trail_button = buttons[14]
 
     running = True
+    keep_serving = True
+    idle_wait = IDLE_WAIT_MS if conn is None else IPC_POLL_MS
     clock = pygame.time.Clock()
+    # 只有状态变化时才重绘；控制面板单独缓存，滑条/按钮外观不变时直接贴图
+    dirty = True
+    panel_surface = pygame.Surface((PANEL_WIDTH, HEIGHT))
+    panel_key = None
 
-    MAX_PTS = 200
     while running:
-        screen.fill(COLORS['background'])
-        pygame.draw.rect(screen, COLORS['panel'], (0, 0, PANEL_WIDTH, HEIGHT))
+        events = pygame.event.get()
+        # 寄存器在后台重算时继续逐帧刷新，算完后立即显示
+        computing = engine.register_pending
+        if not events and not (dirty or animating or measuring or evolving or computing):
+            # 空闲时阻塞等待事件，不再空转
+            event = pygame.event.wait(idle_wait)
+            events = [event] + pygame.event.get() if event.type != NOEVENT else []
+
+        # 主程序推送的命令
+        while conn is not None and running:
+            try:
+                if not conn.poll():
+                    break
+                kind, payload = conn.recv()
+            except (EOFError, OSError):
+                # 管道已断开，按 'quit' 处理
+                kind, payload = 'quit', None
+            if kind in ('hide', 'quit'):
+                running = False
+                keep_serving = kind != 'quit'
+            elif kind != 'show':
+                apply_command(engine, kind, payload)
+                sync_sliders()
+                dirty = True
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == QUIT:
                 running = False
+            if event.type != MOUSEMOTION:
+                dirty = True
             # Bloch 球拖动...
             if event.type == MOUSEBUTTONDOWN:
                 if SPHERE_CENTER[0] - 250 < event.pos[0] < SPHERE_CENTER[0] + 250 and \
@@ -479,84 +606,67 @@ def run():
                 bloch.cam_angle_y += dx * 0.005
                 bloch.cam_angle_x -= dy * 0.005
                 last_pos = event.pos
+                dirty = True
             elif event.type == MOUSEBUTTONUP:
                 bloch.dragging = False
 
             # Slider & Button 事件
-            for s in sliders:
+            for s in sliders + (evolution_sliders if evolving else []):
                 if event.type == MOUSEBUTTONDOWN:
                     s.grabbed = s.update(event.pos)
                 elif event.type == MOUSEMOTION and s.grabbed:
                     s.update(event.pos)
+                    dirty = True
                 elif event.type == MOUSEBUTTONUP:
                     s.grabbed = False
             for b in buttons:
-                b.handle_event(event)
+                if b.handle_event(event):
+                    dirty = True
+
+        if not running:
+            break
+        if not (dirty or animating or measuring or evolving or computing):
+            continue
 
-        # 更新量子态
-        qstate.theta, qstate.phi = sliders[2].value, sliders[3].value
-        qstate.state = qstate.get_state_vector()
-        qstate.theory_rho = np.outer(qstate.state, qstate.state.conj())
+        # 控件同步到引擎
+        engine.set_angles(sliders[2].value, sliders[3].value)
+        engine.set_noise(noise_param=sliders[0].value)
+        engine.shots = int(sliders[1].value)
 
-        # 单次测量逻辑
+        # 单次测量：X, Y, Z 三个方向批量测量并做最大似然层析
         if measuring:
-            noise_param = sliders[0].value
-            noise_type = list(NoiseManager.noise_types.values())[current_noise]
-            shots = int(sliders[1].value)
-
-            # 分别在 X, Y, Z 方向执行完整测量
-            x_c = qstate.measure_in_basis('X', noise_param, noise_type, shots)
-            y_c = qstate.measure_in_basis('Y', noise_param, noise_type, shots)
-            z_c = qstate.measure_in_basis('Z', noise_param, noise_type, shots)
-
-            # 计算期望值
-            x_e = (x_c[0] - x_c[1]) / shots
-            y_e = (y_c[0] - y_c[1]) / shots
-            z_e = (z_c[0] - z_c[1]) / shots
-
-            # 避免 Bloch 向量超出单位球
-            vec = np.array([x_e, y_e, z_e])
-            norm = np.linalg.norm(vec)
-            if norm > 1.0:
-                vec = vec / norm
-            x_e, y_e, z_e = vec
-
-            # 构造密度矩阵
-            I = np.eye(2)
-            X = np.array([[0, 1], [1, 0]], dtype=complex)
-            Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
-            Z = np.array([[1, 0], [0, -1]], dtype=complex)
-            qstate.experimental_rho = 0.5 * (I + x_e * X + y_e * Y + z_e * Z)
-
-            # 存储统计信息
-            qstate.experimental_counts = {'X': x_c, 'Y': y_c, 'Z': z_c}
-            qstate.fidelity_history = getattr(qstate, 'fidelity_history', []) + [qstate.get_fidelity()]
+            engine.measure()
             measuring = False
+            analysis.send('state', engine.analysis_payload())
 
         if animating:
-            shots = int(sliders[1].value);
-            per = max(1, shots // 3)
-            # 理论3D向量
-            tc = [qstate.measure_in_basis(b, 0.0, None, per) for b in ['X', 'Y', 'Z']]
-            vec_t = np.array([(tc[0][0] - tc[0][1]) / per, (tc[1][0] - tc[1][1]) / per, (tc[2][0] - tc[2][1]) / per])
-            if np.linalg.norm(vec_t): vec_t /= np.linalg.norm(vec_t)
-            anim_theory_pts.append(vec_t)
-            if len(anim_theory_pts) > MAX_PTS: anim_theory_pts.pop(0)
-            # 实验3D向量
-            nc = [qstate.measure_in_basis(b, sliders[0].value, list(NoiseManager.noise_types.values())[current_noise],
-                                          per) for b in ['X', 'Y', 'Z']]
-            vec_e = np.array([(nc[0][0] - nc[0][1]) / per, (nc[1][0] - nc[1][1]) / per, (nc[2][0] - nc[2][1]) / per])
-            if np.linalg.norm(vec_e): vec_e /= np.linalg.norm(vec_e)
-            anim_exp_pts.append(vec_e)
-            if len(anim_exp_pts) > MAX_PTS: anim_exp_pts.pop(0)
-            # 绘制球面与状态
-        bloch.draw_wireframe(screen);
-        bloch.draw_states(screen, qstate)
+            theory_trail.append(engine.sample_bloch(noisy=False))
+            exp_trail.append(engine.sample_bloch())
+
+        if evolving:
+            # 传播子按参数缓存，这里每帧只做一次 4x4 矩阵-向量乘
+            t1, t2, rabi, detuning = (s.value for s in evolution_sliders)
+            engine.evolution.set_parameters(t1=t1, t2=t2, rabi=rabi, detuning=detuning)
+            evolution_trail.append(engine.step_evolution())
+
+        # 绘制球面与状态
+        screen.fill(COLORS['background'], (PANEL_WIDTH, 0, WIDTH - PANEL_WIDTH, HEIGHT))
+        bloch.draw_wireframe(screen)
+        register_name, register_qubits = REGISTER_MODES[engine.register_mode]
+        # 拖动滑条时不阻塞绘制：先画上次的结果，新结果在后台线程中计算
+        register_result = engine.register_async() if register_qubits else None
+        if register_qubits:
+            if register_result is not None:
+                bloch.draw_register(screen, register_result[0])
+        else:
+            bloch.draw_states(screen, qstate)
         # 实时投影动画点
-        for vec in anim_theory_pts:
-            pygame.draw.circle(screen, COLORS['theory'], bloch.project_3d_to_2d(vec), 4)
-        for vec in anim_exp_pts:
-            pygame.draw.circle(screen, COLORS['experiment'], bloch.project_3d_to_2d(vec), 4)
+        bloch.draw_trail(screen, theory_trail, COLORS['theory'])
+        bloch.draw_trail(screen, exp_trail, COLORS['experiment'])
+        if evolving:
+            bloch.draw_evolution(screen, engine.evolution, evolution_trail)
+            for s in evolution_sliders:
+                s.draw(screen)
 
         # 绘制投影面板
         proj_size = 120
@@ -569,16 +679,18 @@ def run():
         for rect, plane in proj_rects:
             bloch.draw_projection(screen, qstate, plane, rect)
 
-        # 绘制控制面板
-        title = title_font.render("量子噪声模拟系统", True, COLORS['text'])
-        screen.blit(title, (CONTROL_START, 30))
-        for s in sliders: s.draw(screen)
-        for b in buttons: b.draw(screen)
-
-        for slider in sliders:
-            slider.draw(screen)
-        for btn in buttons:
-            btn.draw(screen)
+        # 绘制控制面板：仅在滑条数值或按钮外观变化时重新渲染
+        key = (tuple(s.value for s in sliders), tuple((b.text, b.hover) for b in buttons))
+        if key != panel_key:
+            panel_key = key
+            panel_surface.fill(COLORS['panel'])
+            title = text_cache.render(title_font, "量子噪声模拟系统", COLORS['text'])
+            panel_surface.blit(title, (CONTROL_START, 30))
+            for s in sliders:
+                s.draw(panel_surface)
+            for b in buttons:
+                b.draw(panel_surface)
+        screen.blit(panel_surface, (0, 0))
 
         # 绘制统计信息
         theory_p0 = np.abs(qstate.state[0]) ** 2
@@ -593,8 +705,13 @@ def run():
         else:
             exp_p0, exp_p1 = 0.0, 0.0
 
+        noise_name = engine.noise_name
+        if engine.noise_type == "pipeline":
+            stage_text = " → ".join(f"{STAGE_LABELS[t]} {p:.2f}"
+                                    for t, p in NoiseManager.pipeline_stages(engine.noise_param))
+            noise_name = f"{noise_name} ({stage_text})"
         stats = [
-            f"当前噪声: {list(NoiseManager.noise_types.keys())[current_noise % 3]}",
+            f"当前噪声: {noise_name}",
             f"理论 |0>: {theory_p0:.2%}",
             f"理论 |1>: {theory_p1:.2%}",
             f"实验 |0>: {exp_p0:.2%}",
@@ -603,16 +720,38 @@ def run():
             f"θ = {qstate.theta:.2f} rad",
             f"φ = {qstate.phi:.2f} rad"
         ]
+        if evolving:
+            evolved = engine.evolution.bloch
+            purity = 0.5 * (1 + np.dot(evolved, evolved))
+            stats.append(f"连续演化 t = {engine.evolution.time:.2f} μs  纯度 {purity:.3f}")
+        if register_qubits:
+            register_text = f"寄存器 {register_name} [{REGISTER_BACKENDS[engine.register_backend][0]}]: "
+            if register_result is None:
+                register_text += "计算中…"
+            else:
+                _, purity, purity_stderr, register_fid = register_result
+                purity_text = f"{purity:.3f} ± {purity_stderr:.3f}" if purity_stderr else f"{purity:.3f}"
+                register_text += f"纯度 {purity_text}  保真度 {register_fid:.3f}"
+                if engine.register_pending:
+                    register_text += "  (更新中)"
+            stats.append(register_text)
         stats_x = PANEL_WIDTH + 30
-        stats_y = HEIGHT - 200
+        stats_y = HEIGHT - 25 * len(stats)
         for i, text in enumerate(stats):
-            text_surf = font.render(text, True, COLORS['text'])
-            screen.blit(text_surf, (stats_x, stats_y + i * 25))
+            screen.blit(text_cache.render(font, text, COLORS['text']), (stats_x, stats_y + i * 25))
 
         pygame.display.flip()
+        dirty = False
         clock.tick(30)
 
+    if owns_analysis:
+        analysis.close()
+    if owns_engine:
+        engine.close()
+    text_cache.clear()
     pygame.quit()
+    return keep_serving
 
 if __name__ == "__main__":
+    import_profiler.report()
     run()
\ No newline at end of file
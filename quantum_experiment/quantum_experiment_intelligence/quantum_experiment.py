@@ -1,8 +1,14 @@
+if __name__ == '__main__':
+    # 作为入口脚本运行时，必须在其余导入之前开启统计（需 --import-profile）；被其他模块导入时不做任何事
+    import import_profiler
+
+    import_profiler.install_if_requested()
+
+import importlib.util
 import multiprocessing
 import sys
 import tkinter as tk
 from tkinter import ttk
-from noise_impact import run
 from quantum_experiment_intelligence.quantum_correction.color_Interactable_visualization import HexagonalColorInteractableCodeUI
 from quantum_experiment_intelligence.quantum_correction.shor_Interactable_visualization import ShorInteractableCodeUI
 from quantum_experiment_intelligence.quantum_correction.surface_Interactable_visualization import SurfaceCodeInteractableUI
@@ -11,18 +17,20 @@ from quantum_experiment_intelligence.intandtun_Interactable_visualization import
 COLOR_ACCENT = "#0078d4"
 COLOR_TEXT = "#333333"
 
-try:
-    from OpenGL import GL, GLU, GLUT
-    from OpenGL.GL import *
-    from OpenGL.GLU import *
-    from OpenGL.GLUT import *
-
-    OPENGL_AVAILABLE = True
-except ImportError:
-    OPENGL_AVAILABLE = False
+# OpenGL 由隧穿实验的3D可视化在第一次打开时导入，这里只检查是否已安装
+OPENGL_AVAILABLE = importlib.util.find_spec("OpenGL") is not None
+if not OPENGL_AVAILABLE:
     print("警告: OpenGL模块未安装，3D量子隧穿可视化将不可用")
     print("提示: 可以使用 pip install PyOpenGL PyOpenGL_accelerate 安装")
 
+
+def run_simulator(conn):
+    """模拟器进程入口：pygame、scipy 等只在子进程中导入，主界面启动不必等待"""
+    from noise_impact import serve
+
+    serve(conn)
+
+
 # class ModifiedHexagonalUI(HexagonalColorCodeUI):
 class ModifiedHexagonalUI(HexagonalColorInteractableCodeUI):
     def __init__(self, root):
@@ -174,96 +182,155 @@ class ModifiedSurfaceUI(SurfaceCodeInteractableUI):
         self.selector.current(0)
 
 
+# 面板在后台预构建时，两次构建之间留给事件循环的间隔
+PREBUILD_DELAY_MS = 200
+
+
 class MainApplication:
-    def __init__(self, root):
+    # 纠错码名称 -> 面板类；面板在第一次被选中（或后台预构建）时才创建
+    PANEL_FACTORIES = {
+        "六边形颜色码": ModifiedHexagonalUI,
+        "Shor码": ModifiedQuantumUI,
+        "表面码": ModifiedSurfaceUI
+    }
+
+    def __init__(self, root, show_initial=True, prebuild=False):
         self.root = root
         # self.root.title("量子纠错模拟器")
         # self.root.geometry("1400x800")
 
         self.pygame_process = None
+        self.simulator_conn = None
 
-        self.hex_ui = ModifiedHexagonalUI(root)
-        self.shor_ui = ModifiedQuantumUI(root)
-        self.surface_ui = ModifiedSurfaceUI(root)
-
-        self.uis = {
-            "六边形颜色码": self.hex_ui.main_frame,
-            "Shor码": self.shor_ui.main_frame,
-            "表面码": self.surface_ui.main_frame
-        }
-
-        for ui in [self.hex_ui, self.shor_ui, self.surface_ui]:
-            ui.selector.bind("<<ComboboxSelected>>", self.on_selector_changed)
-
+        self.panels = {}
+        # 面板创建后的回调，UnifiedQuantumInterface 用它绑定实验类型下拉框
+        self.panel_created_callbacks = []
         self.current_ui = "六边形颜色码"
-        self.uis[self.current_ui].pack(fill=tk.BOTH, expand=True)
+        if show_initial:
+            self.show_current()
 
-        for ui in [self.hex_ui, self.shor_ui, self.surface_ui]:
-            btn = ttk.Button(ui.left_frame, text="噪声模拟器", command=self.start_pygame_once)
-            btn.place(relx=0.0, rely=1.0, anchor='sw', x=20, y=-20)
+        # 首帧绘制之后再启动常驻模拟器进程，点击按钮时只需显示窗口
+        self.root.after_idle(self.spawn_simulator)
+        if prebuild:
+            self.root.after(PREBUILD_DELAY_MS, self.prebuild_next)
 
         # self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def get_panel(self, name):
+        """返回纠错码面板，不存在时才创建"""
+        panel = self.panels.get(name)
+        if panel is None:
+            panel = self.PANEL_FACTORIES[name](self.root)
+            panel.selector.set(self.current_ui)
+            panel.selector.bind("<<ComboboxSelected>>", self.on_selector_changed)
+            btn = ttk.Button(panel.left_frame, text="噪声模拟器", command=self.start_pygame_once)
+            btn.place(relx=0.0, rely=1.0, anchor='sw', x=20, y=-20)
+            self.panels[name] = panel
+            for callback in self.panel_created_callbacks:
+                callback(panel)
+        return panel
+
+    @property
+    def hex_ui(self):
+        return self.get_panel("六边形颜色码")
+
+    @property
+    def shor_ui(self):
+        return self.get_panel("Shor码")
+
+    @property
+    def surface_ui(self):
+        return self.get_panel("表面码")
+
+    def prebuild_next(self):
+        """空闲时每次只构建一个尚未创建的面板，避免长时间阻塞界面"""
+        for name in self.PANEL_FACTORIES:
+            if name not in self.panels:
+                self.get_panel(name)
+                self.root.after(PREBUILD_DELAY_MS, self.prebuild_next)
+                return
+
+    def show_current(self):
+        self.get_panel(self.current_ui).main_frame.pack(fill=tk.BOTH, expand=True)
+
+    def hide_all(self):
+        for panel in self.panels.values():
+            panel.main_frame.pack_forget()
+
     def on_selector_changed(self, event):
         selected_ui = event.widget.get()
         if selected_ui == self.current_ui:
             return
 
-        for frame in self.uis.values():
-            frame.pack_forget()
-
-        self.uis[selected_ui].pack(fill=tk.BOTH, expand=True)
+        self.hide_all()
         self.current_ui = selected_ui
+        self.show_current()
 
-        for ui in [self.hex_ui, self.shor_ui, self.surface_ui]:
+        for ui in self.panels.values():
             ui.selector.set(selected_ui)
 
-    def start_pygame_once(self):
+    def spawn_simulator(self):
+        """启动常驻的噪声模拟器进程，它在后台完成导入后等待 'show' 命令"""
         if self.pygame_process and self.pygame_process.is_alive():
             return
-
-        self.pygame_process = multiprocessing.Process(target=run)
+        self.simulator_conn, child_conn = multiprocessing.Pipe()
+        self.pygame_process = multiprocessing.Process(target=run_simulator, args=(child_conn,))
         self.pygame_process.start()
 
-    def on_close(self):
+    def push_simulator_state(self, **state):
+        """把量子态/噪声参数推送给模拟器，键同 noise_impact.apply_command 的 'state'
+
+        纠错码面板不公开当前的错误模型与逻辑态，只能由调用方显式推送。
+        """
+        if state and self.pygame_process and self.pygame_process.is_alive():
+            self.simulator_conn.send(('state', state))
+
+    def start_pygame_once(self):
+        if not (self.pygame_process and self.pygame_process.is_alive()):
+            self.spawn_simulator()
+        self.simulator_conn.send(('show', None))
+
+    def stop_simulator(self):
         if self.pygame_process and self.pygame_process.is_alive():
-            self.pygame_process.terminate()
-            self.pygame_process.join()
+            self.simulator_conn.send(('quit', None))
+            self.pygame_process.join(timeout=1.0)
+            if self.pygame_process.is_alive():
+                self.pygame_process.terminate()
+                self.pygame_process.join()
+
+    def on_close(self):
+        self.stop_simulator()
         self.root.destroy()
 
 class UnifiedQuantumInterface:
-    def __init__(self, root):
+    def __init__(self, root, prebuild=False):
         self.root = root
         # self.root.title("量子实验")
         # self.root.geometry("1400x800")
 
-        # 初始化两个界面
+        # 默认显示的隧穿/干涉界面立即创建；纠错码面板在第一次切换到“量子纠错”时才创建
         self.quantum_ui = ClickableQuantumExperimentGUI(root)
-        self.qec_ui = MainApplication(root)
-
-        self.qec_ui.hex_ui.main_frame.pack_forget()
-        self.qec_ui.shor_ui.main_frame.pack_forget()
-        self.qec_ui.surface_ui.main_frame.pack_forget()
+        self.qec_ui = MainApplication(root, show_initial=False, prebuild=prebuild)
+        self.qec_ui.panel_created_callbacks.append(self.bind_qec_panel)
 
         self.quantum_ui.experiment_type_combobox.bind("<<ComboboxSelected>>", self.switch_interface)
-        self.qec_ui.hex_ui.experiment_type_combobox.bind("<<ComboboxSelected>>", self.switch_interface)
-        self.qec_ui.surface_ui.experiment_type_combobox.bind("<<ComboboxSelected>>", self.switch_interface)
-        self.qec_ui.shor_ui.experiment_type_combobox.bind("<<ComboboxSelected>>", self.switch_interface)
 
         self.current_ui = "量子隧穿"
         self.quantum_ui.main_frame.pack(fill=tk.BOTH, expand=True)
 
         # self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def bind_qec_panel(self, panel):
+        panel.experiment_type_combobox.bind("<<ComboboxSelected>>", self.switch_interface)
+        panel.experiment_type_combobox.set("量子纠错")
+
     def switch_interface(self, event=None):
         selected_type = event.widget.get()
         if selected_type == self.current_ui:
             return
 
         self.quantum_ui.main_frame.pack_forget()
-        self.qec_ui.hex_ui.main_frame.pack_forget()
-        self.qec_ui.surface_ui.main_frame.pack_forget()
-        self.qec_ui.shor_ui.main_frame.pack_forget()
+        self.qec_ui.hide_all()
 
         if selected_type == "量子隧穿":
             self.current_ui = "量子隧穿"
@@ -277,29 +344,26 @@ class UnifiedQuantumInterface:
             self.quantum_ui.update_controls()
         else:
             self.current_ui = "量子纠错"
-            self.qec_ui.hex_ui.experiment_type_combobox.set(self.current_ui)
-            self.qec_ui.surface_ui.experiment_type_combobox.set(self.current_ui)
-            self.qec_ui.shor_ui.experiment_type_combobox.set(self.current_ui)
-            self.qec_ui.hex_ui.main_frame.pack(fill=tk.BOTH, expand=True)
+            self.qec_ui.show_current()
+            for panel in self.qec_ui.panels.values():
+                panel.experiment_type_combobox.set(self.current_ui)
 
     def on_close(self):
-        if self.qec_ui.pygame_process and self.qec_ui.pygame_process.is_alive():
-            self.qec_ui.pygame_process.terminate()
-            self.qec_ui.pygame_process.join()
+        self.quantum_ui.tasks.shutdown()
+        self.qec_ui.stop_simulator()
         self.root.destroy()
         sys.exit(0)
 
 
 if __name__ == '__main__':
     multiprocessing.freeze_support()
-    if OPENGL_AVAILABLE:
-        try:
-            glutInit(sys.argv)
-        except Exception as e:
-            print(f"GLUT初始化失败: {str(e)}")
-            OPENGL_AVAILABLE = False
-
+    # GLUT 由3D可视化的渲染线程在第一次使用时初始化，启动时不再加载 OpenGL
     root = tk.Tk()
-    app = UnifiedQuantumInterface(root)
+    app = UnifiedQuantumInterface(root, prebuild='--prebuild-panels' in sys.argv)
+    # 界面完成首次绘制后打印导入耗时报告（需 --import-profile）
+    root.after_idle(import_profiler.report)
     root.mainloop()
+    # 常驻模拟器进程不是守护进程，主窗口关闭后通知它退出
+    app.quantum_ui.tasks.shutdown()
+    app.qec_ui.stop_simulator()
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 源码以模块名直接互相导入（from noise_engine import ...），测试同样从源码目录导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,104 @@
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from density_matrix import DensityMatrix, GATES
+from noise_engine import NoiseManager, simulate_register
+
+
+def _random_unitary(dim, rng):
+    q, r = np.linalg.qr(rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim)))
+    return q * (np.diag(r) / np.abs(np.diag(r)))
+
+
+def _random_density(n_qubits, rng):
+    a = rng.normal(size=(2 ** n_qubits,) * 2) + 1j * rng.normal(size=(2 ** n_qubits,) * 2)
+    rho = a @ a.conj().T
+    return rho / np.trace(rho)
+
+
+def _embed(op, targets, n_qubits):
+    """按定义逐个基矢构造完整的 2^n 维算符，比特 0 为最高位"""
+    dim = 2 ** n_qubits
+    k = len(targets)
+    full = np.zeros((dim, dim), dtype=np.complex128)
+    for col in range(dim):
+        bits = [(col >> (n_qubits - 1 - q)) & 1 for q in range(n_qubits)]
+        j = sum(bits[t] << (k - 1 - m) for m, t in enumerate(targets))
+        for i in range(2 ** k):
+            out = list(bits)
+            for m, t in enumerate(targets):
+                out[t] = (i >> (k - 1 - m)) & 1
+            full[sum(b << (n_qubits - 1 - q) for q, b in enumerate(out)), col] += op[i, j]
+    return full
+
+
+def _density(rho, n_qubits):
+    return DensityMatrix(n_qubits, rho.reshape((2,) * (2 * n_qubits)).copy())
+
+
+@pytest.mark.parametrize("n_qubits, targets", [(3, [0, 2]), (3, [2, 0]), (4, [3, 1]), (4, [1, 2])])
+def test_two_qubit_gate_matches_kronecker_reference(n_qubits, targets):
+    rng = np.random.default_rng(1)
+    rho = _random_density(n_qubits, rng)
+    for U in (GATES['CNOT'], _random_unitary(4, rng)):
+        full = _embed(U, targets, n_qubits)
+        result = _density(rho, n_qubits).apply_unitary(U, targets).matrix()
+        np.testing.assert_allclose(result, full @ rho @ full.conj().T, atol=1e-12)
+
+
+def test_embed_agrees_with_kron_on_adjacent_qubits():
+    U = _random_unitary(4, np.random.default_rng(2))
+    np.testing.assert_allclose(_embed(U, [1, 2], 4), reduce(np.kron, [np.eye(2), U, np.eye(2)]))
+
+
+def test_two_qubit_kraus_matches_kronecker_reference():
+    rng = np.random.default_rng(3)
+    rho = _random_density(3, rng)
+    single = NoiseManager.kraus_operators("amplitude_damping", 0.3)
+    ops = [np.kron(a, b) for a in single for b in single]
+    expected = sum(_embed(K, [2, 0], 3) @ rho @ _embed(K, [2, 0], 3).conj().T for K in ops)
+    np.testing.assert_allclose(_density(rho, 3).apply_kraus(ops, [2, 0]).matrix(), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("noise_type", ["depolarizing", "amplitude_damping", "phase_damping", "pipeline"])
+def test_single_qubit_channel_on_every_qubit_matches_kronecker_reference(noise_type):
+    rng = np.random.default_rng(4)
+    rho = _random_density(3, rng)
+    ops = NoiseManager.kraus_operators(noise_type, 0.25)
+    expected = rho
+    for q in range(3):
+        expected = sum(_embed(K, [q], 3) @ expected @ _embed(K, [q], 3).conj().T for K in ops)
+    result = _density(rho, 3).apply_superoperator_all(NoiseManager.superoperator(noise_type, 0.25))
+    np.testing.assert_allclose(result.matrix(), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("n_qubits", [2, 3, 5])
+@pytest.mark.parametrize("noise_type", ["depolarizing", "amplitude_damping", "phase_damping", "pipeline"])
+def test_ghz_reduced_bloch_vectors_under_noise(n_qubits, noise_type):
+    control = np.array([np.cos(0.4), np.exp(0.7j) * np.sin(0.4)])
+
+    class State:
+        state = control
+
+    vectors, purity, stderr, fidelity = simulate_register(State, n_qubits, 0.3, noise_type)
+    # 无噪声时每个比特的约化态为 diag(|α|², |β|²)；其余比特上的局域通道不改变它
+    ideal = np.array([0.0, 0.0, np.cos(0.8)])
+    expected = NoiseManager.apply_noise_bloch(ideal, 0.3, noise_type)
+    np.testing.assert_allclose(vectors, np.tile(expected, (n_qubits, 1)), atol=1e-12)
+    assert stderr == 0.0
+    assert 0 < purity < 1 and 0 < fidelity < 1
+
+
+def test_bell_state_under_depolarizing_matches_kronecker_reference():
+    p = 0.2
+    ops = NoiseManager.kraus_operators("depolarizing", p)
+    bell = DensityMatrix.bell(0)
+    rho = bell.matrix().copy()
+    expected = sum(np.kron(a, b) @ rho @ np.kron(a, b).conj().T for a in ops for b in ops)
+    noisy = bell.copy().apply_kraus_all(ops)
+    np.testing.assert_allclose(noisy.matrix(), expected, atol=1e-12)
+    np.testing.assert_allclose(noisy.bloch_vectors(), np.zeros((2, 3)), atol=1e-12)
+    assert noisy.purity() == pytest.approx(np.real(np.trace(expected @ expected)))
+    assert noisy.overlap(bell) == pytest.approx(np.real(np.trace(expected @ rho)))
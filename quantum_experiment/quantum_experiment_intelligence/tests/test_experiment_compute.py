@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import experiment_compute
+
+
+@pytest.mark.parametrize("analysis_type", ["势垒高度", "势垒宽度", "粒子能量"])
+def test_transmission_sweep_matches_scalar_formula(analysis_type):
+    V0, a, E = 1.0, 1.0, 0.5
+    values = np.linspace(-0.2, 2.0, 200)
+    expected = []
+    for val in values:
+        params = {"势垒高度": (val, a, E), "势垒宽度": (V0, val, E), "粒子能量": (V0, a, val)}[analysis_type]
+        expected.append(0.0 if min(params) <= 0 else
+                        max(0.0, min(1.0, float(experiment_compute.transmission_coefficient(*params)))))
+    np.testing.assert_allclose(experiment_compute.transmission_sweep(analysis_type, values, V0, a, E), expected,
+                               atol=1e-12)
+
+
+def test_transmission_is_continuous_at_barrier_top():
+    T = experiment_compute.transmission_coefficients(1.0, 1.0, [1.0 - 1e-6, 1.0, 1.0 + 1e-6])
+    assert np.all(np.isfinite(T))
+    assert np.ptp(T) < 1e-5
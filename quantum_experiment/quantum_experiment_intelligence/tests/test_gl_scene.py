@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('OpenGL')
+
+import gl_scene
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_load_pyplot():
+    code = "import sys, gl_scene; sys.exit('matplotlib.pyplot' in sys.modules)"
+    assert subprocess.run([sys.executable, '-c', code], cwd=HERE).returncode == 0
+
+
+def test_font_loaded_once():
+    gl_scene._load_font.cache_clear()
+    small = gl_scene.rasterize_text('ab', 10)
+    large = gl_scene.rasterize_text('ab', 20)
+    gl_scene.rasterize_text('cd', 10)
+    assert gl_scene._load_font.cache_info().misses == 1
+    assert large.shape[0] > small.shape[0] and large.shape[2] == 4
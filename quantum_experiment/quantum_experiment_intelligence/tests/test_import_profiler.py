@@ -0,0 +1,34 @@
+import io
+import sys
+
+import import_profiler
+
+
+def test_importing_library_modules_installs_no_hook():
+    import noise_impact  # noqa: F401
+    import Interference_and_tunneling  # noqa: F401
+
+    assert not any(isinstance(finder, import_profiler.ImportProfiler) for finder in sys.meta_path)
+
+
+def test_profiler_records_imports(tmp_path, monkeypatch):
+    (tmp_path / 'profiled_pkg').mkdir()
+    (tmp_path / 'profiled_pkg' / '__init__.py').write_text('from . import child\n')
+    (tmp_path / 'profiled_pkg' / 'child.py').write_text('VALUE = 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profiler = import_profiler.install()
+    try:
+        import profiled_pkg
+        assert profiled_pkg.child.VALUE == 1
+        # 导入完成后模块看到的是真实加载器
+        assert type(profiled_pkg.__loader__).__name__ == 'SourceFileLoader'
+        own, cumulative = profiler.records['profiled_pkg']
+        assert cumulative >= own >= 0
+        assert cumulative >= profiler.records['profiled_pkg.child'][1]
+        out = io.StringIO()
+        import_profiler.report(file=out)
+        assert 'profiled_pkg' in out.getvalue()
+    finally:
+        import_profiler.uninstall()
+        for name in ('profiled_pkg', 'profiled_pkg.child'):
+            sys.modules.pop(name, None)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from noise_engine import NoiseManager
+
+
+def _ptm_from_superoperator(S):
+    V = NoiseManager._PAULI_VEC
+    return np.real(np.conj(V) @ S @ V.T) / 2
+
+
+def test_pipeline_ptm_follows_set_pipeline():
+    original = list(NoiseManager.pipeline)
+    try:
+        before = NoiseManager.pauli_transfer_matrix("pipeline", 0.2)
+        NoiseManager.set_pipeline([("depolarizing", 1.0)])
+        after = NoiseManager.pauli_transfer_matrix("pipeline", 0.2)
+        assert not np.allclose(before, after)
+        np.testing.assert_allclose(after, _ptm_from_superoperator(NoiseManager.build_superoperator("pipeline", 0.2)),
+                                   atol=1e-12)
+    finally:
+        NoiseManager.set_pipeline(original)
+    np.testing.assert_allclose(NoiseManager.pauli_transfer_matrix("pipeline", 0.2), before)
+
+
+def test_channel_ptm_matches_superoperator():
+    for noise_type in NoiseManager._CHANNELS:
+        np.testing.assert_allclose(NoiseManager.pauli_transfer_matrix(noise_type, 0.3),
+                                   _ptm_from_superoperator(NoiseManager.build_superoperator(noise_type, 0.3)),
+                                   atol=1e-12)
+
+
+def test_register_async_matches_register():
+    from noise_engine import NoiseSimulationEngine
+
+    engine = NoiseSimulationEngine(seed=0)
+    engine.register_mode = 3  # GHZ(5)
+    try:
+        assert engine.register_async() is None and engine.register_pending
+        engine._register_job[1].result()
+        vectors, purity, stderr, fidelity = engine.register_async()
+        assert not engine.register_pending
+        reference = NoiseSimulationEngine(seed=0)
+        reference.register_mode = 3
+        np.testing.assert_allclose(vectors, reference.register()[0], atol=1e-12)
+        # 输入变化后先返回旧结果，算完再替换
+        engine.set_angles(1.0, 0.5)
+        assert engine.register_async()[1] == purity and engine.register_pending
+        engine._register_job[1].result()
+        assert engine.register_async()[3] != fidelity
+    finally:
+        engine.close()
@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import noise_impact
+from noise_engine import NoiseSimulationEngine, REGISTER_BACKENDS, REGISTER_MODES
+
+# 极角滑条的横条位置，见 run() 中的 sliders
+THETA_SLIDER = (noise_impact.CONTROL_START, 240)
+
+
+class _NullAnalysis:
+    def send(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+def _register_engine(qubits, backend):
+    engine = NoiseSimulationEngine(seed=0)
+    engine.register_backend = [b[1] for b in REGISTER_BACKENDS].index(backend)
+    engine.register_mode = [m[1] for m in REGISTER_MODES].index(qubits)
+    return engine
+
+
+def test_slider_drag_does_not_block_frames(monkeypatch):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    engine = _register_engine(12, "trajectory")
+    x, y = THETA_SLIDER
+    drag = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x + 40, y + 20), button=1)]
+    drag += [pygame.event.Event(pygame.MOUSEMOTION, pos=(x + 40 + 8 * i, y + 20), rel=(8, 0), buttons=(1, 0, 0))
+             for i in range(1, 16)]
+    drag.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(x + 160, y + 20), button=1))
+    frames = []
+    real_get = pygame.event.get
+
+    def scripted_get(*args, **kwargs):
+        real_get(*args, **kwargs)
+        if drag:
+            return [drag.pop(0)]
+        # 松开滑条后等最后一次计算完成再退出
+        if engine.register_pending and time.perf_counter() - frames[0] < 30:
+            return []
+        return [pygame.event.Event(pygame.QUIT)]
+
+    monkeypatch.setattr(pygame.event, 'get', scripted_get)
+    monkeypatch.setattr(pygame.display, 'flip', lambda: frames.append(time.perf_counter()))
+    try:
+        noise_impact.run(engine=engine, analysis=_NullAnalysis())
+        gaps = [b - a for a, b in zip(frames, frames[1:])]
+        # 12 比特轨迹后端单次计算约 0.7 s；同步计算时拖动中的每一帧都要等这么久
+        assert len(gaps) >= 16
+        assert max(gaps) < 0.3
+        # 最终结果对应松开时的滑条位置
+        assert engine._register_key == engine._register_key_now()
+    finally:
+        engine.close()
+
+
+def test_trail_keeps_200_points_by_default():
+    trail = noise_impact.TrailBuffer(noise_impact.TRAIL_CAPACITY)
+    for i in range(300):
+        trail.append((i, 0, 0))
+    assert trail.capacity == 200
+    np.testing.assert_array_equal(trail.points()[:, 0], np.arange(100, 300))
+
+
+def test_trail_capacity_change_keeps_recent_points():
+    trail = noise_impact.TrailBuffer(noise_impact.TRAIL_CAPACITY)
+    for i in range(250):
+        trail.append((i, 0, 0))
+    trail.set_capacity(noise_impact.LONG_TRAIL_CAPACITY)
+    for i in range(250, 10300):
+        trail.append((i, 0, 0))
+    np.testing.assert_array_equal(trail.points()[:, 0], np.arange(300, 10300))
+    trail.set_capacity(noise_impact.TRAIL_CAPACITY)
+    np.testing.assert_array_equal(trail.points()[:, 0], np.arange(10100, 10300))
+    trail.append((10300, 0, 0))
+    np.testing.assert_array_equal(trail.points()[:, 0], np.arange(10101, 10301))
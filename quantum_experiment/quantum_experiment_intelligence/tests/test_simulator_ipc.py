@@ -0,0 +1,130 @@
+import multiprocessing
+import sys
+import types
+
+import pytest
+
+
+# quantum_experiment 依赖的纠错码面板模块不在本目录中，用空的基类代替
+_PANEL_MODULES = {
+    'quantum_experiment_intelligence.quantum_correction.color_Interactable_visualization':
+        'HexagonalColorInteractableCodeUI',
+    'quantum_experiment_intelligence.quantum_correction.shor_Interactable_visualization': 'ShorInteractableCodeUI',
+    'quantum_experiment_intelligence.quantum_correction.surface_Interactable_visualization':
+        'SurfaceCodeInteractableUI',
+    'quantum_experiment_intelligence.intandtun_Interactable_visualization': 'ClickableQuantumExperimentGUI',
+}
+
+
+@pytest.fixture(scope='module')
+def qe():
+    saved = {}
+    for module_name, class_name in _PANEL_MODULES.items():
+        parts = module_name.split('.')
+        for i in range(1, len(parts) + 1):
+            name = '.'.join(parts[:i])
+            if name not in sys.modules:
+                saved[name] = None
+                sys.modules[name] = types.ModuleType(name)
+        setattr(sys.modules[module_name], class_name, type(class_name, (), {}))
+    import quantum_experiment
+    yield quantum_experiment
+    for name in saved:
+        sys.modules.pop(name, None)
+    sys.modules.pop('quantum_experiment', None)
+
+
+class _Widget:
+    def pack(self, *args, **kwargs):
+        pass
+
+    def pack_forget(self):
+        pass
+
+
+class _Root:
+    def after_idle(self, callback):
+        pass
+
+    def after(self, ms, callback):
+        pass
+
+
+class _AliveProcess:
+    def is_alive(self):
+        return True
+
+
+def _panel(qe, name):
+    """跳过 Tk 控件创建，只保留 MainApplication 用到的属性"""
+    panel = object.__new__(qe.MainApplication.PANEL_FACTORIES[name])
+    panel.main_frame = _Widget()
+    panel.selector = _Widget()
+    return panel
+
+
+@pytest.fixture
+def app(qe):
+    app = qe.MainApplication(_Root(), show_initial=False)
+    app.panels = {name: _panel(qe, name) for name in qe.MainApplication.PANEL_FACTORIES}
+    app.pygame_process = _AliveProcess()
+    app.simulator_conn, child_conn = multiprocessing.Pipe()
+    yield app, child_conn
+    app.simulator_conn.close()
+    child_conn.close()
+
+
+def test_pushed_state_reaches_simulator(app):
+    app, child_conn = app
+    app.push_simulator_state(theta=1.2, noise_type="phase_damping", noise_param=0.1)
+    assert child_conn.poll(1.0)
+    assert child_conn.recv() == ('state', {'theta': 1.2, 'noise_type': "phase_damping", 'noise_param': 0.1})
+
+
+def test_opening_simulator_sends_only_show(app):
+    # 面板没有可同步的状态，打开模拟器时不推送预设值
+    app, child_conn = app
+    app.current_ui = "Shor码"
+    app.start_pygame_once()
+    assert child_conn.poll(1.0)
+    assert child_conn.recv() == ('show', None)
+    assert not child_conn.poll(0.1)
+
+
+def test_no_push_without_simulator(app):
+    app, child_conn = app
+    app.pygame_process = None
+    app.push_simulator_state(theta=1.0)
+    app.push_simulator_state()
+    assert not child_conn.poll(0.1)
+
+
+def test_apply_command_ignores_unknown_noise_type():
+    import noise_impact
+    from noise_engine import NoiseSimulationEngine
+
+    engine = NoiseSimulationEngine(seed=0, noise_type="phase_damping", noise_param=0.2)
+    noise_impact.apply_command(engine, 'state', {'noise_type': "no_such_channel", 'noise_param': 0.3, 'shots': 'x'})
+    assert engine.noise_type == "phase_damping"
+    assert engine.noise_param == 0.3
+    assert engine.shots == 1000
+
+
+class _NullAnalysis:
+    def start(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_serve_exits_cleanly_when_parent_closes_pipe(monkeypatch):
+    import noise_impact
+
+    analysis = _NullAnalysis()
+    monkeypatch.setattr(noise_impact, 'AnalysisClient', lambda: analysis)
+    parent_conn, child_conn = multiprocessing.Pipe()
+    parent_conn.send(('state', {'theta': 1.0}))
+    parent_conn.close()
+    noise_impact.serve(child_conn)
+    assert analysis.closed
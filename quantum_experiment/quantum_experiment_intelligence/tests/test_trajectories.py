@@ -0,0 +1,42 @@
+import numpy as np
+
+from density_matrix import DensityMatrix
+from noise_engine import NoiseManager, simulate_register
+from trajectories import TrajectorySimulator, run_ghz_trajectories
+
+PLUS = np.array([1, 1]) / np.sqrt(2)
+
+
+def test_purity_estimate_returns_standard_error():
+    ops = NoiseManager.kraus_operators("depolarizing", 0.3)
+    exact = DensityMatrix.ghz(3, PLUS)
+    exact.apply_superoperator_all(NoiseManager.superoperator("depolarizing", 0.3))
+
+    estimates, errors = [], []
+    for seed in range(20):
+        _, _, purity, stderr, _ = run_ghz_trajectories(3, PLUS, ops, 400, seed=seed)
+        estimates.append(purity)
+        errors.append(stderr)
+    # 报告的标准误差与不同随机流之间的实际离散程度一致
+    assert 0.5 < np.std(estimates) / np.mean(errors) < 2.0
+    assert abs(np.mean(estimates) - exact.purity()) < 4 * np.mean(errors) / np.sqrt(len(estimates))
+
+
+def test_purity_estimate_trajectory_limit():
+    sim = TrajectorySimulator(2, 300, np.random.default_rng(0)).prepare_ghz()
+    sim.apply_kraus_all(NoiseManager.kraus_operators("phase_damping", 0.5))
+    _, stderr_all = sim.purity_estimate()
+    _, stderr_few = sim.purity_estimate(50)
+    assert stderr_few > stderr_all > 0
+    assert TrajectorySimulator(2, 1).purity_estimate() == (1.0, 0.0)
+
+
+def test_simulate_register_reports_purity_error():
+    class State:
+        state = PLUS
+
+    _, purity, stderr, _ = simulate_register(State, 3, 0.2, "depolarizing", "density")
+    assert stderr == 0.0
+    _, estimate, stderr, _ = simulate_register(State, 3, 0.2, "depolarizing", "trajectory", seed=1)
+    assert 0 < stderr < 0.05
+    assert abs(estimate - purity) < 5 * stderr
@@ -0,0 +1,152 @@
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+_PAULI = {
+    'I': np.eye(2, dtype=np.complex128),
+    'X': np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    'Y': np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    'Z': np.array([[1, 0], [0, -1]], dtype=np.complex128)
+}
+
+# 测量前的基变换，与 noise_engine.BASIS_GATES 一致：测 X 先做 H，测 Y 先做 H·S†
+_BASIS_ROTATION = {
+    'X': np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2),
+    'Y': np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2) @ np.array([[1, 0], [0, -1j]],
+                                                                                   dtype=np.complex128),
+    'Z': np.eye(2, dtype=np.complex128)
+}
+
+
+def measurement_settings(n_qubits):
+    """全部局域测量设置，按 X/Y/Z 的笛卡尔积排列，单比特即 ['X', 'Y', 'Z']"""
+    return [''.join(s) for s in product('XYZ', repeat=n_qubits)]
+
+
+def _kron_all(mats):
+    out = mats[0]
+    for m in mats[1:]:
+        out = np.kron(out, m)
+    return out
+
+
+@lru_cache(maxsize=8)
+def pauli_basis(n_qubits):
+    """n 比特 Pauli 串标签与矩阵 (4^n, 2^n, 2^n)，首项为恒等"""
+    labels = [''.join(s) for s in product('IXYZ', repeat=n_qubits)]
+    mats = np.stack([_kron_all([_PAULI[c] for c in label]) for label in labels])
+    mats.setflags(write=False)
+    return labels, mats
+
+
+@lru_cache(maxsize=8)
+def measurement_projectors(n_qubits):
+    """每个测量设置、每个结果的投影算符 (3^n, 2^n, 2^n, 2^n)，结果按比特串二进制编号"""
+    basis = np.eye(2, dtype=np.complex128)
+    single = {b: np.stack([np.outer(G.conj().T @ basis[o], (G.conj().T @ basis[o]).conj()) for o in range(2)])
+              for b, G in _BASIS_ROTATION.items()}
+    projectors = np.stack([
+        np.stack([_kron_all([single[b][o] for b, o in zip(setting, outcome)])
+                  for outcome in product(range(2), repeat=n_qubits)])
+        for setting in measurement_settings(n_qubits)
+    ])
+    projectors.setflags(write=False)
+    return projectors
+
+
+@lru_cache(maxsize=8)
+def _parity_table(n_qubits):
+    """线性反演所需的 (Pauli串 -> 测量设置, 各结果的 ±1 符号)"""
+    labels, _ = pauli_basis(n_qubits)
+    settings = measurement_settings(n_qubits)
+    setting_index = np.array([settings.index(label.replace('I', 'Z')) for label in labels])
+    outcomes = np.array(list(product(range(2), repeat=n_qubits)))
+    signs = np.array([np.prod(np.where(np.array([c != 'I' for c in label]), 1 - 2 * outcomes, 1), axis=1)
+                      for label in labels], dtype=float)
+    return setting_index, signs
+
+
+def pauli_expectations(counts, n_qubits=1):
+    """由计数 (..., 3^n, 2^n) 计算全部 Pauli 期望值 (..., 4^n)，恒等项为 1"""
+    counts = np.asarray(counts, dtype=float)
+    freqs = counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)
+    setting_index, signs = _parity_table(n_qubits)
+    return np.einsum('...po,po->...p', freqs[..., setting_index, :], signs)
+
+
+def linear_inversion(counts, n_qubits=1):
+    """线性反演 ρ = Σ_P <P> P / 2^n，结果厄米且迹为 1，但可能有负本征值"""
+    _, mats = pauli_basis(n_qubits)
+    expectations = pauli_expectations(counts, n_qubits)
+    return np.einsum('...p,pij->...ij', expectations.astype(np.complex128), mats) / 2 ** n_qubits
+
+
+def _project_simplex(values):
+    """把每行本征值投影到概率单纯形（非负、和为 1）"""
+    d = values.shape[-1]
+    u = -np.sort(-values, axis=-1)
+    css = np.cumsum(u, axis=-1) - 1.0
+    ind = np.arange(1, d + 1)
+    k = np.sum(u - css / ind > 0, axis=-1, keepdims=True)
+    theta = np.take_along_axis(css, k - 1, axis=-1) / k
+    return np.maximum(values - theta, 0.0)
+
+
+def project_to_physical(rho):
+    """批量投影到最近（Frobenius 范数）的物理密度矩阵"""
+    rho = np.asarray(rho, dtype=np.complex128)
+    rho = 0.5 * (rho + np.conj(np.swapaxes(rho, -1, -2)))
+    if rho.shape[-1] == 2:
+        # 单比特：Frobenius 距离正比于 Bloch 向量的欧氏距离，最近物理态即把 Bloch 向量截断到单位球
+        x = 2 * rho[..., 0, 1].real
+        y = -2 * rho[..., 0, 1].imag
+        z = np.real(rho[..., 0, 0] - rho[..., 1, 1])
+        scale = 1.0 / np.maximum(np.sqrt(x * x + y * y + z * z), 1.0)
+        out = np.empty_like(rho)
+        out[..., 0, 0] = 0.5 * (1 + z * scale)
+        out[..., 1, 1] = 0.5 * (1 - z * scale)
+        out[..., 0, 1] = 0.5 * (x - 1j * y) * scale
+        out[..., 1, 0] = np.conj(out[..., 0, 1])
+        return out
+    w, v = np.linalg.eigh(rho)
+    w = _project_simplex(w)
+    return (v * w[..., None, :]) @ np.conj(np.swapaxes(v, -1, -2))
+
+
+def _negative_log_likelihood(freqs, probs):
+    return -np.sum(freqs * np.log(np.maximum(probs, 1e-12)), axis=(-2, -1))
+
+
+def maximum_likelihood(counts, n_qubits=1, n_iter=100, step=None, tol=1e-12):
+    """投影梯度最大似然估计，对一批数据集同时迭代
+
+    counts: (..., 3^n, 2^n)。从投影后的线性反演结果出发，沿对数似然梯度
+    Σ f/p · Π 上升并投影回物理态集合。每个数据集有自己的步长：
+    似然改善则接受并放大步长，否则拒绝并减半，保证单调收敛；全部步长小于 tol 时提前结束。
+    返回 (..., 2^n, 2^n) 的物理密度矩阵。
+    """
+    counts = np.asarray(counts, dtype=float)
+    batch_shape = counts.shape[:-2]
+    n_settings, n_outcomes = counts.shape[-2:]
+    freqs = (counts / np.maximum(counts.sum(axis=-1, keepdims=True), 1)).reshape((-1, n_settings, n_outcomes))
+    projectors = measurement_projectors(n_qubits)
+    step = np.full(len(freqs), 1.0 / n_settings if step is None else step)
+
+    rho = project_to_physical(linear_inversion(freqs, n_qubits))
+    probs = np.real(np.einsum('soij,bji->bso', projectors, rho))
+    nll = _negative_log_likelihood(freqs, probs)
+    for _ in range(n_iter):
+        grad = np.einsum('bso,soij->bij', freqs / np.maximum(probs, 1e-12), projectors)
+        candidate = project_to_physical(rho + step[:, None, None] * grad)
+        cand_probs = np.real(np.einsum('soij,bji->bso', projectors, candidate))
+        cand_nll = _negative_log_likelihood(freqs, cand_probs)
+        accept = cand_nll <= nll
+        rho[accept] = candidate[accept]
+        probs[accept] = cand_probs[accept]
+        nll[accept] = cand_nll[accept]
+        step = np.where(accept, step * 1.5, step * 0.5)
+        if np.all(step < tol):
+            break
+    dim = 2 ** n_qubits
+    return rho.reshape(batch_shape + (dim, dim))
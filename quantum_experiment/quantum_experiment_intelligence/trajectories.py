@@ -0,0 +1,183 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# 单比特 Pauli 矩阵，用于由约化密度矩阵计算 Bloch 向量
+_PAULIS = np.array([
+    [[0, 1], [1, 0]],
+    [[0, -1j], [1j, 0]],
+    [[1, 0], [0, -1]]
+], dtype=np.complex128)
+
+
+class TrajectorySimulator:
+    """量子轨迹（蒙特卡洛波函数）后端
+
+    同时演化 T 条 n 比特纯态轨迹，存为 (T, 2^n) 数组，每条轨迹只占 2^n 内存。
+    施加 Kraus 通道时，先由每条轨迹目标比特的约化密度矩阵得到各分支概率
+    p_k = tr(K†K ρ_q)，再按概率为每条轨迹抽取一个分支并归一化；
+    对轨迹取平均即得到与密度矩阵演化一致的期望值。
+    """
+
+    def __init__(self, n_qubits, n_trajectories=400, rng=None):
+        self.n_qubits = n_qubits
+        self.n_trajectories = n_trajectories
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.states = np.zeros((n_trajectories, 2 ** n_qubits), dtype=np.complex128)
+        self.states[:, 0] = 1.0
+
+    def prepare(self, psi):
+        """所有轨迹从同一个态矢量出发"""
+        psi = np.asarray(psi, dtype=np.complex128).ravel()
+        self.states[:] = psi / np.linalg.norm(psi)
+        return self
+
+    def prepare_ghz(self, control_state=None):
+        """GHZ 型初态 α|0…0> + β|1…1>，与 DensityMatrix.ghz 相同"""
+        if control_state is None:
+            control_state = np.array([1, 1]) / np.sqrt(2)
+        a, b = np.asarray(control_state, dtype=np.complex128) / np.linalg.norm(control_state)
+        self.states[:] = 0.0
+        self.states[:, 0], self.states[:, -1] = a, b
+        return self
+
+    def _view(self, target, k=1):
+        """把目标比特（连续 k 个）单独拆成一个轴：(T, A, 2^k, B)"""
+        return self.states.reshape(self.n_trajectories, 2 ** target, 2 ** k, -1)
+
+    def apply_unitary(self, U, targets):
+        """U 作用在连续升序的目标比特上"""
+        if list(targets) != list(range(targets[0], targets[0] + len(targets))):
+            raise ValueError("轨迹后端只支持连续升序的目标比特")
+        view = self._view(targets[0], len(targets))
+        self.states = np.einsum('ij,tajb->taib', U, view).reshape(self.states.shape)
+        return self
+
+    def reduced(self, target):
+        """每条轨迹中目标比特的约化密度矩阵 (T, 2, 2)
+
+        在实部/虚部交错的实数视图上做三次内积，不产生共轭副本。
+        """
+        view = self._view(target)
+        x = view.view(np.float64).reshape(view.shape[0], view.shape[1], 2, -1, 2)
+        x0, x1 = x[:, :, 0], x[:, :, 1]
+        r = np.empty((view.shape[0], 2, 2), dtype=np.complex128)
+        r[:, 0, 0] = np.einsum('tabk,tabk->t', x0, x0)
+        r[:, 1, 1] = np.einsum('tabk,tabk->t', x1, x1)
+        imag = np.einsum('tab,tab->t', x0[..., 1], x1[..., 0]) - np.einsum('tab,tab->t', x0[..., 0], x1[..., 1])
+        r[:, 0, 1] = np.einsum('tabk,tabk->t', x0, x1) + 1j * imag
+        r[:, 1, 0] = np.conj(r[:, 0, 1])
+        return r
+
+    def apply_kraus(self, operators, target):
+        """对每条轨迹随机选取一个 Kraus 分支"""
+        ops = np.asarray(operators, dtype=np.complex128)
+        effects = np.conj(np.swapaxes(ops, -1, -2)) @ ops
+        probs = np.real(np.einsum('kij,tji->tk', effects, self.reduced(target)))
+        np.clip(probs, 0.0, None, out=probs)
+        cumulative = np.cumsum(probs, axis=1)
+        draws = self.rng.random(self.n_trajectories) * cumulative[:, -1]
+        choice = np.minimum((draws[:, None] >= cumulative).sum(axis=1), len(ops) - 1)
+
+        # 每条轨迹各自的 2x2 算符 K_k / √p_k，按元素逐块组合，避免按分支收集子数组
+        chosen_probs = probs[np.arange(self.n_trajectories), choice]
+        G = ops[choice] / np.sqrt(np.maximum(chosen_probs, 1e-300))[:, None, None]
+        view = self._view(target)
+        v0, v1 = view[:, :, 0], view[:, :, 1]
+        result = np.empty_like(view)
+        scratch = np.empty_like(v0)
+        for i in range(2):
+            block = result[:, :, i]
+            np.multiply(v0, G[:, i, 0, None, None], out=block)
+            np.multiply(v1, G[:, i, 1, None, None], out=scratch)
+            block += scratch
+        self.states = result.reshape(self.states.shape)
+        return self
+
+    def apply_kraus_all(self, operators):
+        for q in range(self.n_qubits):
+            self.apply_kraus(operators, q)
+        return self
+
+    def bloch_samples(self):
+        """每条轨迹、每个比特的 Bloch 向量，形状 (T, n, 3)"""
+        samples = np.empty((self.n_trajectories, self.n_qubits, 3))
+        for q in range(self.n_qubits):
+            samples[:, q] = np.real(np.einsum('pij,tji->tp', _PAULIS, self.reduced(q)))
+        return samples
+
+    def fidelity_samples(self, psi):
+        """每条轨迹与纯态 psi 的重叠 |<psi|ψ_t>|²"""
+        psi = np.asarray(psi, dtype=np.complex128).ravel()
+        return np.abs(self.states @ psi.conj()) ** 2
+
+    def purity_estimate(self, max_trajectories=None):
+        """由不同轨迹两两重叠的均值估计 tr(ρ²)，返回 (估计值, 标准误差)
+
+        max_trajectories 限制参与估计的轨迹数（None 为全部），开销随其平方增长。
+        两两重叠彼此相关，标准误差用留一法 (jackknife) 计算。
+        """
+        subset = self.states[:max_trajectories]
+        m = len(subset)
+        if m < 2:
+            return 1.0, 0.0
+        overlaps = np.abs(subset.conj() @ subset.T) ** 2
+        rows = overlaps.sum(axis=1) - np.diag(overlaps)
+        total = rows.sum()
+        estimate = float(total / (m * (m - 1)))
+        if m < 3:
+            return estimate, 0.0
+        # 去掉第 i 条轨迹后的估计值
+        leave_one_out = (total - 2 * rows) / ((m - 1) * (m - 2))
+        stderr = np.sqrt((m - 1) / m * np.sum((leave_one_out - leave_one_out.mean()) ** 2))
+        return estimate, float(stderr)
+
+def _ghz_statevector(n_qubits, control_state):
+    a, b = np.asarray(control_state, dtype=np.complex128) / np.linalg.norm(control_state)
+    psi = np.zeros(2 ** n_qubits, dtype=np.complex128)
+    psi[0], psi[-1] = a, b
+    return psi
+
+
+def _run_chunk(n_qubits, control_state, operators, n_trajectories, seed_seq, purity_trajectories=None):
+    """单个进程（或块）内的轨迹演化，返回各量的和以便合并"""
+    sim = TrajectorySimulator(n_qubits, n_trajectories, np.random.default_rng(seed_seq))
+    sim.prepare_ghz(control_state)
+    if operators is not None:
+        sim.apply_kraus_all(operators)
+    bloch = sim.bloch_samples()
+    fidelity = sim.fidelity_samples(_ghz_statevector(n_qubits, control_state))
+    purity, purity_stderr = sim.purity_estimate(purity_trajectories)
+    return bloch.sum(axis=0), (bloch ** 2).sum(axis=0), float(fidelity.sum()), purity, purity_stderr, n_trajectories
+
+
+def run_ghz_trajectories(n_qubits, control_state, operators, n_trajectories=400, workers=None, seed=None,
+                         purity_trajectories=None):
+    """GHZ 型寄存器在逐比特噪声下的轨迹平均
+
+    operators 为单比特 Kraus 算符列表（None 表示无噪声）。workers 大于 1 时按
+    SeedSequence 派生的独立随机流把轨迹分块交给进程池并行计算。purity_trajectories
+    限制每块中参与纯度估计的轨迹数，None 为全部。
+    返回 (平均 Bloch 向量 (n, 3), 标准误差 (n, 3), 纯度估计, 纯度标准误差, 保真度)。
+    """
+    operators = None if operators is None else np.asarray(operators, dtype=np.complex128)
+    workers = workers or 1
+    chunks = np.array_split(np.arange(n_trajectories), workers)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = [(n_qubits, control_state, operators, len(chunk), s, purity_trajectories)
+            for chunk, s in zip(chunks, seeds) if len(chunk)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, *zip(*args)))
+    else:
+        parts = [_run_chunk(*a) for a in args]
+
+    total = sum(p[5] for p in parts)
+    mean = sum(p[0] for p in parts) / total
+    mean_sq = sum(p[1] for p in parts) / total
+    stderr = np.sqrt(np.maximum(mean_sq - mean ** 2, 0.0) / max(total - 1, 1))
+    fidelity = sum(p[2] for p in parts) / total
+    # 各块的纯度估计相互独立，按轨迹数加权合并
+    purity = sum(p[3] * p[5] for p in parts) / total
+    purity_stderr = np.sqrt(sum((p[4] * p[5]) ** 2 for p in parts)) / total
+    return mean, stderr, purity, purity_stderr, fidelity
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 3D可视化参数快照，不可变，发布后可在线程间安全共享
+VisualizationParams = namedtuple(
+    'VisualizationParams',
+    ['version', 'barrier_height', 'barrier_width', 'particle_energy', 'wave_speed']
+)
+
+
+class ParameterChannel:
+    """Tk线程与渲染线程之间的双缓冲参数通道
+
+    Tk线程调用 publish() 写入后台缓冲区，渲染线程每帧调用 take() 一次，
+    仅当有新版本时才交换到前台，拖动滑条时多次发布只会被渲染线程看到最新一份。
+    """
+
+    def __init__(self, barrier_height, barrier_width, particle_energy, wave_speed):
+        self._lock = threading.Lock()
+        self._back = VisualizationParams(1, barrier_height, barrier_width, particle_energy, wave_speed)
+        self._front = None
+        self._stats = (0, 0.0, 0.0)
+
+    def publish(self, **changes):
+        """以当前后台快照为基础生成新的不可变快照"""
+        with self._lock:
+            self._back = self._back._replace(version=self._back.version + 1, **changes)
+
+    def latest(self):
+        with self._lock:
+            return self._back
+
+    def take(self):
+        """渲染线程调用：有新快照时返回它并设为前台，否则返回 None"""
+        with self._lock:
+            back = self._back
+        if self._front is not None and back.version == self._front.version:
+            return None
+        self._front = back
+        return back
+
+    def write_stats(self, tunneling_attempts, tunneling_prob, fps):
+        """渲染端写回统计信息"""
+        with self._lock:
+            self._stats = (tunneling_attempts, tunneling_prob, fps)
+
+    def read_stats(self):
+        with self._lock:
+            return self._stats
+
+    def close(self):
+        pass
+
+
+class SharedParameterChannel:
+    """跨进程参数通道：一小块共享内存加顺序锁，接口与 ParameterChannel 相同
+
+    父进程（Tk）是参数区唯一写者，子进程（GLUT）是统计区唯一写者。
+    读参数时若序号为奇数或前后不一致则重读，保证拿到完整快照。
+    """
+
+    _SLOTS = 16
+    _SEQ, _VERSION, _PARAMS = 0, 1, 2
+    _STATS = 8
+
+    def __init__(self, name=None, initial=None):
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self._SLOTS * 8)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._data = np.ndarray((self._SLOTS,), dtype=np.float64, buffer=self._shm.buf)
+        self._front = None
+        self._back = None
+        if self._owner:
+            self._data[:] = 0.0
+            self._write(initial)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def _write(self, params):
+        data = self._data
+        data[self._SEQ] += 1  # 奇数：写入中
+        data[self._VERSION] = params.version
+        data[self._PARAMS:self._PARAMS + 4] = params[1:]
+        data[self._SEQ] += 1
+        self._back = params
+
+    def publish(self, **changes):
+        self._write(self._back._replace(version=self._back.version + 1, **changes))
+
+    def latest(self):
+        data = self._data
+        while True:
+            seq = data[self._SEQ]
+            if seq % 2 == 0:
+                values = data[self._VERSION:self._PARAMS + 4].tolist()
+                if data[self._SEQ] == seq:
+                    return VisualizationParams(int(values[0]), *values[1:])
+            time.sleep(0)
+
+    def take(self):
+        params = self.latest()
+        if self._front is not None and params.version == self._front.version:
+            return None
+        self._front = params
+        return params
+
+    def write_stats(self, tunneling_attempts, tunneling_prob, fps):
+        self._data[self._STATS:self._STATS + 3] = (tunneling_attempts, tunneling_prob, fps)
+
+    def read_stats(self):
+        attempts, prob, fps = self._data[self._STATS:self._STATS + 3].tolist()
+        return int(attempts), prob, fps
+
+    def close(self):
+        """释放映射；创建者同时删除共享内存块"""
+        if self._shm is None:
+            return
+        self._data = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._shm = None
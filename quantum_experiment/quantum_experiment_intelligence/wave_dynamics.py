@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class TunnelingWavePacket:
+    """一维含时薛定谔方程的分步傅里叶求解器，用于3D场景中的实时概率密度曲面
+
+    采用场景坐标（ħ = m = 1），能量乘以 energy_scale 后参与演化，
+    势垒中心位于 x = 0，宽度与 Quantum3DVisualization 中的碰撞判定一致。
+    """
+
+    def __init__(self, samples=2048, x_min=-8.0, x_max=8.0, energy_scale=2.0, max_substep=0.02):
+        self.samples = samples
+        self.x = np.linspace(x_min, x_max, samples, endpoint=False)
+        self.dx = self.x[1] - self.x[0]
+        self.k = 2 * np.pi * np.fft.fftfreq(samples, d=self.dx)
+        self.energy_scale = energy_scale
+        self.max_substep = max_substep
+
+        self.psi = np.zeros(samples, dtype=np.complex128)
+        self.potential = np.zeros(samples)
+        # 复用的输出缓冲区，避免每帧分配
+        self._density = np.empty(samples)
+        self._scratch = np.empty(samples)
+
+        # 边界吸收掩码：两端各 10% 区域平滑衰减，防止周期边界回绕
+        edge = max(1, samples // 10)
+        ramp = np.sin(np.linspace(0, np.pi / 2, edge)) ** 0.125
+        self.absorber = np.ones(samples)
+        self.absorber[:edge] = ramp
+        self.absorber[-edge:] = ramp[::-1]
+
+        # 传播子缓存，只在 dt 或势垒参数改变时重算
+        self._dt = None
+        self._kinetic_phase = None
+        self._potential_phase = None
+
+        self.x0 = -6.0
+        self.sigma = 1.0
+        self.particle_energy = 0.5
+        self.peak_density = 1.0
+
+    def set_barrier(self, height, width):
+        """设置方势垒，势垒区为 |x| <= width / 2"""
+        self.potential[:] = 0.0
+        self.potential[np.abs(self.x) <= width / 2] = height * self.energy_scale
+        self._potential_phase = None
+
+    def reset(self, x0=None, sigma=None, particle_energy=None):
+        """在 x0 处重新发射高斯波包"""
+        if x0 is not None:
+            self.x0 = x0
+        if sigma is not None:
+            self.sigma = sigma
+        if particle_energy is not None:
+            self.particle_energy = particle_energy
+        k0 = np.sqrt(2 * max(self.particle_energy, 0.0) * self.energy_scale)
+        envelope = np.exp(-(self.x - self.x0) ** 2 / (4 * self.sigma ** 2))
+        self.psi[:] = envelope * np.exp(1j * k0 * self.x)
+        self.psi /= np.sqrt(np.sum(np.abs(self.psi) ** 2) * self.dx)
+        self.peak_density = 1.0 / (np.sqrt(2 * np.pi) * self.sigma)
+
+    def norm(self):
+        return float(np.sum(np.abs(self.psi) ** 2) * self.dx)
+
+    def _prepare(self, dt):
+        if dt != self._dt:
+            self._dt = dt
+            self._kinetic_phase = np.exp(-0.5j * self.k ** 2 * dt)
+            self._potential_phase = None
+        if self._potential_phase is None:
+            # 吸收掩码并入半步势能相位，每个子步只需两次逐点乘法
+            self._potential_phase = np.exp(-0.5j * self.potential * dt) * np.sqrt(self.absorber)
+
+    def advance(self, duration):
+        """演化 duration 时长，自动拆分为不超过 max_substep 的子步"""
+        if duration <= 0:
+            return
+        n_steps = int(np.ceil(duration / self.max_substep))
+        self._prepare(duration / n_steps)
+        psi = self.psi
+        for _ in range(n_steps):
+            psi *= self._potential_phase
+            psi = np.fft.ifft(np.fft.fft(psi) * self._kinetic_phase)
+            psi *= self._potential_phase
+        self.psi[:] = psi
+
+    def density(self):
+        """返回 |ψ|²，写入内部复用缓冲区"""
+        np.multiply(self.psi.real, self.psi.real, out=self._density)
+        np.multiply(self.psi.imag, self.psi.imag, out=self._scratch)
+        self._density += self._scratch
+        return self._density